@@ -0,0 +1,100 @@
+"""
+API routes for admin endpoints
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import List, Optional
+import asyncio
+import logging
+
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.memory import memory_budget, resident_memory
+from app.core.profiling import request_profiler, to_collapsed
+from app.api.routes_predict import ml_service
+from app.services.cache_service import cache_service
+from app.services.coordination_service import coordinator
+from app.services.disk_cache_service import fastf1_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles", response_model=List[dict])
+async def list_profiles():
+    """List recently captured request profiles, newest first"""
+    return request_profiler.summaries()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int):
+    """Get a captured profile as collapsed stacks for flame graph tools"""
+    profile = request_profiler.get_profile(profile_id)
+
+    if not profile:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+    return PlainTextResponse(to_collapsed(profile))
+
+
+@router.get("/admission")
+async def get_admission():
+    """Current per-lane admission state and available memory"""
+    return admission.stats()
+
+
+@router.get("/memory")
+async def get_memory():
+    """Estimated in-process memory by component against the budget, plus the process's resident size"""
+    return {**memory_budget.stats(), "process": resident_memory()}
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(prefix: str = Query(..., min_length=1, description="Cache key prefix, e.g. races_v2_2024")):
+    """Delete cache entries by key prefix and drop every worker's in-process copies"""
+    deleted = await cache_service.invalidate(prefix)
+    return {"prefix": prefix, "deleted": deleted}
+
+
+@router.post("/model/reload")
+async def reload_model():
+    """Reload the model artifacts from disk in every worker"""
+    try:
+        await asyncio.to_thread(ml_service.reload)
+        deleted = await cache_service.invalidate("predict_")
+        coordinator.publish("model_reload")
+        return {"reloaded": True, "predictions_invalidated": deleted}
+    except Exception as e:
+        logger.error(f"Error reloading model: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/fastf1-cache")
+async def get_fastf1_cache_usage():
+    """FastF1 disk cache usage by season and session"""
+    try:
+        return await fastf1_cache.usage()
+    except Exception as e:
+        logger.error(f"Error reading FastF1 cache usage: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/fastf1-cache/compact")
+async def compact_fastf1_cache():
+    """Evict FastF1 cache sessions beyond the size cap now"""
+    try:
+        return await fastf1_cache.compact()
+    except Exception as e:
+        logger.error(f"Error compacting FastF1 cache: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
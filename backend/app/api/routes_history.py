@@ -0,0 +1,61 @@
+"""
+API routes for historical results queries
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import logging
+
+from app.models.history import DriverHistory, HeadToHead
+from app.services.results_store import results_store
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/drivers/{driver_id}/results", response_model=DriverHistory)
+async def get_driver_history(
+    driver_id: str,
+    since: Optional[int] = Query(None, description="First season to include"),
+    until: Optional[int] = Query(None, description="Last season to include"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Get a driver's stored race results, newest first"""
+    try:
+        history = await results_store.get_driver_history(driver_id.upper(), since, until, limit)
+        
+        if history is None:
+            raise HTTPException(status_code=404, detail=f"No results stored for driver {driver_id.upper()}")
+        
+        return history
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching history for {driver_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/head-to-head/{kind}", response_model=HeadToHead)
+async def get_head_to_head(
+    kind: str,
+    ids: str = Query(..., description="Two comma-separated driver ids or codes, or constructor names"),
+    since: Optional[int] = Query(None, description="First season to include"),
+    until: Optional[int] = Query(None, description="Last season to include")
+):
+    """Compare two drivers or two constructors across every race they both entered"""
+    if kind not in ("drivers", "constructors"):
+        raise HTTPException(status_code=404, detail="Head-to-head is available for drivers or constructors")
+    
+    competitors = [value.strip() for value in ids.split(",") if value.strip()]
+    if kind == "drivers":
+        competitors = [code.upper() for code in competitors]
+    if len(competitors) != 2 or competitors[0] == competitors[1]:
+        raise HTTPException(status_code=400, detail="Give exactly two different competitors")
+    
+    try:
+        return await results_store.get_head_to_head(kind, competitors, since, until)
+        
+    except Exception as e:
+        logger.error(f"Error fetching head-to-head for {kind} {competitors}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
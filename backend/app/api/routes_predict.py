@@ -8,6 +8,8 @@ import logging
 from app.models.predict import PredictRequest, PredictResponse
 from app.services.ml_service import MLService
 from app.services.cache_service import cache_service
+from app.core.admission import admission
+from app.core.metrics import ML_INFERENCE_IN_FLIGHT, ML_INFERENCE_SECONDS
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -20,22 +22,28 @@ ml_service = MLService()
 async def predict_race(request: PredictRequest):
     """Generate predictions for race or qualifying"""
     try:
-        # Create cache key based on request parameters
-        cache_key = f"predict_{request.season}_{request.round}_{request.session_type}_{request.weather_condition or 'default'}"
+        # Requests that differ only below the quantization step share a cache entry
+        request = ml_service.canonicalize(request)
+        cache_key = ml_service.fingerprint(request)
+        cacheable = ml_service.cacheable(request)
         
         # Check cache first (with shorter TTL for predictions)
-        cached_prediction = await cache_service.get(cache_key)
+        cached_prediction = await cache_service.get(cache_key) if cacheable else None
         
         if cached_prediction:
             return PredictResponse(**cached_prediction)
         
         # Generate prediction based on session type
-        if request.session_type.lower() == "qualifying":
-            prediction = await ml_service.predict_qualifying(request)
-        else:
-            # For now, use the same prediction logic for race as qualifying
-            # In a real implementation, you would have separate race prediction logic
-            prediction = await ml_service.predict_qualifying(request)
+        async with admission.lane("ml"):
+            ML_INFERENCE_IN_FLIGHT.inc()
+            try:
+                with ML_INFERENCE_SECONDS.labels(request.session_type).time():
+                    if request.session_type == "qualifying":
+                        prediction = await ml_service.predict_qualifying(request)
+                    else:
+                        prediction = await ml_service.predict_race(request)
+            finally:
+                ML_INFERENCE_IN_FLIGHT.dec()
         
         if not prediction.predictions:
             raise HTTPException(
@@ -44,7 +52,8 @@ async def predict_race(request: PredictRequest):
             )
         
         # Cache the prediction with shorter TTL (1 hour)
-        await cache_service.set(cache_key, prediction.dict(), ttl_hours=1)
+        if cacheable:
+            await cache_service.set(cache_key, prediction.dict(), ttl_hours=1)
         
         return prediction
         
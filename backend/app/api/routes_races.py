@@ -2,13 +2,19 @@
 API routes for race-related endpoints
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 import logging
 
 from app.models.race import Race, RaceResults, RaceTelemetry, Standings
+from app.models.analysis import (
+    LapAnalysis, LapComparison, LapTimesPage, RacePitStops, RaceStints, TelemetrySummary,
+    TrackMap, TrackTelemetry
+)
+from app.core.admission import admission
 from app.services.fastf1_service import FastF1Service
 from app.services.cache_service import cache_service
+from app.services.track_service import TRACK_CHANNELS, layout_id
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,15 +24,15 @@ router = APIRouter()
 async def get_races(season: int):
     """Get all races for a given season"""
     try:
-        # Check cache first
-        cache_key = f"races_{season}"
+        # Check cache first; versioned since races gained their event format and sessions
+        cache_key = f"races_v2_{season}"
         cached_races = await cache_service.get(cache_key)
         
         if cached_races:
             return [Race(**race_data) for race_data in cached_races]
         
         # Fetch from FastF1
-        races = await FastF1Service.get_races_for_season(season)
+        races = await admission.run_cold(FastF1Service.get_races_for_season, season)
         
         if not races:
             raise HTTPException(status_code=404, detail=f"No races found for season {season}")
@@ -56,7 +62,7 @@ async def get_race_results(season: int, round: int):
             return RaceResults(**cached_results)
         
         # Fetch from FastF1
-        race_results = await FastF1Service.get_race_results(season, round)
+        race_results = await admission.run_cold(FastF1Service.get_race_results, season, round)
         
         if not race_results:
             raise HTTPException(
@@ -88,7 +94,7 @@ async def get_race_telemetry(season: int, round: int, lap: int = 1):
             return RaceTelemetry(**cached_telemetry)
         
         # Fetch from FastF1
-        telemetry = await FastF1Service.get_race_telemetry(season, round, lap)
+        telemetry = await admission.run_cold(FastF1Service.get_race_telemetry, season, round, lap)
         
         if not telemetry:
             raise HTTPException(
@@ -108,6 +114,263 @@ async def get_race_telemetry(season: int, round: int, lap: int = 1):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/race/{season}/{round}/telemetry/summary", response_model=TelemetrySummary)
+async def get_race_telemetry_summary(season: int, round: int):
+    """Get per-driver top speed, speed traps, throttle, braking and DRS statistics"""
+    try:
+        # Check cache first
+        cache_key = f"race_summary_{season}_{round}"
+        cached_summary = await cache_service.get(cache_key)
+        
+        if cached_summary:
+            return TelemetrySummary(**cached_summary)
+        
+        # Fetch from FastF1
+        summary = await admission.run_cold(FastF1Service.get_telemetry_summary, season, round)
+        
+        if not summary:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"No telemetry found for season {season}, round {round}"
+            )
+        
+        # Cache the results
+        await cache_service.set(cache_key, summary.dict(), ttl_hours=24)
+        
+        return summary
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching telemetry summary for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _get_track_map(season: int, round: int, points: int) -> TrackMap:
+    """Load or build the simplified track map, cached once per circuit layout"""
+    races = await get_races(season)
+    race = next((race for race in races if race.round == round), None)
+    if race is None:
+        raise HTTPException(status_code=404, detail=f"No race found for season {season}, round {round}")
+    
+    layout = layout_id(race.circuit_name, season)
+    cache_key = f"track_map_{layout}_{points}"
+    cached_track = await cache_service.get(cache_key)
+    
+    if cached_track:
+        return TrackMap(**cached_track)
+    
+    track = await admission.run_cold(FastF1Service.get_track_map, season, round, layout, points)
+    
+    if not track:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No position data found for season {season}, round {round}"
+        )
+    
+    # Layouts change rarely; keep the geometry for a month
+    await cache_service.set(cache_key, track.dict(), ttl_hours=24 * 30)
+    return track
+
+
+@router.get("/race/{season}/{round}/track", response_model=TrackMap)
+async def get_track_map(
+    season: int,
+    round: int,
+    points: int = Query(200, ge=10, le=2000, description="Maximum points in the simplified outline")
+):
+    """Get the circuit outline for a race, simplified to at most `points` points"""
+    try:
+        return await _get_track_map(season, round, points)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching track map for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/track/telemetry", response_model=TrackTelemetry)
+async def get_track_telemetry(
+    season: int,
+    round: int,
+    driver: str = Query(..., description="Driver code"),
+    lap: Optional[int] = Query(None, ge=1, description="Lap number (default: the driver's fastest lap)"),
+    channels: str = Query("speed,gear", description=f"Comma-separated channels: {', '.join(TRACK_CHANNELS)}"),
+    points: int = Query(200, ge=10, le=2000)
+):
+    """Get a driver's lap channels sampled at every point of the track map"""
+    names = [name.strip().lower() for name in channels.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TRACK_CHANNELS]
+    if not names or unknown:
+        raise HTTPException(status_code=400, detail=f"Channels must be among: {', '.join(TRACK_CHANNELS)}")
+    code = driver.strip().upper()
+    
+    try:
+        # Check cache first
+        cache_key = f"race_track_{season}_{round}_{code}_{lap or 'fastest'}_{'-'.join(names)}_{points}"
+        cached_telemetry = await cache_service.get(cache_key)
+        
+        if cached_telemetry:
+            return TrackTelemetry(**cached_telemetry)
+        
+        track = await _get_track_map(season, round, points)
+        telemetry = await admission.run_cold(FastF1Service.get_track_telemetry, season, round, track, code, lap, names)
+        
+        if not telemetry:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"No telemetry found for {code} in season {season}, round {round}"
+            )
+        
+        # Cache the results
+        await cache_service.set(cache_key, telemetry.dict(), ttl_hours=24)
+        
+        return telemetry
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error mapping telemetry for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/compare", response_model=LapComparison)
+async def compare_drivers(
+    season: int,
+    round: int,
+    drivers: str = Query(..., description="Comma-separated driver codes; the first is the reference"),
+    laps: Optional[str] = Query(None, description="Comma-separated lap numbers per driver (default: fastest laps)"),
+    grid_step: float = Query(10.0, gt=0, le=100, description="Distance grid resolution in metres"),
+    mini_sectors: int = Query(25, ge=1, le=200)
+):
+    """Get delta time between drivers' laps on a common distance grid"""
+    codes = [code.strip().upper() for code in drivers.split(",") if code.strip()]
+    if len(codes) < 2:
+        raise HTTPException(status_code=400, detail="At least two drivers are required")
+    
+    lap_numbers = None
+    if laps:
+        try:
+            lap_numbers = [int(lap) for lap in laps.split(",")]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Laps must be comma-separated integers")
+        if len(lap_numbers) not in (1, len(codes)):
+            raise HTTPException(status_code=400, detail="Give one lap for all drivers or one lap per driver")
+    
+    try:
+        # Check cache first
+        lap_key = "-".join(map(str, lap_numbers)) if lap_numbers else "fastest"
+        cache_key = f"race_compare_{season}_{round}_{'-'.join(codes)}_{lap_key}_{grid_step:g}_{mini_sectors}"
+        cached_comparison = await cache_service.get(cache_key)
+        
+        if cached_comparison:
+            return LapComparison(**cached_comparison)
+        
+        # Fetch from FastF1
+        comparison = await admission.run_cold(
+            FastF1Service.get_lap_comparison, season, round, codes, lap_numbers, grid_step, mini_sectors
+        )
+        
+        if not comparison:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Could not compare {', '.join(codes)} for season {season}, round {round}"
+            )
+        
+        # Cache the results
+        await cache_service.set(cache_key, comparison.dict(), ttl_hours=24)
+        
+        return comparison
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error comparing drivers for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _get_lap_analysis(season: int, round: int) -> LapAnalysis:
+    """Load the per-session lap analysis, computing it at most once per cache TTL"""
+    cache_key = f"race_laps_{season}_{round}"
+    cached_analysis = await cache_service.get(cache_key)
+    
+    if cached_analysis:
+        return LapAnalysis(**cached_analysis)
+    
+    analysis = await admission.run_cold(FastF1Service.get_lap_analysis, season, round)
+    
+    if not analysis:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No lap data found for season {season}, round {round}"
+        )
+    
+    await cache_service.set(cache_key, analysis.dict(), ttl_hours=24)
+    
+    return analysis
+
+
+@router.get("/race/{season}/{round}/laps", response_model=LapTimesPage)
+async def get_race_laps(
+    season: int,
+    round: int,
+    start_lap: int = Query(1, ge=1),
+    lap_count: int = Query(20, ge=1, le=100)
+):
+    """Get lap times and positions for all drivers over a lap range"""
+    try:
+        analysis = await _get_lap_analysis(season, round)
+        
+        total_laps = len(analysis.lap_numbers)
+        start = start_lap - 1
+        end = min(start + lap_count, total_laps)
+        
+        return LapTimesPage(
+            race=analysis.race,
+            drivers=analysis.drivers,
+            lap_numbers=analysis.lap_numbers[start:end],
+            lap_times=[row[start:end] for row in analysis.lap_times],
+            positions=[row[start:end] for row in analysis.positions],
+            total_laps=total_laps,
+            next_start_lap=end + 1 if end < total_laps else None
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching laps for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/laps/stints", response_model=RaceStints)
+async def get_race_stints(season: int, round: int):
+    """Get tyre stints and per-stint degradation for all drivers"""
+    try:
+        analysis = await _get_lap_analysis(season, round)
+        return RaceStints(race=analysis.race, stints=analysis.stints)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching stints for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/laps/pitstops", response_model=RacePitStops)
+async def get_race_pit_stops(season: int, round: int):
+    """Get pit stops for all drivers"""
+    try:
+        analysis = await _get_lap_analysis(season, round)
+        return RacePitStops(race=analysis.race, pit_stops=analysis.pit_stops)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pit stops for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/standings/{season}", response_model=Standings)
 async def get_standings(season: int, round: Optional[int] = None):
     """Get championship standings for a season"""
@@ -0,0 +1,111 @@
+"""
+API routes for streaming telemetry replays over SSE and WebSocket
+"""
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from contextlib import nullcontext
+from typing import List, Optional
+import json
+import logging
+
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.metrics import REPLAY_VIEWERS
+from app.services.replay_service import ReplaySource, replay_frames, replay_hub
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _parse_drivers(drivers: Optional[str], source: ReplaySource) -> List[str]:
+    """Requested driver codes, defaulting to every driver with car data"""
+    if not drivers:
+        return list(source.codes)
+    codes = [code.strip().upper() for code in drivers.split(",") if code.strip()]
+    source.driver_indices(codes)  # raises ValueError for unknown drivers
+    return codes
+
+
+async def _open_replay(season: int, round: int, drivers: Optional[str]):
+    """Load the shared source and validate the driver selection"""
+    # Only a source that still has to be built goes through the cold lane
+    loading = nullcontext() if replay_hub.is_loaded(season, round) else admission.lane("cold")
+    async with loading:
+        source = await replay_hub.get_source(season, round)
+    if source is None:
+        raise HTTPException(status_code=404, detail=f"No car data found for {season} round {round}")
+    try:
+        return source, _parse_drivers(drivers, source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/race/{season}/{round}/replay")
+async def stream_replay(
+    season: int,
+    round: int,
+    drivers: Optional[str] = Query(None, description="Comma-separated driver codes (default: all)"),
+    speed: float = Query(1.0, gt=0, le=settings.replay_max_speed, description="Playback speed multiplier"),
+    start: float = Query(0.0, ge=0, description="Replay start, seconds from the first sample"),
+    duration: Optional[float] = Query(None, gt=0, description="Seconds of session time to replay (default: to the end)")
+):
+    """Replay car data in time order as Server-Sent Events"""
+    try:
+        source, codes = await _open_replay(season, round, drivers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error opening replay for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    # A long-lived stream shouldn't hold a fast-lane slot
+    admission.detach()
+
+    async def events():
+        REPLAY_VIEWERS.labels("sse").inc()
+        try:
+            async for message in replay_frames(source, codes, speed, start, duration, transport="sse"):
+                yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+        finally:
+            REPLAY_VIEWERS.labels("sse").dec()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/race/{season}/{round}/replay/ws")
+async def websocket_replay(
+    websocket: WebSocket,
+    season: int,
+    round: int,
+    drivers: Optional[str] = None,
+    speed: float = 1.0,
+    start: float = 0.0,
+    duration: Optional[float] = None
+):
+    """Replay car data in time order as WebSocket JSON messages"""
+    await websocket.accept()
+    REPLAY_VIEWERS.labels("websocket").inc()
+    try:
+        if not 0 < speed <= settings.replay_max_speed or start < 0 or (duration is not None and duration <= 0):
+            raise HTTPException(status_code=400, detail="Invalid speed, start or duration")
+        source, codes = await _open_replay(season, round, drivers)
+
+        async for message in replay_frames(source, codes, speed, start, duration, transport="websocket"):
+            await websocket.send_text(json.dumps(message, default=str))
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        pass
+    except HTTPException as e:
+        await websocket.send_text(json.dumps({"type": "error", "status": e.status_code, "detail": e.detail}))
+        await websocket.close(code=1008)
+    except Exception as e:
+        logger.error(f"Error streaming replay for {season}/{round}: {e}")
+        await websocket.close(code=1011)
+    finally:
+        REPLAY_VIEWERS.labels("websocket").dec()
@@ -0,0 +1,164 @@
+"""
+API routes for any session of a race weekend (practice, qualifying, sprint, race)
+
+Each endpoint loads only the parts of the session it serves, so a qualifying
+classification never pays for lap or telemetry parsing. Cache keys carry the
+session identifier.
+"""
+
+from fastapi import APIRouter, HTTPException
+import logging
+
+from app.models.race import RaceTelemetry, SessionResults, SessionWeather
+from app.models.analysis import LapAnalysis
+from app.core.admission import admission
+from app.services.fastf1_service import SESSION_TYPES, FastF1Service
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _session_type(session: str) -> str:
+    """Normalize a session identifier, rejecting unknown ones"""
+    session_type = session.upper()
+    if session_type not in SESSION_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Session must be one of: {', '.join(SESSION_TYPES)}"
+        )
+    return session_type
+
+
+@router.get("/race/{season}/{round}/sessions/{session}/results", response_model=SessionResults)
+async def get_session_results(season: int, round: int, session: str):
+    """Get the classification of a session, e.g. qualifying or the sprint"""
+    session_type = _session_type(session)
+    try:
+        # Check cache first
+        cache_key = f"session_results_{season}_{round}_{session_type}"
+        cached_results = await cache_service.get(cache_key)
+
+        if cached_results:
+            return SessionResults(**cached_results)
+
+        # Fetch from FastF1
+        results = await admission.run_cold(FastF1Service.get_session_results, season, round, session_type)
+
+        if not results:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No {session_type} results found for season {season}, round {round}"
+            )
+
+        # Cache the results
+        await cache_service.set(cache_key, results.dict(), ttl_hours=24)
+
+        return results
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {session_type} results for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/sessions/{session}/laps", response_model=LapAnalysis)
+async def get_session_laps(season: int, round: int, session: str):
+    """Get lap times, positions, stints and pit stops of a session"""
+    session_type = _session_type(session)
+    try:
+        # Check cache first
+        cache_key = f"session_laps_{season}_{round}_{session_type}"
+        cached_analysis = await cache_service.get(cache_key)
+
+        if cached_analysis:
+            return LapAnalysis(**cached_analysis)
+
+        # Fetch from FastF1
+        analysis = await admission.run_cold(FastF1Service.get_lap_analysis, season, round, session_type)
+
+        if not analysis:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No {session_type} lap data found for season {season}, round {round}"
+            )
+
+        # Cache the results
+        await cache_service.set(cache_key, analysis.dict(), ttl_hours=24)
+
+        return analysis
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {session_type} laps for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/sessions/{session}/telemetry", response_model=RaceTelemetry)
+async def get_session_telemetry(season: int, round: int, session: str, lap: int = 1):
+    """Get each driver's fastest-lap telemetry in a session"""
+    session_type = _session_type(session)
+    try:
+        # Check cache first
+        cache_key = f"session_telemetry_{season}_{round}_{session_type}_{lap}"
+        cached_telemetry = await cache_service.get(cache_key)
+
+        if cached_telemetry:
+            return RaceTelemetry(**cached_telemetry)
+
+        # Fetch from FastF1
+        telemetry = await admission.run_cold(
+            FastF1Service.get_race_telemetry, season, round, lap, session_type
+        )
+
+        if not telemetry:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No {session_type} telemetry found for season {season}, round {round}"
+            )
+
+        # Cache the results
+        await cache_service.set(cache_key, telemetry.dict(), ttl_hours=24)
+
+        return telemetry
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {session_type} telemetry for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/race/{season}/{round}/sessions/{session}/weather", response_model=SessionWeather)
+async def get_session_weather(season: int, round: int, session: str):
+    """Get the weather readings through a session"""
+    session_type = _session_type(session)
+    try:
+        # Check cache first
+        cache_key = f"session_weather_{season}_{round}_{session_type}"
+        cached_weather = await cache_service.get(cache_key)
+
+        if cached_weather:
+            return SessionWeather(**cached_weather)
+
+        # Fetch from FastF1
+        weather = await admission.run_cold(FastF1Service.get_session_weather, season, round, session_type)
+
+        if not weather:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No {session_type} weather found for season {season}, round {round}"
+            )
+
+        # Cache the results
+        await cache_service.set(cache_key, weather.dict(), ttl_hours=24)
+
+        return weather
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {session_type} weather for {season}/{round}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
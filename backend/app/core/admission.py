@@ -0,0 +1,481 @@
+"""
+Priority-aware admission control
+
+Requests are admitted through separate lanes so cheap work never waits
+behind expensive work:
+
+- ``fast``: every HTTP request on arrival (cache hits, health, metrics)
+- ``cold``: FastF1 session loads, run on worker threads
+- ``ml``: model inference
+
+A request holds a fast slot until it turns out to need a cold load or
+inference; it then hands the fast slot back before queueing in the
+expensive lane. The cold lane's limit also shrinks with available memory,
+so a burst of loads can't run the worker out of memory, and each cold load
+reserves its estimated size against the memory budget (`app.core.memory`).
+Expensive lanes charge a per-client token bucket (429 when empty), once per
+request however many loads it runs, and every lane sheds load with 503 once
+its queue is full, a request has waited too long or a cold load's
+reservation doesn't fit. Shed requests get their token back.
+
+Background work, like warmup prefetching, enters lanes inside
+`admission.background()`. It queues behind every user request and never
+holds more than all but one of a lane's slots, so user loads are never
+stuck behind a prefetch backlog.
+
+Lanes are safe to use from any event loop.
+"""
+
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.memory import MemoryBudgetExceeded, memory_budget
+from app.core.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Paths admitted without a fast slot so probes and scrapes are never shed
+EXEMPT_PATHS = ("/health", "/ready", "/metrics")
+MAX_TRACKED_CLIENTS = 10000
+# Loads finish within seconds, freeing their reservations
+MEMORY_RETRY_AFTER = 5.0
+
+
+class AdmissionRejected(HTTPException):
+    """429 or 503 raised when a lane refuses a request"""
+
+    def __init__(self, status_code: int, lane: str, reason: str, retry_after: float):
+        super().__init__(
+            status_code=status_code,
+            detail=f"Server busy: {lane} lane {reason.replace('_', ' ')}, retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        self.lane = lane
+        self.reason = reason
+
+
+def available_memory_mb() -> Optional[float]:
+    """Memory this process can still use: the cgroup headroom or MemAvailable, whichever is lower"""
+    candidates = []
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    candidates.append(int(line.split()[1]) / 1024)
+                    break
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                current = int(f.read().strip())
+            candidates.append((int(limit) - current) / (1024 * 1024))
+    except (OSError, ValueError):
+        pass
+    return min(candidates) if candidates else None
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Spend one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def refund(self) -> None:
+        """Give back a token spent on a request that was turned away"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class Lane:
+    """Concurrency limit with a bounded FIFO queue and a queueing deadline
+
+    Released slots are handed directly to the oldest waiter, which may be
+    parked on another thread's event loop. Background waiters have a queue
+    of their own, served only when no user request is waiting, and hold at
+    most `limit - 1` slots (one on a single-slot lane). They don't time out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_queue: int,
+        timeout: float,
+        rate_per_minute: float = 0,
+        burst: int = 1,
+        limit: Optional[Callable[[], int]] = None
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.rate = rate_per_minute / 60
+        self.burst = max(1, burst)
+        self._limit = limit
+        self._active = 0
+        self._background_active = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._background: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        if self._limit is None:
+            return self.concurrency
+        return max(1, min(self.concurrency, self._limit()))
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def background_limit(self) -> int:
+        return max(1, self.limit - 1)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, status_code: int, reason: str, retry_after: float) -> AdmissionRejected:
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        logger.warning(f"Admission {self.name} lane rejected a request: {reason}")
+        return AdmissionRejected(status_code, self.name, reason, retry_after)
+
+    def charge(self, client: Optional[str]) -> None:
+        """Take a token from the client's bucket; internal callers (no client) are free"""
+        if client is None or self.rate <= 0:
+            return
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            allowed, retry_after = bucket.take()
+        if not allowed:
+            raise self._reject(429, "rate_limited", retry_after)
+
+    def refund(self, client: Optional[str]) -> None:
+        if client is None or self.rate <= 0:
+            return
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is not None:
+                bucket.refund()
+
+    async def acquire(self, background: bool = False) -> None:
+        """Wait for a slot; raises AdmissionRejected when the queue is full or the wait times out"""
+        start = time.perf_counter()
+        with self._lock:
+            if background:
+                free = (
+                    not self._waiters and not self._background
+                    and self._background_active < self.background_limit
+                )
+            else:
+                free = not self._waiters
+            if free and self._active < self.limit:
+                self._take(background)
+                ADMISSION_WAIT_SECONDS.labels(self.name).observe(0.0)
+                return
+            queue = self._background if background else self._waiters
+            if len(queue) >= self.max_queue:
+                raise self._reject(503, "queue_full", self.timeout)
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            queue.append(waiter)
+
+        future = waiter[1]
+        ADMISSION_QUEUED.labels(self.name).inc()
+        try:
+            await asyncio.wait_for(future, None if background else self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                queued = waiter in queue
+                if queued:
+                    queue.remove(waiter)
+            # A slot granted just before giving up is passed on; one still
+            # in flight to a cancelled future is passed on by `_grant`
+            if not queued and future.done() and not future.cancelled():
+                self.release(background)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject(503, "timeout", self.timeout)
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(self.name).dec()
+        ADMISSION_WAIT_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+
+    def _take(self, background: bool) -> None:
+        self._active += 1
+        if background:
+            self._background_active += 1
+        ADMISSION_ACTIVE.labels(self.name).inc()
+
+    def release(self, background: bool = False) -> None:
+        with self._lock:
+            self._active -= 1
+            if background:
+                self._background_active -= 1
+            ADMISSION_ACTIVE.labels(self.name).dec()
+            # User requests first; background work only within its share
+            if self._active >= self.limit:
+                return
+            if self._waiters:
+                loop, future = self._waiters.popleft()
+                granted = False
+            elif self._background and self._background_active < self.background_limit:
+                loop, future = self._background.popleft()
+                granted = True
+            else:
+                return
+            self._take(granted)
+        try:
+            loop.call_soon_threadsafe(self._grant, future, granted)
+        except RuntimeError:
+            # The waiter's loop has closed; hand the slot to the next one
+            self.release(granted)
+
+    def _grant(self, future: asyncio.Future, background: bool) -> None:
+        if future.done():
+            self.release(background)
+        else:
+            future.set_result(None)
+
+    def reset_clients(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "limit": self.limit,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "background_active": self._background_active,
+            "background_queued": len(self._background),
+        }
+
+
+class _Ticket:
+    """A request's fast-lane slot, released at most once"""
+
+    __slots__ = ("lane", "held")
+
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.lane.release()
+
+
+_client: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("admission_client", default=None)
+_ticket: contextvars.ContextVar[Optional[_Ticket]] = contextvars.ContextVar("admission_ticket", default=None)
+# Expensive lanes the current request has already paid for
+_charged: contextvars.ContextVar[Optional[set]] = contextvars.ContextVar("admission_charged", default=None)
+_background: contextvars.ContextVar[bool] = contextvars.ContextVar("admission_background", default=False)
+
+
+def _cold_memory_limit() -> int:
+    available = available_memory_mb()
+    if available is None or settings.admission_load_memory_mb <= 0:
+        return settings.admission_cold_concurrency
+    return int(available // settings.admission_load_memory_mb)
+
+
+class AdmissionController:
+    """The fast, cold and ml lanes plus helpers for entering them"""
+
+    def __init__(self):
+        timeout = settings.admission_queue_timeout_seconds
+        self.enabled = settings.admission_enabled
+        self.lanes: Dict[str, Lane] = {
+            "fast": Lane("fast", settings.admission_fast_concurrency, settings.admission_fast_queue, timeout),
+            "cold": Lane(
+                "cold",
+                settings.admission_cold_concurrency,
+                settings.admission_cold_queue,
+                timeout,
+                rate_per_minute=settings.admission_cold_rate_per_minute,
+                burst=settings.admission_client_burst,
+                limit=_cold_memory_limit
+            ),
+            "ml": Lane(
+                "ml",
+                settings.admission_ml_concurrency,
+                settings.admission_ml_queue,
+                timeout,
+                rate_per_minute=settings.admission_ml_rate_per_minute,
+                burst=settings.admission_client_burst
+            ),
+        }
+
+    @asynccontextmanager
+    async def lane(self, name: str):
+        """Hold a slot in an expensive lane, giving up the request's fast slot first
+
+        The client's token is taken up front, so a flood of requests can't
+        queue unpaid, and handed back if the request is turned away: by the
+        lane, or by the memory budget once admitted.
+        """
+        if not self.enabled:
+            yield
+            return
+        lane = self.lanes[name]
+        background = _background.get()
+        client = self._bill(name)
+        try:
+            lane.charge(client)
+        except AdmissionRejected:
+            self._unbill(name)
+            raise
+        try:
+            self.detach()
+            await lane.acquire(background)
+        except BaseException:
+            self._refund(lane, client)
+            raise
+        try:
+            yield
+        except AdmissionRejected:
+            self._refund(lane, client)
+            raise
+        finally:
+            lane.release(background)
+
+    @contextmanager
+    def background(self):
+        """Enter lanes at background priority for the duration, e.g. for warmup jobs"""
+        token = _background.set(True)
+        try:
+            yield
+        finally:
+            _background.reset(token)
+
+    def _bill(self, name: str) -> Optional[str]:
+        """The client to charge for entering a lane; None once the request has paid for it"""
+        client = _client.get()
+        charged = _charged.get()
+        if client is None or charged is None:
+            return client
+        if name in charged:
+            return None
+        charged.add(name)
+        return client
+
+    def _unbill(self, name: str) -> None:
+        charged = _charged.get()
+        if charged is not None:
+            charged.discard(name)
+
+    def _refund(self, lane: Lane, client: Optional[str]) -> None:
+        if client is not None:
+            lane.refund(client)
+            self._unbill(lane.name)
+
+    async def run_cold(self, loader, *args):
+        """Await a FastF1Service loader inside the cold lane
+        
+        Loaders run their blocking FastF1 work on worker threads themselves, so
+        what they await afterwards, like the results store, stays on this loop.
+        """
+        async with self.lane("cold"):
+            with self.reserve_memory(loader.__name__):
+                return await loader(*args)
+
+    @contextmanager
+    def reserve_memory(self, loader: str):
+        """Hold a cold load's memory reservation; raises AdmissionRejected (503) when it can't fit"""
+        try:
+            with memory_budget.reserve_load(loader):
+                yield
+        except MemoryBudgetExceeded as e:
+            logger.warning(f"Refusing {loader}: {e}")
+            raise self.lanes["cold"]._reject(503, "memory", MEMORY_RETRY_AFTER)
+
+    def detach(self) -> None:
+        """Give up the current request's fast slot, e.g. before a long-lived stream"""
+        ticket = _ticket.get()
+        if ticket is not None:
+            ticket.release()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "available_memory_mb": available_memory_mb(),
+            "lanes": {name: lane.stats() for name, lane in self.lanes.items()}
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting each HTTP request through the fast lane"""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller or admission
+        if scope["type"] != "http" or not controller.enabled or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_token = _client.set(client[0] if client else "unknown")
+        charged_token = _charged.set(set())
+        try:
+            lane = controller.lanes["fast"]
+            try:
+                await lane.acquire()
+            except AdmissionRejected as e:
+                response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+                await response(scope, receive, send)
+                return
+
+            ticket = _Ticket(lane)
+            ticket_token = _ticket.set(ticket)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                ticket.release()
+                _ticket.reset(ticket_token)
+        finally:
+            _charged.reset(charged_token)
+            _client.reset(client_token)
+
+
+# Global admission controller instance
+admission = AdmissionController()
@@ -18,17 +18,80 @@ class Settings(BaseSettings):
     
     # Database Configuration
     database_url: str = "sqlite:///./f1_dashboard.db"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
     
     # Cache Configuration
     enable_cache: bool = True
     cache_ttl_hours: int = 24
+    cache_hot_entries: int = 64  # schedules and standings kept in process, 0 disables
+    
+    # Cross-worker Coordination Configuration (workers on a host share this file)
+    coordination_enabled: bool = True
+    coordination_db_path: str = "./coordination.db"
+    coordination_poll_ms: int = 500
+    coordination_retention_minutes: int = 10
     
     # FastF1 Configuration
     fastf1_cache_dir: str = "./fastf1_cache"
+    fastf1_offline: bool = False
+    fastf1_cache_max_mb: int = 10240  # 0 leaves the cache unbounded
+    fastf1_cache_compact_minutes: int = 30
+    fastf1_cache_min_idle_minutes: int = 10
+    
+    # Cache Warmup Configuration
+    warmup_enabled: bool = False
+    warmup_interval_minutes: int = 60
+    warmup_concurrency: int = 2
+    warmup_job_delay_seconds: float = 1.0
+    warmup_lookback_days: int = 7
+    warmup_lookahead_days: int = 3
+    
+    # Telemetry Replay Configuration
+    replay_frame_seconds: float = 0.5
+    replay_buffer_frames: int = 20
+    replay_max_sessions: int = 4
+    replay_max_speed: float = 64.0
+    
+    # Admission Control Configuration (lanes: fast cached reads, cold loads, ML inference)
+    admission_enabled: bool = True
+    admission_fast_concurrency: int = 200
+    admission_fast_queue: int = 500
+    admission_cold_concurrency: int = 2
+    admission_cold_queue: int = 20
+    admission_ml_concurrency: int = 4
+    admission_ml_queue: int = 50
+    admission_queue_timeout_seconds: float = 30.0
+    admission_load_memory_mb: int = 1024  # estimated peak per concurrent session.load(), 0 disables
+    admission_cold_rate_per_minute: float = 30.0  # per client, 0 disables
+    admission_ml_rate_per_minute: float = 60.0
+    admission_client_burst: int = 10
+    
+    # Memory Budget Configuration (cached objects, replay sources and in-flight loads)
+    memory_budget_mb: int = 2048  # 0 disables
+    memory_load_estimate_mb: int = 512  # reserved by a cold load until its loader has been measured
     
     # ML Model Configuration
     model_path: str = "./models"
     
+    # Prediction Configuration (temperatures are rounded to this step, 0 disables)
+    prediction_temperature_step: float = 1.0
+    
+    # Race Simulation Configuration
+    simulation_runs: int = 5000
+    simulation_max_runs: int = 50000
+    simulation_latency_budget_ms: int = 500  # unseeded requests only
+    simulation_batch_runs: int = 1000
+    
+    # Admin Configuration (admin endpoints are disabled when no token is set)
+    admin_token: Optional[str] = None
+    
+    # Profiling Configuration
+    profiling_enabled: bool = False
+    profiling_slow_threshold_ms: int = 2000
+    profiling_interval_ms: int = 5
+    profiling_buffer_size: int = 20
+    
     # CORS Configuration
     allowed_origins: list[str] = ["http://localhost:5173"]
     
@@ -0,0 +1,261 @@
+"""
+Memory accounting and a process-wide budget
+
+Components that keep data in process report what each object costs:
+
+- ``cache``: decoded payloads in the cache service's hot set
+- ``replay``: merged replay sources shared by replay viewers
+- ``loads``: FastF1 sessions held by in-flight cold loads
+
+Sizes are estimates: array and frame buffers plus Python object overhead
+for decoded JSON. A cold load reserves its estimate before it starts; the
+estimate is learned per loader from the sessions it actually loaded, so a
+results-only load reserves far less than a telemetry load. When a
+reservation doesn't fit under ``settings.memory_budget_mb``, evictable
+components give up their least recently used objects, cheapest to rebuild
+first; a load that still doesn't fit is refused before it allocates
+anything.
+"""
+
+import contextvars
+import itertools
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import MEMORY_BYTES, MEMORY_EVICTED_BYTES
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# A load's working set beyond the session frames it keeps: parsing buffers,
+# derived frames and the response being built
+LOAD_OVERHEAD_FACTOR = 2.0
+REQUEST_OVERHEAD_BYTES = 4 * MB
+
+
+class MemoryBudgetExceeded(Exception):
+    """A reservation that doesn't fit even after eviction"""
+
+    def __init__(self, requested: int, available: int):
+        super().__init__(f"Memory budget exceeded: {requested / MB:.1f} MB requested, {available / MB:.1f} MB available")
+        self.requested = requested
+        self.available = available
+
+
+def estimate_bytes(obj, _seen: Optional[set] = None) -> int:
+    """Approximate bytes held by arrays, frames, models and decoded JSON"""
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):
+        # Shallow: repeated strings in FastF1 frames are shared objects
+        return int(memory_usage(index=True, deep=False).sum())
+
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_bytes(k, seen) + estimate_bytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_bytes(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += estimate_bytes(vars(obj), seen)
+    return size
+
+
+def resident_memory() -> dict:
+    """The process's resident set size and its high-water mark, in bytes, where /proc provides them"""
+    usage = {"rss_bytes": None, "peak_rss_bytes": None}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss_bytes"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    usage["peak_rss_bytes"] = int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+class _Reservation:
+    """An in-flight load's share of the budget"""
+
+    __slots__ = ("key", "loader", "bytes", "measured")
+
+    def __init__(self, key: str, loader: str, nbytes: int):
+        self.key = key
+        self.loader = loader
+        self.bytes = nbytes
+        self.measured = False
+
+
+_reservation: contextvars.ContextVar[Optional[_Reservation]] = contextvars.ContextVar(
+    "memory_reservation", default=None
+)
+
+
+class MemoryBudget:
+    """Per-component byte accounting with eviction under a global budget
+
+    Thread-safe: loads are accounted on worker threads.
+    """
+
+    def __init__(self, budget_mb: Optional[int] = None):
+        self.budget_mb = budget_mb
+        self.peak_bytes = 0
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._evictors: List[Tuple[int, str, Callable[[int], int]]] = []
+        self._load_estimates: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def budget_bytes(self) -> int:
+        """The budget in bytes; 0 means unbounded"""
+        budget_mb = settings.memory_budget_mb if self.budget_mb is None else self.budget_mb
+        return max(0, budget_mb) * MB
+
+    def total(self) -> int:
+        with self._lock:
+            return self._total()
+
+    def _total(self) -> int:
+        return sum(sum(objects.values()) for objects in self._usage.values())
+
+    def _set(self, component: str, key: str, nbytes: int) -> None:
+        objects = self._usage.setdefault(component, {})
+        objects[key] = nbytes
+        MEMORY_BYTES.labels(component).set(sum(objects.values()))
+        self.peak_bytes = max(self.peak_bytes, self._total())
+
+    def track(self, component: str, key: str, nbytes: int) -> None:
+        """Record (or update) the size of a held object, evicting others if it pushed usage over budget"""
+        with self._lock:
+            self._set(component, key, nbytes)
+            over = self._total() - self.budget_bytes if self.budget_bytes else 0
+        if over > 0:
+            self._evict(over)
+
+    def release(self, component: str, key: str) -> None:
+        with self._lock:
+            objects = self._usage.get(component)
+            if objects is not None and objects.pop(key, None) is not None:
+                MEMORY_BYTES.labels(component).set(sum(objects.values()))
+
+    def register_evictor(self, component: str, evict: Callable[[int], int], priority: int = 0) -> None:
+        """Register a callback that frees at least the given bytes, least recently used first,
+        and returns the bytes it freed
+
+        Lower priorities are asked first, so register what is cheapest to rebuild lowest.
+        """
+        self._evictors.append((priority, component, evict))
+        self._evictors.sort(key=lambda evictor: evictor[0])
+
+    def _evict(self, needed: int) -> int:
+        freed = 0
+        for _, component, evict in self._evictors:
+            if freed >= needed:
+                break
+            try:
+                released = evict(needed - freed)
+            except Exception as e:
+                logger.error(f"Error evicting {component} memory: {e}")
+                continue
+            if released:
+                freed += released
+                MEMORY_EVICTED_BYTES.labels(component).inc(released)
+                logger.info(f"Evicted {released / MB:.1f} MB of {component} to stay within the memory budget")
+        return freed
+
+    def make_room(self, nbytes: int) -> bool:
+        """Evict until `nbytes` more fit under the budget; returns whether they do"""
+        budget = self.budget_bytes
+        if not budget:
+            return True
+        over = self.total() + nbytes - budget
+        if over > 0:
+            self._evict(over)
+        return self.total() + nbytes <= budget
+
+    def load_estimate(self, loader: str) -> int:
+        """Bytes a load is expected to need: learned per loader, a configured default until measured"""
+        with self._lock:
+            estimate = self._load_estimates.get(loader)
+        return estimate if estimate is not None else settings.memory_load_estimate_mb * MB
+
+    @contextmanager
+    def reserve_load(self, loader: str):
+        """Hold a load's estimated bytes for its duration; raises MemoryBudgetExceeded if they don't fit"""
+        estimate = self.load_estimate(loader)
+        reservation = _Reservation(f"{loader}#{next(self._ids)}", loader, estimate)
+        while True:
+            fits = self.make_room(estimate)
+            with self._lock:
+                budget = self.budget_bytes
+                # Another thread may have taken the room meanwhile; check and claim together
+                if not budget or self._total() + estimate <= budget:
+                    self._set("loads", reservation.key, estimate)
+                    break
+                if not fits:
+                    available = max(0, budget - self._total())
+                    raise MemoryBudgetExceeded(estimate, available)
+
+        token = _reservation.set(reservation)
+        try:
+            yield reservation
+        finally:
+            _reservation.reset(token)
+            self.release("loads", reservation.key)
+
+    def measure_load(self, session_bytes: int) -> None:
+        """Report the size of a session the current load just loaded
+
+        Updates the load's reservation and the loader's learned estimate. Loads
+        outside `reserve_load` are not accounted.
+        """
+        reservation = _reservation.get()
+        if reservation is None:
+            return
+        # A loader may load more than one session
+        working_set = int(session_bytes * LOAD_OVERHEAD_FACTOR) + REQUEST_OVERHEAD_BYTES
+        reservation.bytes = working_set if not reservation.measured else reservation.bytes + working_set
+        reservation.measured = True
+        with self._lock:
+            self._load_estimates[reservation.loader] = max(
+                reservation.bytes, self._load_estimates.get(reservation.loader, 0)
+            )
+        self.track("loads", reservation.key, reservation.bytes)
+
+    def reset(self) -> None:
+        """Forget learned load estimates and the peak; held objects stay accounted"""
+        with self._lock:
+            self._load_estimates.clear()
+            self.peak_bytes = self._total()
+
+    def stats(self) -> dict:
+        with self._lock:
+            components = {
+                component: {"bytes": sum(objects.values()), "objects": len(objects)}
+                for component, objects in self._usage.items()
+            }
+            total = self._total()
+            estimates = dict(self._load_estimates)
+        return {
+            "budget_bytes": self.budget_bytes or None,
+            "total_bytes": total,
+            "peak_bytes": self.peak_bytes,
+            "components": components,
+            "load_estimates": estimates,
+        }
+
+
+# Global memory budget instance
+memory_budget = MemoryBudget()
@@ -0,0 +1,350 @@
+"""
+In-process metrics with Prometheus text exposition
+
+Metrics are plain counters guarded by a lock. Labelled children are created
+once and reused, so recording a sample only bumps preallocated counters.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache hits up to cold FastF1 loads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing elapsed wall time into a histogram"""
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _Metric:
+    """Base class for a metric family with optional labels"""
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Get (or create once) the child for a set of label values"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{self._label_text(values)} {_format(child.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _render_child(self, values, child) -> List[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total, count = child.sum, child.count
+
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = self._label_text(values, f'le="{_format(bound)}"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_format(total)}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+# Cache key prefixes reported as separate families
+CACHE_KEY_FAMILIES = (
+    "race_results_", "race_telemetry_", "race_summary_", "race_compare_", "race_laps_",
+    "race_track_", "track_map_", "session_results_", "session_laps_", "session_telemetry_",
+    "session_weather_", "races_", "standings_", "predict_"
+)
+
+
+def cache_key_family(key: str) -> str:
+    """Map a cache key to the family it belongs to"""
+    for prefix in CACHE_KEY_FAMILIES:
+        if key.startswith(prefix):
+            return prefix.rstrip("_")
+    return "other"
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "f1_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "f1_http_requests_in_flight",
+    "HTTP requests currently being served"
+)
+FASTF1_STAGE_SECONDS = Histogram(
+    "f1_fastf1_stage_duration_seconds",
+    "Time spent in each FastF1Service processing stage",
+    ("stage",)
+)
+CACHE_REQUESTS = Counter(
+    "f1_cache_requests_total",
+    "Cache lookups by key family and outcome",
+    ("family", "result")
+)
+ML_INFERENCE_SECONDS = Histogram(
+    "f1_ml_inference_duration_seconds",
+    "ML prediction latency",
+    ("session_type",)
+)
+ML_INFERENCE_IN_FLIGHT = Gauge(
+    "f1_ml_inference_in_flight",
+    "ML predictions currently running"
+)
+REPLAY_VIEWERS = Gauge(
+    "f1_replay_viewers",
+    "Telemetry replay streams currently open",
+    ("transport",)
+)
+REPLAY_FRAMES = Counter(
+    "f1_replay_frames_total",
+    "Telemetry replay frames by outcome (sent, or dropped for slow clients)",
+    ("transport", "result")
+)
+FASTF1_CACHE_BYTES = Gauge(
+    "f1_fastf1_cache_bytes",
+    "FastF1 disk cache size at the last scan"
+)
+FASTF1_CACHE_EVICTIONS = Counter(
+    "f1_fastf1_cache_evictions_total",
+    "FastF1 cache sessions deleted to stay under the size cap"
+)
+ADMISSION_ACTIVE = Gauge(
+    "f1_admission_active",
+    "Requests holding a slot in each admission lane",
+    ("lane",)
+)
+ADMISSION_QUEUED = Gauge(
+    "f1_admission_queued",
+    "Requests waiting for a slot in each admission lane",
+    ("lane",)
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "f1_admission_wait_seconds",
+    "Time spent queued for an admission lane slot",
+    ("lane",)
+)
+ADMISSION_REJECTED = Counter(
+    "f1_admission_rejected_total",
+    "Requests shed by admission control (queue_full, timeout, rate_limited or memory)",
+    ("lane", "reason")
+)
+MEMORY_BYTES = Gauge(
+    "f1_memory_bytes",
+    "Estimated bytes held in process by component",
+    ("component",)
+)
+MEMORY_EVICTED_BYTES = Counter(
+    "f1_memory_evicted_bytes_total",
+    "Estimated bytes evicted to stay within the memory budget",
+    ("component",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], path, str(status["code"])
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,261 @@
+"""
+Opt-in sampling profiler for slow or explicitly profiled requests
+
+A single background thread samples the stack of the thread serving each
+tracked request. Requests are sampled from the start when profiling was asked
+for (admin header or query flag) and, when auto capture is enabled, once they
+run past the slow-request threshold. Captured profiles are kept in a ring
+buffer as collapsed stacks that flame graph tools can read directly.
+
+Requests are served on the event loop thread, so samples taken there while
+several requests overlap are attributed to each of them. Work a request hands
+to a worker thread through `to_thread` is sampled as part of that request
+only: the request's token travels in a context variable, which
+`asyncio.to_thread` copies, and the worker thread registers itself while it
+runs.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+
+
+# Token of the tracked request the current task or worker thread serves
+_request_token: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "profiled_request", default=None
+)
+
+
+class _TrackedRequest:
+    __slots__ = ("thread_ids", "started", "forced", "stacks", "samples")
+
+    def __init__(self, thread_id: int, forced: bool):
+        self.thread_ids: Set[int] = {thread_id}
+        self.started = time.perf_counter()
+        self.forced = forced
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+
+def _collapse(frame) -> str:
+    """Render a frame chain root-first in collapsed stack format"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        names.append(f"{module}:{code.co_name}".replace(";", ":"))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class RequestProfiler:
+    """Samples tracked requests and keeps a ring buffer of captured profiles"""
+
+    def __init__(
+        self,
+        interval_ms: Optional[float] = None,
+        slow_threshold_ms: Optional[float] = None,
+        buffer_size: Optional[int] = None
+    ):
+        self.interval = (interval_ms or settings.profiling_interval_ms) / 1000
+        self.slow_threshold = (slow_threshold_ms or settings.profiling_slow_threshold_ms) / 1000
+        self.profiles: Deque[dict] = deque(maxlen=buffer_size or settings.profiling_buffer_size)
+        self._active: Dict[int, _TrackedRequest] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_request(self, forced: bool) -> int:
+        """Begin tracking the current thread's request"""
+        token = next(self._ids)
+        with self._lock:
+            self._active[token] = _TrackedRequest(threading.get_ident(), forced)
+        self._ensure_thread()
+        self._wakeup.set()
+        return token
+
+    def finish_request(self, token: int, method: str, path: str, status: int) -> Optional[dict]:
+        """Stop tracking a request and store its profile if it qualifies"""
+        with self._lock:
+            tracked = self._active.pop(token, None)
+            if tracked is None:
+                return None
+            stacks = dict(tracked.stacks)
+
+        duration = time.perf_counter() - tracked.started
+        slow = duration >= self.slow_threshold
+        if not (tracked.forced or slow):
+            return None
+
+        profile = {
+            "id": token,
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(duration * 1000, 2),
+            "trigger": "requested" if tracked.forced else "slow",
+            "samples": tracked.samples,
+            "captured_at": datetime.now().isoformat(),
+            "stacks": stacks
+        }
+        with self._lock:
+            self.profiles.append(profile)
+        return profile
+
+    @contextmanager
+    def attach_thread(self, token: Optional[int] = None):
+        """Sample the current thread as part of a tracked request while the block runs
+
+        Defaults to the request the calling context serves; a no-op outside one.
+        """
+        token = _request_token.get() if token is None else token
+        thread_id = threading.get_ident()
+        with self._lock:
+            tracked = self._active.get(token) if token is not None else None
+            attached = tracked is not None and thread_id not in tracked.thread_ids
+            if attached:
+                tracked.thread_ids.add(thread_id)
+        try:
+            yield
+        finally:
+            if attached:
+                with self._lock:
+                    tracked.thread_ids.discard(thread_id)
+
+    def get_profile(self, profile_id: int) -> Optional[dict]:
+        with self._lock:
+            profiles = list(self.profiles)
+        for profile in profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+
+    def summaries(self) -> List[dict]:
+        """Recent profiles without their stacks, newest first"""
+        with self._lock:
+            profiles = list(self.profiles)
+        return [
+            {key: value for key, value in profile.items() if key != "stacks"}
+            for profile in reversed(profiles)
+        ]
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                tracked = list(self._active.values())
+            if not tracked:
+                # Sleep until a request is tracked again
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            now = time.perf_counter()
+            due = [t for t in tracked if t.forced or now - t.started >= self.slow_threshold]
+            if due:
+                frames = sys._current_frames()
+                with self._lock:
+                    for request in due:
+                        sampled = False
+                        for thread_id in request.thread_ids:
+                            frame = frames.get(thread_id)
+                            if frame is not None:
+                                request.stacks[_collapse(frame)] += 1
+                                sampled = True
+                        if sampled:
+                            request.samples += 1
+                del frames
+            time.sleep(self.interval)
+
+
+async def to_thread(func, *args, **kwargs):
+    """`asyncio.to_thread`, sampling the worker thread as part of the current request"""
+    def run():
+        with request_profiler.attach_thread():
+            return func(*args, **kwargs)
+
+    return await asyncio.to_thread(run)
+
+
+def to_collapsed(profile: dict) -> str:
+    """Format a profile as `stack count` lines"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(profile["stacks"].items()))
+
+
+def _profile_requested(scope) -> bool:
+    """Whether an admin asked to profile this request explicitly"""
+    if not settings.admin_token:
+        return False
+
+    flagged = False
+    token = None
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            flagged = value in (b"1", b"true")
+        elif name == b"x-admin-token":
+            token = value.decode("latin-1")
+    if not flagged and b"profile=" in scope.get("query_string", b""):
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        flagged = query.get("profile", [""])[0] in ("1", "true")
+    return flagged and token == settings.admin_token
+
+
+class ProfilingMiddleware:
+    """ASGI middleware attaching the sampling profiler to requests"""
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = _profile_requested(scope)
+        if not (forced or settings.profiling_enabled):
+            await self.app(scope, receive, send)
+            return
+
+        token = self.profiler.start_request(forced)
+        context = _request_token.set(token)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if forced:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", str(token).encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_token.reset(context)
+            route = scope.get("route")
+            self.profiler.finish_request(
+                token, scope["method"], getattr(route, "path", scope["path"]), status["code"]
+            )
+
+
+# Global profiler instance
+request_profiler = RequestProfiler()
@@ -0,0 +1,48 @@
+"""
+Startup readiness tracking
+
+Components register as required during startup and are marked ready once
+their deferred initialization finishes. `/ready` reports 503 until every
+required component is ready, while `/health` only reports liveness.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class Readiness:
+    """Tracks which startup components have finished initializing"""
+
+    def __init__(self):
+        self._components: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def require(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._components.setdefault(name, None)
+
+    def mark_ready(self, name: str) -> None:
+        with self._lock:
+            self._components[name] = datetime.now().isoformat()
+
+    @property
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(self._components.values())
+
+    def status(self) -> dict:
+        with self._lock:
+            components = dict(self._components)
+        return {
+            "status": "ready" if all(components.values()) else "starting",
+            "components": {
+                name: {"ready": ready_at is not None, "ready_at": ready_at}
+                for name, ready_at in components.items()
+            }
+        }
+
+
+# Global readiness tracker
+readiness = Readiness()
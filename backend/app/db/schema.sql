@@ -1,55 +1,53 @@
 -- F1 Dashboard Database Schema
 
--- Races table
-CREATE TABLE IF NOT EXISTS races (
+-- Normalized results tables, created by app/services/results_store.py from
+-- app/db/tables.py and populated whenever FastF1Service loads race results
+
+-- Events table
+CREATE TABLE IF NOT EXISTS events (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     season INTEGER NOT NULL,
     round INTEGER NOT NULL,
     race_name TEXT NOT NULL,
     circuit_name TEXT NOT NULL,
-    date DATE NOT NULL,
-    time TEXT,
-    url TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(season, round)
-);
-
--- Race results table
-CREATE TABLE IF NOT EXISTS race_results (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    race_id INTEGER NOT NULL,
-    position INTEGER NOT NULL,
-    driver_id TEXT NOT NULL,
-    constructor_id TEXT NOT NULL,
-    points REAL DEFAULT 0,
-    time TEXT,
-    status TEXT,
-    fastest_lap TEXT,
-    fastest_lap_rank INTEGER,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (race_id) REFERENCES races(id)
+    date DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_events_season_round UNIQUE (season, round)
 );
+CREATE INDEX IF NOT EXISTS ix_events_date ON events (date);
 
--- Drivers table
+-- Drivers table (driver_id is FastF1's Ergast id; codes are reused across eras)
 CREATE TABLE IF NOT EXISTS drivers (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    driver_id TEXT UNIQUE NOT NULL,
+    driver_id TEXT PRIMARY KEY,
+    code TEXT NOT NULL,
     first_name TEXT NOT NULL,
     last_name TEXT NOT NULL,
-    code TEXT UNIQUE NOT NULL,
-    permanent_number INTEGER,
-    nationality TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    permanent_number INTEGER
 );
+CREATE INDEX IF NOT EXISTS ix_drivers_code ON drivers (code);
 
 -- Constructors table
 CREATE TABLE IF NOT EXISTS constructors (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    constructor_id TEXT UNIQUE NOT NULL,
+    constructor_id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
-    nationality TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    nationality TEXT
+);
+
+-- Race results table (position is NULL when not classified)
+CREATE TABLE IF NOT EXISTS results (
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    driver_id TEXT NOT NULL REFERENCES drivers(driver_id),
+    constructor_id TEXT NOT NULL REFERENCES constructors(constructor_id),
+    position INTEGER,
+    points REAL NOT NULL DEFAULT 0,
+    time TEXT,
+    status TEXT,
+    fastest_lap TEXT,
+    fastest_lap_rank INTEGER,
+    PRIMARY KEY (event_id, driver_id)
 );
+CREATE INDEX IF NOT EXISTS ix_results_driver_event ON results (driver_id, event_id);
+CREATE INDEX IF NOT EXISTS ix_results_constructor_event ON results (constructor_id, event_id);
 
 -- Cache table (already created in cache_service.py)
 CREATE TABLE IF NOT EXISTS cache (
@@ -0,0 +1,61 @@
+"""
+Normalized tables for events, drivers, constructors and race results
+
+SQLAlchemy Core definitions; keep `schema.sql` in sync when changing them.
+"""
+
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, UniqueConstraint, func
+)
+
+metadata = MetaData()
+
+events = Table(
+    "events",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("season", Integer, nullable=False),
+    Column("round", Integer, nullable=False),
+    Column("race_name", String, nullable=False),
+    Column("circuit_name", String, nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+    UniqueConstraint("season", "round", name="uq_events_season_round"),
+    Index("ix_events_date", "date"),
+)
+
+drivers = Table(
+    "drivers",
+    metadata,
+    Column("driver_id", String, primary_key=True),
+    Column("code", String, nullable=False),
+    Column("first_name", String, nullable=False),
+    Column("last_name", String, nullable=False),
+    Column("permanent_number", Integer),
+    # Codes are reused across eras, so they don't identify a driver on their own
+    Index("ix_drivers_code", "code"),
+)
+
+constructors = Table(
+    "constructors",
+    metadata,
+    Column("constructor_id", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("nationality", String),
+)
+
+results = Table(
+    "results",
+    metadata,
+    Column("event_id", Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True),
+    Column("driver_id", String, ForeignKey("drivers.driver_id"), primary_key=True),
+    Column("constructor_id", String, ForeignKey("constructors.constructor_id"), nullable=False),
+    Column("position", Integer),  # NULL when not classified
+    Column("points", Float, nullable=False, default=0.0),
+    Column("time", String),
+    Column("status", String),
+    Column("fastest_lap", String),
+    Column("fastest_lap_rank", Integer),
+    Index("ix_results_driver_event", "driver_id", "event_id"),
+    Index("ix_results_constructor_event", "constructor_id", "event_id"),
+)
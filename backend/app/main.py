@@ -4,19 +4,95 @@ F1 Dashboard FastAPI Application
 This is the main entry point for the F1 Results & Predictions API.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api.routes_races import router as races_router
-from app.api.routes_predict import router as predict_router
+from app.api.routes_sessions import router as sessions_router
+from app.api.routes_predict import router as predict_router, ml_service
+from app.api.routes_replay import router as replay_router
+from app.api.routes_history import router as history_router
+from app.api.routes_admin import router as admin_router
+from app.core.admission import AdmissionMiddleware
 from app.core.config import settings
+from app.core.metrics import REGISTRY, MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.readiness import readiness
+from app.services.cache_service import cache_service
+from app.services.coordination_service import coordinator
+from app.services.disk_cache_service import fastf1_cache
+from app.services.fastf1_service import get_fastf1
+from app.services.results_store import results_store
+from app.services.warmup_service import warmup_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def reload_model(payload: dict) -> None:
+    """Another worker retrained or replaced the model artifacts"""
+    ml_service.reload()
+    # Drop predictions cached from the old model, including any this worker
+    # stored after the publishing worker invalidated but before this reload
+    cache_service.delete_prefix("predict_")
+
+
+coordinator.subscribe("model_reload", reload_model)
+
+
+async def initialize_services():
+    """Run deferred initialization off the event loop, marking each part ready"""
+    steps = [
+        ("cache", cache_service.initialize),
+        ("database", results_store.initialize),
+        ("fastf1", get_fastf1),
+        ("ml_model", ml_service.load),
+    ]
+    for name, step in steps:
+        try:
+            if asyncio.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.to_thread(step)
+            readiness.mark_ready(name)
+        except Exception as e:
+            logger.error(f"Error initializing {name}: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services in the background and start periodic jobs"""
+    readiness.require("cache", "database", "fastf1", "ml_model")
+    startup = asyncio.create_task(initialize_services())
+    coordinator.start()
+    if settings.fastf1_cache_max_mb > 0:
+        fastf1_cache.start()
+    if settings.warmup_enabled:
+        readiness.require("warmup")
+        warmup_scheduler.start()
+    yield
+    startup.cancel()
+    await warmup_scheduler.stop()
+    await fastf1_cache.stop()
+    await asyncio.to_thread(coordinator.stop)
+    await results_store.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="F1 Dashboard API",
     description="API for F1 race results, telemetry, and predictions",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Admit requests through the fast lane; cold loads and inference queue separately.
+# Added first so it sits inside CORS and metrics, which then see shed requests.
+app.add_middleware(AdmissionMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -26,9 +102,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Sample slow or explicitly profiled requests
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(races_router, prefix="/api")
+app.include_router(sessions_router, prefix="/api")
 app.include_router(predict_router, prefix="/api")
+app.include_router(replay_router, prefix="/api")
+app.include_router(history_router, prefix="/api")
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -37,6 +123,19 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint; 503 until startup initialization and warmup are done"""
+    status = readiness.status()
+    return JSONResponse(status, status_code=200 if readiness.is_ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API info"""
@@ -44,5 +143,6 @@ async def root():
         "message": "F1 Dashboard API",
         "version": "1.0.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready"
     }
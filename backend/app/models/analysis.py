@@ -0,0 +1,142 @@
+"""
+Analysis-related Pydantic models
+"""
+
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from app.models.race import Race
+
+
+class DriverDelta(BaseModel):
+    """One driver's lap resampled onto the comparison grid"""
+    code: str
+    lap_number: Optional[int] = None
+    lap_time: Optional[str] = None
+    speed: List[float]
+    delta: List[float]  # cumulative seconds behind (+) or ahead (-) of the reference
+    final_delta: float
+
+
+class MiniSector(BaseModel):
+    """Per mini-sector time gained over the reference driver"""
+    start: float
+    end: float
+    fastest: str
+    gains: List[float]  # seconds gained per driver, in request order
+
+
+class LapComparison(BaseModel):
+    """Driver-vs-driver delta time on a common distance grid"""
+    race: Race
+    reference: str
+    distance: List[float]
+    drivers: List[DriverDelta]
+    mini_sectors: List[MiniSector]
+
+
+class StintSummary(BaseModel):
+    """One tyre stint with its degradation trend"""
+    driver: str
+    stint: int
+    compound: Optional[str] = None
+    start_lap: int
+    end_lap: int
+    laps: int
+    mean_lap_time: Optional[float] = None
+    degradation: Optional[float] = None  # seconds per lap of tyre age, least-squares slope
+
+
+class PitStop(BaseModel):
+    """A pit stop; duration is pit lane time from entry to exit"""
+    driver: str
+    lap: int
+    duration: Optional[float] = None
+
+
+class LapAnalysis(BaseModel):
+    """Lap-by-lap data for every driver, stored column-wise
+
+    `lap_times` and `positions` hold one row per driver (in `drivers` order)
+    and one column per lap (in `lap_numbers` order).
+    """
+    race: Race
+    session_type: str = "R"
+    drivers: List[str]
+    lap_numbers: List[int]
+    lap_times: List[List[Optional[float]]]
+    positions: List[List[Optional[int]]]
+    stints: List[StintSummary]
+    pit_stops: List[PitStop]
+
+
+class LapTimesPage(BaseModel):
+    """A lap range of lap times and positions"""
+    race: Race
+    drivers: List[str]
+    lap_numbers: List[int]
+    lap_times: List[List[Optional[float]]]
+    positions: List[List[Optional[int]]]
+    total_laps: int
+    next_start_lap: Optional[int] = None
+
+
+class RaceStints(BaseModel):
+    """Stints and degradation for all drivers"""
+    race: Race
+    stints: List[StintSummary]
+
+
+class RacePitStops(BaseModel):
+    """Pit stops for all drivers"""
+    race: Race
+    pit_stops: List[PitStop]
+
+
+class DriverTelemetrySummary(BaseModel):
+    """Whole-race car data statistics for one driver"""
+    driver: str
+    team: Optional[str] = None
+    laps: int
+    top_speed: Optional[float] = None
+    average_speed: Optional[float] = None
+    speed_trap: Optional[float] = None  # best speed-trap reading, km/h
+    speed_i1: Optional[float] = None
+    speed_i2: Optional[float] = None
+    speed_finish_line: Optional[float] = None
+    full_throttle_pct: Optional[float] = None
+    braking_pct: Optional[float] = None
+    braking_zones: int
+    braking_zones_per_lap: Optional[float] = None
+    drs_open_pct: Optional[float] = None
+    drs_activations: int
+
+
+class TelemetrySummary(BaseModel):
+    """Per-driver telemetry statistics for the whole field, in finishing order"""
+    race: Race
+    drivers: List[DriverTelemetrySummary]
+
+
+class TrackMap(BaseModel):
+    """Simplified circuit outline shared by every race on the same layout"""
+    circuit_name: str
+    layout: str
+    x: List[float]
+    y: List[float]
+    distance: List[float]  # fraction of the lap, 0..1, at each point
+    tolerance: float  # Douglas-Peucker tolerance used, in position units (1/10 m)
+    original_points: int
+    source_season: int
+    source_round: int
+    source_driver: str
+    source_lap: int
+
+
+class TrackTelemetry(BaseModel):
+    """A driver's lap channels sampled at each point of the track map"""
+    race: Race
+    layout: str
+    driver: str
+    lap_number: int
+    lap_time: Optional[str] = None
+    channels: Dict[str, List[Optional[float]]]
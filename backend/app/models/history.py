@@ -0,0 +1,56 @@
+"""
+Historical results Pydantic models
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from app.models.race import Driver
+
+
+class HistoryEntry(BaseModel):
+    """One race result in a driver's history"""
+    season: int
+    round: int
+    race_name: str
+    date: datetime
+    constructor: str
+    position: Optional[int] = None  # None when not classified
+    points: float
+    status: Optional[str] = None
+
+
+class CareerSummary(BaseModel):
+    """Aggregates over the returned history range"""
+    starts: int
+    wins: int
+    podiums: int
+    points: float
+    best_position: Optional[int] = None
+
+
+class DriverHistory(BaseModel):
+    """A driver's stored race results, newest first"""
+    driver: Driver
+    summary: CareerSummary
+    results: List[HistoryEntry]
+
+
+class HeadToHeadRace(BaseModel):
+    """Both competitors' best classified positions at one race"""
+    season: int
+    round: int
+    race_name: str
+    positions: List[Optional[int]]  # in request order
+    points: List[float]
+    ahead: Optional[str] = None  # None when neither was classified
+
+
+class HeadToHead(BaseModel):
+    """Head-to-head record between two drivers or two constructors"""
+    kind: str  # "drivers" or "constructors"
+    competitors: List[str]
+    races: int
+    ahead: List[int]  # races finished ahead, in request order
+    points: List[float]
+    results: List[HeadToHeadRace]
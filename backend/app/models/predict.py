@@ -3,7 +3,7 @@ Prediction-related Pydantic models
 """
 
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models.race import Driver
 
 
@@ -15,6 +15,8 @@ class PredictRequest(BaseModel):
     weather_condition: Optional[str] = None
     track_temperature: Optional[float] = None
     air_temperature: Optional[float] = None
+    simulation_runs: Optional[int] = Field(default=None, ge=1)  # race only; defaults to settings
+    seed: Optional[int] = Field(default=None, ge=0)  # race only; fixes the simulation RNG and runs every simulation
 
 
 class DriverPrediction(BaseModel):
@@ -23,6 +25,12 @@ class DriverPrediction(BaseModel):
     predicted_position: int
     confidence: float
     reasoning: Optional[str] = None
+    # Race simulation outputs
+    position_probabilities: Optional[List[float]] = None  # P(finish in P1..Pn)
+    expected_position: Optional[float] = None
+    win_probability: Optional[float] = None
+    podium_probability: Optional[float] = None
+    dnf_probability: Optional[float] = None
 
 
 class PredictResponse(BaseModel):
@@ -45,6 +45,8 @@ class Race(BaseModel):
     date: datetime
     time: Optional[str] = None
     url: Optional[str] = None
+    event_format: Optional[str] = None  # conventional, sprint_qualifying, ...
+    sessions: List[str] = []  # session identifiers in weekend order, e.g. FP1, SQ, S, Q, R
 
 
 class RaceResults(BaseModel):
@@ -53,6 +55,48 @@ class RaceResults(BaseModel):
     results: List[RaceResult]
 
 
+class SessionResult(BaseModel):
+    """Single classification entry of any session"""
+    position: Optional[int] = None
+    driver: Driver
+    constructor: Constructor
+    grid_position: Optional[int] = None
+    points: Optional[float] = None
+    time: Optional[str] = None
+    status: Optional[str] = None
+    q1: Optional[str] = None
+    q2: Optional[str] = None
+    q3: Optional[str] = None
+
+
+class SessionResults(BaseModel):
+    """Classification of one session of a race weekend"""
+    race: Race
+    session_type: str
+    session_name: str
+    results: List[SessionResult]
+
+
+class WeatherSample(BaseModel):
+    """Weather station reading"""
+    time: float  # seconds of session time
+    air_temp: Optional[float] = None
+    track_temp: Optional[float] = None
+    humidity: Optional[float] = None
+    pressure: Optional[float] = None
+    rainfall: Optional[bool] = None
+    wind_speed: Optional[float] = None
+    wind_direction: Optional[int] = None
+
+
+class SessionWeather(BaseModel):
+    """Weather readings through one session"""
+    race: Race
+    session_type: str
+    session_name: str
+    samples: List[WeatherSample]
+
+
 class TelemetryPoint(BaseModel):
     """Single telemetry data point"""
     distance: float
@@ -75,6 +119,7 @@ class DriverTelemetry(BaseModel):
 class RaceTelemetry(BaseModel):
     """Complete race telemetry model"""
     race: Race
+    session_type: str = "R"
     drivers_telemetry: List[DriverTelemetry]
 
 
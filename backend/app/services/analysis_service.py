@@ -0,0 +1,261 @@
+"""
+Analysis service for lap comparisons, race pace and telemetry summaries
+
+Everything here operates on whole NumPy arrays or grouped pandas frames;
+there are no per-sample or per-lap Python loops.
+"""
+
+from typing import List, Sequence
+
+from app.models.analysis import DriverDelta, MiniSector, PitStop, StintSummary
+
+# Throttle at or above this counts as flat out
+FULL_THROTTLE = 99.0
+# FastF1 DRS states of 10 and above mean the flap is open
+DRS_OPEN = 10
+
+
+class AnalysisService:
+    """Vectorized lap analysis helpers"""
+
+    @staticmethod
+    def resample_laps(
+        distances: Sequence,
+        times: Sequence,
+        speeds: Sequence,
+        grid_step: float
+    ):
+        """Interpolate each driver's lap onto a shared distance grid
+
+        Returns the grid plus (n_drivers, n_points) arrays of elapsed time and speed.
+        """
+        import numpy as np
+
+        # Anchor every trace at the start line (distance 0 at lap time 0). Distance
+        # is integrated from speed, so it can only plateau; enforce that too.
+        distances = [
+            np.maximum.accumulate(np.concatenate(([0.0], np.asarray(d, dtype=np.float64))))
+            for d in distances
+        ]
+        times = [np.concatenate(([0.0], np.asarray(t, dtype=np.float64))) for t in times]
+        speeds = [np.asarray(v, dtype=np.float64) for v in speeds]
+        speeds = [np.concatenate((v[:1], v)) for v in speeds]
+
+        lap_length = min(d[-1] for d in distances)
+        grid = np.arange(0.0, lap_length, grid_step)
+
+        elapsed = np.vstack([np.interp(grid, d, t) for d, t in zip(distances, times)])
+        speed = np.vstack([np.interp(grid, d, v) for d, v in zip(distances, speeds)])
+        return grid, elapsed, speed
+
+    @staticmethod
+    def mini_sector_gains(grid, elapsed, n_sectors: int):
+        """Split the grid into equal-length mini-sectors
+
+        Returns sector boundaries, (n_drivers, n_sectors) sector times and the
+        time each driver gains over the reference (row 0) per sector.
+        """
+        import numpy as np
+
+        n_sectors = max(1, min(n_sectors, len(grid) - 1))
+        edges = np.linspace(0, len(grid) - 1, n_sectors + 1).round().astype(np.int64)
+        sector_times = np.diff(elapsed[:, edges], axis=1)
+        gains = sector_times[0] - sector_times
+        return grid[edges], sector_times, gains
+
+    @staticmethod
+    def compare(
+        codes: List[str],
+        distances: Sequence,
+        times: Sequence,
+        speeds: Sequence,
+        grid_step: float = 10.0,
+        n_sectors: int = 25
+    ):
+        """Build the delta-time comparison for drivers; the first code is the reference"""
+        import numpy as np
+
+        grid, elapsed, speed = AnalysisService.resample_laps(distances, times, speeds, grid_step)
+        delta = elapsed - elapsed[0]
+        boundaries, sector_times, gains = AnalysisService.mini_sector_gains(grid, elapsed, n_sectors)
+        fastest = np.argmin(sector_times, axis=0)
+
+        drivers = [
+            DriverDelta(
+                code=code,
+                speed=np.round(speed[i], 1).tolist(),
+                delta=np.round(delta[i], 3).tolist(),
+                final_delta=round(float(delta[i, -1]), 3)
+            )
+            for i, code in enumerate(codes)
+        ]
+        mini_sectors = [
+            MiniSector(
+                start=round(float(boundaries[j]), 1),
+                end=round(float(boundaries[j + 1]), 1),
+                fastest=codes[fastest[j]],
+                gains=np.round(gains[:, j], 3).tolist()
+            )
+            for j in range(len(boundaries) - 1)
+        ]
+        return np.round(grid, 1).tolist(), drivers, mini_sectors
+
+    @staticmethod
+    def summarize_laps(laps) -> dict:
+        """Build lap tables, stints and pit stops for every driver from `session.laps`
+
+        Returns a dict with `drivers`, `lap_numbers`, `lap_times`, `positions`
+        (driver-by-lap matrices), `stints` and `pit_stops`. Degradation slopes are
+        raw lap time per lap of tyre age and are not corrected for fuel burn.
+        """
+        import numpy as np
+        import pandas as pd
+
+        accurate = laps['IsAccurate'] if 'IsAccurate' in laps.columns else True
+        frame = pd.DataFrame({
+            'driver': laps['Driver'],
+            'lap': laps['LapNumber'],
+            'time': laps['LapTime'].dt.total_seconds(),
+            'position': laps['Position'],
+            'stint': laps['Stint'],
+            'compound': laps['Compound'],
+            'tyre_life': laps['TyreLife'].fillna(laps['LapNumber']),
+            'pit_in': laps['PitInTime'].dt.total_seconds(),
+            'pit_out': laps['PitOutTime'].dt.total_seconds(),
+            'accurate': accurate,
+        }).dropna(subset=['driver', 'lap'])
+        frame['lap'] = frame['lap'].astype(np.int64)
+        frame = frame.sort_values(['driver', 'lap'])
+
+        # Order drivers by their position on their last lap
+        last_position = frame.groupby('driver')['position'].last()
+        drivers = last_position.sort_values(na_position='last').index.tolist()
+        lap_numbers = np.arange(1, frame['lap'].max() + 1)
+
+        def matrix(column, dtype):
+            table = frame.pivot_table(index='driver', columns='lap', values=column, aggfunc='first')
+            table = table.reindex(index=drivers, columns=lap_numbers)
+            return table.round(3).astype(dtype).to_numpy(dtype=object, na_value=None)
+
+        lap_times = matrix('time', 'Float64')
+        positions = matrix('position', 'Int64')
+
+        # Stint degradation: least-squares slope of lap time over tyre age, from
+        # grouped sums so each stint is solved in closed form
+        clean = frame[
+            frame['accurate'].astype(bool)
+            & frame['pit_in'].isna()
+            & frame['pit_out'].isna()
+            & frame['time'].notna()
+        ]
+        x, y = clean['tyre_life'], clean['time']
+        sums = clean.assign(x=x, y=y, xy=x * y, xx=x * x).groupby(['driver', 'stint']).agg(
+            n=('x', 'size'), sx=('x', 'sum'), sy=('y', 'sum'), sxy=('xy', 'sum'), sxx=('xx', 'sum')
+        )
+        denominator = sums['n'] * sums['sxx'] - sums['sx'] ** 2
+        slope = (sums['n'] * sums['sxy'] - sums['sx'] * sums['sy']) / denominator.where(denominator > 0)
+        fits = pd.DataFrame({
+            'mean_lap_time': sums['sy'] / sums['n'],
+            'degradation': slope.where(sums['n'] >= 3),
+        })
+
+        bounds = frame.groupby(['driver', 'stint']).agg(
+            compound=('compound', 'first'),
+            start_lap=('lap', 'min'),
+            end_lap=('lap', 'max'),
+            laps=('lap', 'size'),
+        )
+        stint_table = bounds.join(fits).reset_index()
+        stint_table['order'] = stint_table['driver'].map({code: i for i, code in enumerate(drivers)})
+        stint_table = stint_table.sort_values(['order', 'stint'])
+
+        stints = [
+            StintSummary(
+                driver=row.driver,
+                stint=int(row.stint),
+                compound=row.compound if pd.notna(row.compound) else None,
+                start_lap=int(row.start_lap),
+                end_lap=int(row.end_lap),
+                laps=int(row.laps),
+                mean_lap_time=round(float(row.mean_lap_time), 3) if pd.notna(row.mean_lap_time) else None,
+                degradation=round(float(row.degradation), 4) if pd.notna(row.degradation) else None
+            )
+            for row in stint_table.itertuples(index=False)
+        ]
+
+        # Pit lane time runs from pit entry on one lap to pit exit on the next
+        frame['next_pit_out'] = frame.groupby('driver')['pit_out'].shift(-1)
+        stop_table = frame[frame['pit_in'].notna()].copy()
+        stop_table['duration'] = stop_table['next_pit_out'] - stop_table['pit_in']
+        stop_table['order'] = stop_table['driver'].map({code: i for i, code in enumerate(drivers)})
+        stop_table = stop_table.sort_values(['order', 'lap'])
+
+        pit_stops = [
+            PitStop(
+                driver=row.driver,
+                lap=int(row.lap),
+                duration=round(float(row.duration), 3) if pd.notna(row.duration) else None
+            )
+            for row in stop_table.itertuples(index=False)
+        ]
+
+        return {
+            'drivers': drivers,
+            'lap_numbers': lap_numbers.tolist(),
+            'lap_times': lap_times.tolist(),
+            'positions': positions.tolist(),
+            'stints': stints,
+            'pit_stops': pit_stops,
+        }
+
+    @staticmethod
+    def summarize_car_data(
+        times: Sequence,
+        speeds: Sequence,
+        throttles: Sequence,
+        brakes: Sequence,
+        drs: Sequence
+    ) -> dict:
+        """Reduce every driver's car data to summary statistics in one pass
+
+        Each argument holds one array per driver. The traces are concatenated
+        and reduced per driver with `reduceat`/`bincount`, so the cost is a
+        handful of array operations for the whole field. Percentages are
+        weighted by sample duration; braking zones and DRS activations count
+        off-to-on transitions.
+        """
+        import numpy as np
+
+        lengths = np.array([len(t) for t in times])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        n_drivers = len(lengths)
+        driver = np.repeat(np.arange(n_drivers), lengths)
+
+        time = np.concatenate([np.asarray(t, dtype=np.float64) for t in times])
+        speed = np.concatenate([np.asarray(v, dtype=np.float64) for v in speeds])
+        throttle = np.concatenate([np.asarray(v, dtype=np.float64) for v in throttles])
+        brake = np.concatenate([np.asarray(v, dtype=bool) for v in brakes])
+        drs_open = np.concatenate([np.asarray(v, dtype=np.float64) for v in drs]) >= DRS_OPEN
+
+        # Duration of each sample; the last sample of every driver gets none
+        same_driver = np.concatenate((driver[1:] == driver[:-1], [False]))
+        dt = np.where(same_driver, np.diff(time, append=time[-1]), 0.0)
+        total = np.bincount(driver, weights=dt, minlength=n_drivers)
+        total = np.where(total > 0, total, np.nan)
+
+        def share(mask):
+            return 100 * np.bincount(driver, weights=dt * mask, minlength=n_drivers) / total
+
+        def activations(mask):
+            rising = mask[1:] & ~mask[:-1] & same_driver[:-1]
+            return np.bincount(driver[1:][rising], minlength=n_drivers)
+
+        return {
+            "top_speed": np.fmax.reduceat(speed, offsets),
+            "average_speed": np.bincount(driver, weights=dt * np.nan_to_num(speed), minlength=n_drivers) / total,
+            "full_throttle_pct": share(throttle >= FULL_THROTTLE),
+            "braking_pct": share(brake),
+            "braking_zones": activations(brake),
+            "drs_open_pct": share(drs_open),
+            "drs_activations": activations(drs_open),
+        }
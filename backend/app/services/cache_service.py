@@ -4,20 +4,44 @@ Cache service for data caching
 
 import sqlite3
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 import logging
 from app.core.config import settings
+from app.core.memory import estimate_bytes, memory_budget
+from app.core.metrics import CACHE_REQUESTS, FASTF1_STAGE_SECONDS, cache_key_family
+from app.services.coordination_service import coordinator
 
 logger = logging.getLogger(__name__)
 
+# Small, frequently read payloads also kept decoded in process. Other workers
+# drop their copies when one of these keys changes (see coordination_service).
+HOT_KEY_PREFIXES = ("races_", "standings_")
+
 
 class CacheService:
     """Simple SQLite-based cache service"""
     
     def __init__(self):
         self.db_path = "cache.db"
-        self._init_database()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._hot: "OrderedDict[str, Tuple[Any, datetime, int]]" = OrderedDict()
+        self._hot_lock = threading.Lock()
+        # Bumped by every invalidation so reads that started before it don't
+        # put what they read back into the hot set
+        self._hot_generation = 0
+    
+    def initialize(self):
+        """Create the cache table once; called at startup or on first use"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if not self._initialized:
+                self._init_database()
+                self._initialized = True
     
     def _init_database(self):
         """Initialize the cache database"""
@@ -40,11 +64,65 @@ class CacheService:
         except Exception as e:
             logger.error(f"Error initializing cache database: {e}")
     
+    @staticmethod
+    def _is_hot(key: str) -> bool:
+        # Without coordination another worker's write would leave a stale copy here
+        return (
+            settings.coordination_enabled
+            and settings.cache_hot_entries > 0
+            and key.startswith(HOT_KEY_PREFIXES)
+        )
+    
+    def _remember(self, key: str, value: Any, expires_at: datetime, generation: Optional[int] = None) -> None:
+        nbytes = estimate_bytes(value)
+        with self._hot_lock:
+            if generation is not None and generation != self._hot_generation:
+                return
+            self._hot[key] = (value, expires_at, nbytes)
+            self._hot.move_to_end(key)
+            while len(self._hot) > settings.cache_hot_entries:
+                memory_budget.release("cache", self._hot.popitem(last=False)[0])
+        # Outside the lock: going over budget calls back into `shed`
+        memory_budget.track("cache", key, nbytes)
+    
+    def shed(self, nbytes: int) -> int:
+        """Drop least recently used in-process copies until `nbytes` are freed; returns bytes freed"""
+        freed = 0
+        with self._hot_lock:
+            while self._hot and freed < nbytes:
+                key, (_, _, size) = self._hot.popitem(last=False)
+                memory_budget.release("cache", key)
+                freed += size
+        return freed
+    
+    def drop_hot(self, payload: dict) -> None:
+        """Forget in-process copies named by an invalidation event (`keys` or `prefix`)"""
+        with self._hot_lock:
+            self._hot_generation += 1
+            keys = [key for key in payload.get("keys", ()) if key in self._hot]
+            prefix = payload.get("prefix")
+            if prefix is not None:
+                keys += [key for key in self._hot if key.startswith(prefix)]
+            for key in keys:
+                if self._hot.pop(key, None) is not None:
+                    memory_budget.release("cache", key)
+    
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if not settings.enable_cache:
             return None
         
+        generation = None
+        if self._is_hot(key):
+            with self._hot_lock:
+                entry = self._hot.get(key)
+                if entry is not None and entry[1] >= datetime.now():
+                    self._hot.move_to_end(key)
+                    CACHE_REQUESTS.labels(cache_key_family(key), "hit").inc()
+                    return entry[0]
+                generation = self._hot_generation
+        
+        self.initialize()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -58,6 +136,7 @@ class CacheService:
             conn.close()
             
             if result is None:
+                CACHE_REQUESTS.labels(cache_key_family(key), "miss").inc()
                 return None
             
             value, expires_at = result
@@ -66,12 +145,19 @@ class CacheService:
             # Check if expired
             if expires_at < datetime.now():
                 await self.delete(key)
+                CACHE_REQUESTS.labels(cache_key_family(key), "miss").inc()
                 return None
             
-            return json.loads(value)
+            CACHE_REQUESTS.labels(cache_key_family(key), "hit").inc()
+            value = json.loads(value)
+            if generation is not None:
+                # Skipped if the key was invalidated while it was being read
+                self._remember(key, value, expires_at, generation)
+            return value
             
         except Exception as e:
             logger.error(f"Error getting cache key {key}: {e}")
+            CACHE_REQUESTS.labels(cache_key_family(key), "error").inc()
             return None
     
     async def set(self, key: str, value: Any, ttl_hours: Optional[int] = None) -> bool:
@@ -79,21 +165,29 @@ class CacheService:
         if not settings.enable_cache:
             return False
         
+        self.initialize()
         try:
             ttl_hours = ttl_hours or settings.cache_ttl_hours
             expires_at = datetime.now() + timedelta(hours=ttl_hours)
             
+            with FASTF1_STAGE_SECONDS.labels("serialization").time():
+                payload = json.dumps(value, default=str)
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute(
                 "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
-                (key, json.dumps(value, default=str), expires_at.isoformat())
+                (key, payload, expires_at.isoformat())
             )
             
             conn.commit()
             conn.close()
             
+            if self._is_hot(key):
+                self._remember(key, json.loads(payload), expires_at)
+                coordinator.publish("cache_invalidate", {"keys": [key]})
+            
             return True
             
         except Exception as e:
@@ -102,6 +196,7 @@ class CacheService:
     
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
+        self.initialize()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -111,14 +206,45 @@ class CacheService:
             conn.commit()
             conn.close()
             
+            if self._is_hot(key):
+                self.drop_hot({"keys": [key]})
+                coordinator.publish("cache_invalidate", {"keys": [key]})
+            
             return True
             
         except Exception as e:
             logger.error(f"Error deleting cache key {key}: {e}")
             return False
     
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete stored entries whose key starts with `prefix`, without notifying other workers"""
+        self.initialize()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+    
+    async def invalidate(self, prefix: str) -> int:
+        """Delete every entry whose key starts with `prefix`, in every worker"""
+        try:
+            deleted_count = self.delete_prefix(prefix)
+            
+            self.drop_hot({"prefix": prefix})
+            coordinator.publish("cache_invalidate", {"prefix": prefix})
+            logger.info(f"Invalidated {deleted_count} cache entries with prefix {prefix!r}")
+            return deleted_count
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache prefix {prefix}: {e}")
+            return 0
+    
     async def clear_expired(self) -> int:
         """Clear expired cache entries"""
+        self.initialize()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -142,3 +268,5 @@ class CacheService:
 
 # Global cache instance
 cache_service = CacheService()
+coordinator.subscribe("cache_invalidate", cache_service.drop_hot)
+memory_budget.register_evictor("cache", cache_service.shed)
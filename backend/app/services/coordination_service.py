@@ -0,0 +1,150 @@
+"""
+Cross-worker coordination over a shared SQLite file
+
+Each uvicorn worker keeps some state in process: the model copy, memoized
+features and the cache's hot set. Workers announce changes to that state by
+appending an event row to `settings.coordination_db_path`, and every worker
+polls `PRAGMA data_version`, which only changes when another connection has
+committed, so an idle poll is a single cheap pragma with no table reads.
+No broker or external service is needed; all workers on a host share the file.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], None]
+
+
+class Coordinator:
+    """Publishes events to, and applies events from, the other workers"""
+
+    def __init__(self, db_path: Optional[str] = None, poll_ms: Optional[int] = None):
+        self.db_path = db_path
+        self.poll_ms = poll_ms
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> str:
+        return self.db_path or settings.coordination_db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        return conn
+
+    def subscribe(self, kind: str, handler: Handler) -> None:
+        """Call `handler(payload)` for each event of `kind` published by another worker"""
+        self._handlers[kind].append(handler)
+
+    def publish(self, kind: str, payload: Optional[dict] = None) -> bool:
+        """Announce an event to the other workers; returns success"""
+        if not settings.coordination_enabled:
+            return False
+        try:
+            conn = self._connect()
+            try:
+                now = time.time()
+                conn.execute(
+                    "INSERT INTO events (kind, payload, origin, created_at) VALUES (?, ?, ?, ?)",
+                    (kind, json.dumps(payload or {}), self.origin, now)
+                )
+                conn.execute(
+                    "DELETE FROM events WHERE created_at < ?",
+                    (now - settings.coordination_retention_minutes * 60,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error publishing {kind} event: {e}")
+            return False
+
+    def poll(self) -> int:
+        """Apply events committed by other workers since the last poll; returns how many"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+                self._data_version = None
+                self._last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return 0
+            self._data_version = data_version
+
+            rows = self._conn.execute(
+                "SELECT id, kind, payload, origin FROM events WHERE id > ? ORDER BY id",
+                (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+            rows = [row for row in rows if row[3] != self.origin]
+
+        for _, kind, payload, _ in rows:
+            for handler in self._handlers.get(kind, ()):
+                try:
+                    handler(json.loads(payload))
+                except Exception as e:
+                    logger.error(f"Error applying {kind} event: {e}")
+        return len(rows)
+
+    def start(self) -> None:
+        """Poll in a background thread until `stop()`"""
+        if not settings.coordination_enabled or self._thread is not None:
+            return
+        self.poll()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="coordination", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        interval = (self.poll_ms or settings.coordination_poll_ms) / 1000
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error polling coordination events: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global coordinator instance
+coordinator = Coordinator()
@@ -0,0 +1,308 @@
+"""
+Bounded FastF1 disk cache
+
+FastF1 stores raw downloads under `settings.fastf1_cache_dir` as
+`<year>/<event>/<session>/*.ff1pkl` and never removes anything. This manager
+records when each session was last loaded, reports disk usage by season and
+session, and keeps the directory under `settings.fastf1_cache_max_mb` by
+deleting whole sessions, least recently used first. Race sessions whose
+results are already in the results database are kept, and only go once
+nothing else is left to evict. FastF1 downloads an evicted session again
+if it is ever needed.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import FASTF1_CACHE_BYTES, FASTF1_CACHE_EVICTIONS
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "session_index.sqlite"
+HTTP_CACHE_FILE = "fastf1_http_cache.sqlite"
+# Evict down to this fraction of the cap so compaction doesn't run on every load
+LOW_WATER_MARK = 0.9
+_STATIC_PREFIX = "/static/"
+_YEAR = re.compile(r"^\d{4}$")
+
+
+class SessionUsage(NamedTuple):
+    """Disk usage of one cached session directory"""
+    season: int
+    event: str
+    session: str
+    path: str  # relative to the cache directory
+    bytes: int
+    files: int
+    last_access: float  # epoch seconds
+    round: Optional[int] = None
+    processed: bool = False
+
+
+def _directory_size(path: str) -> Tuple[int, int]:
+    total = files = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass
+    return total, files
+
+
+class FastF1CacheManager:
+    """Tracks and bounds the FastF1 disk cache"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def path(self) -> str:
+        return self.cache_dir or settings.fastf1_cache_dir
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.fastf1_cache_max_mb * 1024 * 1024
+
+    def _index(self) -> sqlite3.Connection:
+        os.makedirs(self.path, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.path, INDEX_FILE), timeout=5)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                path TEXT PRIMARY KEY,
+                season INTEGER NOT NULL,
+                round INTEGER NOT NULL,
+                session TEXT,
+                last_access REAL NOT NULL
+            )
+        """)
+        return conn
+
+    def record_access(self, session, season: int, round_number: int) -> None:
+        """Note that a session was just loaded; sessions without a cache path are ignored"""
+        api_path = getattr(session, "api_path", None)
+        if not isinstance(api_path, str) or not api_path.startswith(_STATIC_PREFIX):
+            return
+        try:
+            conn = self._index()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (path, season, round, session, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        api_path[len(_STATIC_PREFIX):].strip("/"),
+                        season,
+                        round_number,
+                        getattr(session, "name", None),
+                        time.time()
+                    )
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error recording FastF1 cache access for {season}/{round_number}: {e}")
+
+    def scan(self, processed: Optional[Set[Tuple[int, int]]] = None) -> List[SessionUsage]:
+        """Every cached session directory, with its index entry when it has one"""
+        if not os.path.isdir(self.path):
+            return []
+
+        conn = self._index()
+        try:
+            rows = conn.execute("SELECT path, round, session, last_access FROM sessions").fetchall()
+            index: Dict[str, tuple] = {row[0]: row[1:] for row in rows}
+        finally:
+            conn.close()
+
+        sessions = []
+        for year in sorted(os.listdir(self.path)):
+            year_path = os.path.join(self.path, year)
+            if not _YEAR.match(year) or not os.path.isdir(year_path):
+                continue
+            for event in sorted(os.listdir(year_path)):
+                event_path = os.path.join(year_path, event)
+                if not os.path.isdir(event_path):
+                    continue
+                for name in sorted(os.listdir(event_path)):
+                    session_path = os.path.join(event_path, name)
+                    if not os.path.isdir(session_path):
+                        continue
+                    relative = f"{year}/{event}/{name}"
+                    size, files = _directory_size(session_path)
+                    round_number, session_name, last_access = index.get(relative, (None, None, None))
+                    if last_access is None:
+                        last_access = os.path.getmtime(session_path)
+                    sessions.append(SessionUsage(
+                        season=int(year),
+                        event=event,
+                        session=name,
+                        path=relative,
+                        bytes=size,
+                        files=files,
+                        last_access=last_access,
+                        round=round_number,
+                        processed=(
+                            processed is not None
+                            and session_name == "Race"
+                            and (int(year), round_number) in processed
+                        )
+                    ))
+        return sessions
+
+    def http_cache_bytes(self) -> int:
+        """Size of FastF1's HTTP response cache, which is not evicted per session"""
+        path = os.path.join(self.path, HTTP_CACHE_FILE)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    async def _processed_events(self) -> Set[Tuple[int, int]]:
+        from app.services.results_store import results_store
+
+        try:
+            return await results_store.stored_events()
+        except Exception as e:
+            logger.error(f"Error reading stored events: {e}")
+            return set()
+
+    async def usage(self) -> dict:
+        """Disk usage by season and session"""
+        processed = await self._processed_events()
+        sessions = await asyncio.to_thread(self.scan, processed)
+        http_bytes = self.http_cache_bytes()
+        total = http_bytes + sum(s.bytes for s in sessions)
+        FASTF1_CACHE_BYTES.set(total)
+
+        seasons: Dict[int, dict] = {}
+        for s in sessions:
+            season = seasons.setdefault(s.season, {"bytes": 0, "sessions": []})
+            season["bytes"] += s.bytes
+            season["sessions"].append({
+                "event": s.event,
+                "session": s.session,
+                "round": s.round,
+                "bytes": s.bytes,
+                "files": s.files,
+                "last_access": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(s.last_access)),
+                "processed": s.processed,
+            })
+
+        return {
+            "cache_dir": os.path.abspath(self.path),
+            "max_bytes": self.max_bytes or None,
+            "total_bytes": total,
+            "http_cache_bytes": http_bytes,
+            "sessions": len(sessions),
+            "seasons": seasons,
+        }
+
+    def evict(self, sessions: List[SessionUsage], max_bytes: int, extra_bytes: int = 0) -> List[SessionUsage]:
+        """Delete sessions until usage is under the low-water mark; returns those deleted
+
+        The least recently used go first; processed race sessions are kept
+        until nothing else is left to evict. Sessions
+        loaded within `fastf1_cache_min_idle_minutes` are kept, since a load may
+        still be writing to them.
+        """
+        total = extra_bytes + sum(s.bytes for s in sessions)
+        if not max_bytes or total <= max_bytes:
+            return []
+
+        target = max_bytes * LOW_WATER_MARK
+        idle_since = time.time() - settings.fastf1_cache_min_idle_minutes * 60
+        candidates = sorted(
+            (s for s in sessions if s.last_access < idle_since),
+            key=lambda s: (s.processed, s.last_access)
+        )
+
+        evicted = []
+        conn = self._index()
+        try:
+            # A load may have started since the sessions were scanned
+            recent = {
+                path for (path,) in conn.execute("SELECT path FROM sessions WHERE last_access >= ?", (idle_since,))
+            }
+        finally:
+            conn.close()
+        for s in candidates:
+            if total <= target:
+                break
+            if s.path in recent:
+                continue
+            session_path = os.path.join(self.path, s.path)
+            shutil.rmtree(session_path, ignore_errors=True)
+            total -= s.bytes
+            evicted.append(s)
+            FASTF1_CACHE_EVICTIONS.inc()
+
+            # Drop event and season directories left empty
+            for parent in (os.path.dirname(session_path), os.path.dirname(os.path.dirname(session_path))):
+                try:
+                    os.rmdir(parent)
+                except OSError:
+                    break
+
+        if evicted:
+            conn = self._index()
+            try:
+                conn.executemany("DELETE FROM sessions WHERE path = ?", [(s.path,) for s in evicted])
+                conn.commit()
+            finally:
+                conn.close()
+        return evicted
+
+    async def compact(self, max_bytes: Optional[int] = None) -> dict:
+        """Scan the cache and evict sessions beyond the size cap"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        processed = await self._processed_events()
+        sessions = await asyncio.to_thread(self.scan, processed)
+        http_bytes = self.http_cache_bytes()
+        evicted = await asyncio.to_thread(self.evict, sessions, max_bytes, http_bytes)
+
+        freed = sum(s.bytes for s in evicted)
+        total = http_bytes + sum(s.bytes for s in sessions) - freed
+        FASTF1_CACHE_BYTES.set(total)
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} FastF1 cache sessions, freeing {freed / 1e6:.1f} MB")
+        return {
+            "evicted": [s.path for s in evicted],
+            "freed_bytes": freed,
+            "total_bytes": total,
+            "max_bytes": max_bytes or None,
+        }
+
+    async def _loop(self) -> None:
+        """Compact periodically until cancelled"""
+        while True:
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.error(f"Error compacting FastF1 cache: {e}")
+            await asyncio.sleep(settings.fastf1_cache_compact_minutes * 60)
+
+    def start(self) -> None:
+        """Start background compaction on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel background compaction"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global FastF1 cache manager instance
+fastf1_cache = FastF1CacheManager()
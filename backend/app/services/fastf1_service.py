@@ -1,49 +1,216 @@
 """
 FastF1 service for fetching F1 data
+
+FastF1 and pandas are imported on first use so importing the app stays fast.
 """
 
-import fastf1
-from typing import List, Optional
-import pandas as pd
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import functools
 import logging
 import os
+import threading
 from app.models.race import (
     Race, RaceResult, RaceResults, Driver, Constructor, 
     TelemetryPoint, DriverTelemetry, RaceTelemetry,
-    DriverStanding, ConstructorStanding, Standings
+    DriverStanding, ConstructorStanding, Standings,
+    SessionResult, SessionResults, SessionWeather, WeatherSample
+)
+from app.models.analysis import (
+    DriverTelemetrySummary, LapAnalysis, LapComparison, TelemetrySummary, TrackMap, TrackTelemetry
 )
+from app.core import profiling
 from app.core.config import settings
-
-# Configure FastF1 cache - create directory if it doesn't exist
-os.makedirs(settings.fastf1_cache_dir, exist_ok=True)
-fastf1.Cache.enable_cache(settings.fastf1_cache_dir)
+from app.core.memory import estimate_bytes, memory_budget
+from app.core.metrics import FASTF1_STAGE_SECONDS
+from app.services.analysis_service import AnalysisService
+from app.services.disk_cache_service import fastf1_cache
+from app.services.results_store import results_store
+from app.services.track_service import TRACK_CHANNELS, TrackGeometry
 
 logger = logging.getLogger(__name__)
 
+_fastf1 = None
+_fastf1_lock = threading.Lock()
+
+# FastF1 session identifiers and the schedule names they stand for
+SESSION_TYPES = {
+    'FP1': 'Practice 1',
+    'FP2': 'Practice 2',
+    'FP3': 'Practice 3',
+    'Q': 'Qualifying',
+    'SQ': 'Sprint Qualifying',
+    'SS': 'Sprint Shootout',
+    'S': 'Sprint',
+    'R': 'Race',
+}
+_SESSION_IDENTIFIERS = {name: identifier for identifier, name in SESSION_TYPES.items()}
+
+# What each kind of request loads; results come with every load. Leaving out
+# laps, car/position data and weather skips both their download and parsing.
+SESSION_PARTS = {
+    'results': dict(laps=False, telemetry=False, weather=False, messages=False),
+    'laps': dict(laps=True, telemetry=False, weather=False, messages=False),
+    'telemetry': dict(laps=True, telemetry=True, weather=False, messages=False),
+    'weather': dict(laps=False, telemetry=False, weather=True, messages=False),
+}
+
+# Compact dtypes for telemetry channels, applied as sessions are loaded.
+# Integer channels that don't fit (gaps or out of range) fall back to float32.
+TELEMETRY_DTYPES = {
+    'Speed': 'float32',
+    'RPM': 'float32',
+    'Throttle': 'float32',
+    'nGear': 'uint8',
+    'DRS': 'uint8',
+    'Brake': 'bool',
+    'X': 'float32',
+    'Y': 'float32',
+    'Z': 'float32',
+}
+
+
+def get_fastf1():
+    """Import FastF1 and configure its cache on first use"""
+    global _fastf1
+    if _fastf1 is None:
+        with _fastf1_lock:
+            if _fastf1 is None:
+                import fastf1
+                
+                # Configure FastF1 cache - create directory if it doesn't exist
+                os.makedirs(settings.fastf1_cache_dir, exist_ok=True)
+                fastf1.Cache.enable_cache(settings.fastf1_cache_dir)
+                if settings.fastf1_offline:
+                    fastf1.Cache.offline_mode(True)
+                _fastf1 = fastf1
+    return _fastf1
+
+
+def compact_telemetry(frames: Dict) -> None:
+    """Downcast every driver's telemetry channels in place"""
+    for frame in frames.values():
+        for column, dtype in TELEMETRY_DTYPES.items():
+            if column not in frame.columns or frame[column].dtype == dtype:
+                continue
+            values = frame[column]
+            if values.isna().any():
+                if dtype == 'bool':
+                    continue
+                dtype = 'float32'
+            elif dtype == 'uint8' and (values.min() < 0 or values.max() > 255):
+                dtype = 'float32'
+            frame[column] = values.astype(dtype)
+
+
+def session_bytes(session, **parts) -> int:
+    """Estimated bytes of the loaded parts of a session"""
+    frames = [session.results]
+    if parts.get('laps', True):
+        frames.append(session.laps)
+    if parts.get('telemetry', True):
+        frames.extend(session.car_data.values())
+        frames.extend(session.pos_data.values())
+    if parts.get('weather', True):
+        frames.append(session.weather_data)
+    return sum(estimate_bytes(frame) for frame in frames if frame is not None)
+
+
+def load_session(session, season: int, round_number: int, **parts) -> None:
+    """Load a session, timing it and recording the access for the disk cache manager
+    
+    The loaded size, before telemetry is downcast, counts against the current
+    cold load's memory reservation.
+    """
+    # Mark the session in use before loading too, so the disk cache manager
+    # can't evict its directory while the load is still reading it
+    fastf1_cache.record_access(session, season, round_number)
+    with FASTF1_STAGE_SECONDS.labels("session_load").time():
+        session.load(**parts)
+    fastf1_cache.record_access(session, season, round_number)
+    try:
+        memory_budget.measure_load(session_bytes(session, **parts))
+    except Exception as e:
+        logger.warning(f"Could not measure session {season}/{round_number}: {e}")
+    if parts.get('telemetry', True):
+        with FASTF1_STAGE_SECONDS.labels("downcast").time():
+            compact_telemetry(session.car_data)
+            compact_telemetry(session.pos_data)
+
+
+def blocking(load):
+    """Turn a blocking loader into a coroutine that runs it on a worker thread
+    
+    FastF1 loads and frame conversion block, so they run off the event loop;
+    anything the loader's caller awaits afterwards stays on the caller's loop.
+    """
+    @functools.wraps(load)
+    async def run(*args, **kwargs):
+        return await profiling.to_thread(load, *args, **kwargs)
+    
+    return run
+
+
+def session_race(session, season: int, round_number: int) -> Race:
+    """The race weekend a loaded session belongs to"""
+    import pandas as pd
+    
+    return Race(
+        season=season,
+        round=round_number,
+        race_name=session.event['EventName'],
+        circuit_name=session.event['Location'],
+        date=pd.to_datetime(session.event['EventDate']),
+        time=None,
+        url=None,
+        event_format=session.event['EventFormat']
+    )
+
+
+def driver_id(result) -> str:
+    """A classified driver's FastF1 (Ergast) driver id, or their abbreviation when the session has none
+
+    Abbreviations are reused across eras (MSC is both Michael and Mick
+    Schumacher), so they can't identify a driver on their own.
+    """
+    value = result.get('DriverId')
+    return value if isinstance(value, str) and value else result['Abbreviation']
+
 
 class FastF1Service:
     """Service for interacting with FastF1 library"""
     
     @staticmethod
-    async def get_races_for_season(season: int) -> List[Race]:
+    @blocking
+    def get_races_for_season(season: int) -> List[Race]:
         """Get all races for a given season"""
+        import pandas as pd
+        
         try:
-            schedule = fastf1.get_event_schedule(season)
+            schedule = get_fastf1().get_event_schedule(season)
             races = []
             
             for _, event in schedule.iterrows():
-                if event['EventFormat'] == 'conventional':
-                    race = Race(
-                        season=season,
-                        round=event['RoundNumber'],
-                        race_name=event['EventName'],
-                        circuit_name=event['Location'],
-                        date=pd.to_datetime(event['EventDate']),
-                        time=None,
-                        url=None
-                    )
-                    races.append(race)
+                # Pre-season testing has no round; sprint weekends are races like any other
+                if event['EventFormat'] == 'testing' or not event['RoundNumber']:
+                    continue
+                sessions = [
+                    _SESSION_IDENTIFIERS[event[f'Session{index}']]
+                    for index in range(1, 6)
+                    if event.get(f'Session{index}') in _SESSION_IDENTIFIERS
+                ]
+                race = Race(
+                    season=season,
+                    round=event['RoundNumber'],
+                    race_name=event['EventName'],
+                    circuit_name=event['Location'],
+                    date=pd.to_datetime(event['EventDate']),
+                    time=None,
+                    url=None,
+                    event_format=event['EventFormat'],
+                    sessions=sessions
+                )
+                races.append(race)
             
             return races
         except Exception as e:
@@ -53,9 +220,21 @@ class FastF1Service:
     @staticmethod
     async def get_race_results(season: int, round_number: int) -> Optional[RaceResults]:
         """Get race results for a specific race"""
+        race_results = await FastF1Service._load_race_results(season, round_number)
+        if race_results is not None:
+            # Keep the normalized results tables in step with every fresh load.
+            # The store's pooled connections belong to the caller's event loop.
+            await results_store.save_race_results(race_results)
+        return race_results
+    
+    @staticmethod
+    @blocking
+    def _load_race_results(season: int, round_number: int) -> Optional[RaceResults]:
+        import pandas as pd
+        
         try:
-            session = fastf1.get_session(season, round_number, 'R')
-            session.load()
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['results'])
             
             # Get race info
             race = Race(
@@ -72,31 +251,32 @@ class FastF1Service:
             results = session.results
             race_results = []
             
-            for _, result in results.iterrows():
-                driver = Driver(
-                    driver_id=result['Abbreviation'],
-                    first_name=result['FirstName'] if pd.notna(result['FirstName']) else "",
-                    last_name=result['LastName'] if pd.notna(result['LastName']) else "",
-                    code=result['Abbreviation'],
-                    permanent_number=int(result['DriverNumber']) if pd.notna(result['DriverNumber']) else None,
-                    team=result['TeamName'] if pd.notna(result['TeamName']) else None
-                )
+            with FASTF1_STAGE_SECONDS.labels("dataframe_conversion").time():
+                for _, result in results.iterrows():
+                    driver = Driver(
+                        driver_id=driver_id(result),
+                        first_name=result['FirstName'] if pd.notna(result['FirstName']) else "",
+                        last_name=result['LastName'] if pd.notna(result['LastName']) else "",
+                        code=result['Abbreviation'],
+                        permanent_number=int(result['DriverNumber']) if pd.notna(result['DriverNumber']) else None,
+                        team=result['TeamName'] if pd.notna(result['TeamName']) else None
+                    )
                 
-                constructor = Constructor(
-                    constructor_id=result['TeamName'] if pd.notna(result['TeamName']) else "",
-                    name=result['TeamName'] if pd.notna(result['TeamName']) else "",
-                    nationality=""
-                )
+                    constructor = Constructor(
+                        constructor_id=result['TeamName'] if pd.notna(result['TeamName']) else "",
+                        name=result['TeamName'] if pd.notna(result['TeamName']) else "",
+                        nationality=""
+                    )
                 
-                race_result = RaceResult(
-                    position=int(result['Position']) if pd.notna(result['Position']) else 0,
-                    driver=driver,
-                    constructor=constructor,
-                    points=float(result['Points']) if pd.notna(result['Points']) else 0.0,
-                    time=str(result['Time']) if pd.notna(result['Time']) else None,
-                    status=result['Status'] if pd.notna(result['Status']) else "Unknown"
-                )
-                race_results.append(race_result)
+                    race_result = RaceResult(
+                        position=int(result['Position']) if pd.notna(result['Position']) else 0,
+                        driver=driver,
+                        constructor=constructor,
+                        points=float(result['Points']) if pd.notna(result['Points']) else 0.0,
+                        time=str(result['Time']) if pd.notna(result['Time']) else None,
+                        status=result['Status'] if pd.notna(result['Status']) else "Unknown"
+                    )
+                    race_results.append(race_result)
             
             return RaceResults(race=race, results=race_results)
         
@@ -105,11 +285,114 @@ class FastF1Service:
             return None
     
     @staticmethod
-    async def get_race_telemetry(season: int, round_number: int, lap: int = 1) -> Optional[RaceTelemetry]:
-        """Get telemetry data for a specific race and lap"""
+    @blocking
+    def get_session_results(season: int, round_number: int, session_type: str) -> Optional[SessionResults]:
+        """Get the classification of any session, loading results only
+        
+        Practice classifications come without positions, since FastF1 orders
+        those by lap times that this load leaves out.
+        """
+        import pandas as pd
+        
+        def timing(value) -> Optional[str]:
+            return str(value) if pd.notna(value) else None
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, session_type)
+            load_session(session, season, round_number, **SESSION_PARTS['results'])
+            
+            results = []
+            with FASTF1_STAGE_SECONDS.labels("dataframe_conversion").time():
+                for _, result in session.results.iterrows():
+                    team = result['TeamName'] if pd.notna(result['TeamName']) else None
+                    grid = result.get('GridPosition')
+                    results.append(SessionResult(
+                        position=int(result['Position']) if pd.notna(result['Position']) else None,
+                        driver=Driver(
+                            driver_id=driver_id(result),
+                            first_name=result['FirstName'] if pd.notna(result['FirstName']) else "",
+                            last_name=result['LastName'] if pd.notna(result['LastName']) else "",
+                            code=result['Abbreviation'],
+                            permanent_number=int(result['DriverNumber']) if pd.notna(result['DriverNumber']) else None,
+                            team=team
+                        ),
+                        constructor=Constructor(constructor_id=team or "", name=team or "", nationality=""),
+                        grid_position=int(grid) if pd.notna(grid) and grid > 0 else None,
+                        points=float(result['Points']) if pd.notna(result['Points']) else None,
+                        time=timing(result['Time']),
+                        status=result['Status'] if pd.notna(result['Status']) and result['Status'] else None,
+                        q1=timing(result.get('Q1')),
+                        q2=timing(result.get('Q2')),
+                        q3=timing(result.get('Q3'))
+                    ))
+            
+            return SessionResults(
+                race=session_race(session, season, round_number),
+                session_type=session_type,
+                session_name=session.name,
+                results=results
+            )
+        
+        except Exception as e:
+            logger.error(f"Error fetching {session_type} results for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_session_weather(season: int, round_number: int, session_type: str) -> Optional[SessionWeather]:
+        """Get the weather readings of any session, loading weather only"""
+        import pandas as pd
+        
+        def value(number, digits=1):
+            return round(float(number), digits) if pd.notna(number) else None
+        
         try:
-            session = fastf1.get_session(season, round_number, 'R')
-            session.load()
+            session = get_fastf1().get_session(season, round_number, session_type)
+            load_session(session, season, round_number, **SESSION_PARTS['weather'])
+            
+            weather = session.weather_data
+            if weather is None or weather.empty:
+                return None
+            
+            samples = [
+                WeatherSample(
+                    time=round(row.Time.total_seconds(), 1),
+                    air_temp=value(row.AirTemp),
+                    track_temp=value(row.TrackTemp),
+                    humidity=value(row.Humidity),
+                    pressure=value(row.Pressure),
+                    rainfall=bool(row.Rainfall) if pd.notna(row.Rainfall) else None,
+                    wind_speed=value(row.WindSpeed),
+                    wind_direction=int(row.WindDirection) if pd.notna(row.WindDirection) else None
+                )
+                for row in weather.itertuples(index=False)
+            ]
+            
+            return SessionWeather(
+                race=session_race(session, season, round_number),
+                session_type=session_type,
+                session_name=session.name,
+                samples=samples
+            )
+        
+        except Exception as e:
+            logger.error(f"Error fetching {session_type} weather for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_race_telemetry(
+        season: int,
+        round_number: int,
+        lap: int = 1,
+        session_type: str = 'R'
+    ) -> Optional[RaceTelemetry]:
+        """Get telemetry data for a specific session (the race by default) and lap"""
+        import pandas as pd
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, session_type)
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
             
             # Get race info
             race = Race(
@@ -127,11 +410,13 @@ class FastF1Service:
             
             for driver_code in session.drivers:
                 try:
-                    driver_data = session.laps.pick_driver(driver_code).pick_fastest()
-                    if driver_data.empty:
+                    driver_data = session.laps.pick_drivers(driver_code).pick_fastest()
+                    if driver_data is None or driver_data.empty:
                         continue
                     
-                    telemetry = driver_data.get_car_data()
+                    with FASTF1_STAGE_SECONDS.labels("car_data").time():
+                        # Car data carries no distance channel until it is integrated
+                        telemetry = driver_data.get_car_data().add_distance()
                     
                     # Create driver object
                     driver_info = session.get_driver(driver_code)
@@ -146,23 +431,24 @@ class FastF1Service:
                     
                     # Process telemetry data (sample every 10th point to reduce data size)
                     telemetry_points = []
-                    for i in range(0, len(telemetry), 10):
-                        row = telemetry.iloc[i]
-                        point = TelemetryPoint(
-                            distance=float(row['Distance']) if pd.notna(row['Distance']) else 0.0,
-                            speed=float(row['Speed']) if pd.notna(row['Speed']) else None,
-                            throttle=float(row['Throttle']) if pd.notna(row['Throttle']) else None,
-                            brake=bool(row['Brake']) if pd.notna(row['Brake']) else None,
-                            gear=int(row['nGear']) if pd.notna(row['nGear']) else None,
-                            rpm=float(row['RPM']) if pd.notna(row['RPM']) else None,
-                            drs=bool(row['DRS']) if pd.notna(row['DRS']) else None
-                        )
-                        telemetry_points.append(point)
+                    with FASTF1_STAGE_SECONDS.labels("telemetry_sampling").time():
+                        for i in range(0, len(telemetry), 10):
+                            row = telemetry.iloc[i]
+                            point = TelemetryPoint(
+                                distance=float(row['Distance']) if pd.notna(row['Distance']) else 0.0,
+                                speed=float(row['Speed']) if pd.notna(row['Speed']) else None,
+                                throttle=float(row['Throttle']) if pd.notna(row['Throttle']) else None,
+                                brake=bool(row['Brake']) if pd.notna(row['Brake']) else None,
+                                gear=int(row['nGear']) if pd.notna(row['nGear']) else None,
+                                rpm=float(row['RPM']) if pd.notna(row['RPM']) else None,
+                                drs=bool(row['DRS']) if pd.notna(row['DRS']) else None
+                            )
+                            telemetry_points.append(point)
                     
                     driver_telemetry = DriverTelemetry(
                         driver=driver,
                         lap_number=lap,
-                        lap_time=str(driver_data['LapTime'].iloc[0]) if not driver_data.empty else None,
+                        lap_time=str(driver_data['LapTime']) if pd.notna(driver_data['LapTime']) else None,
                         telemetry=telemetry_points
                     )
                     drivers_telemetry.append(driver_telemetry)
@@ -171,12 +457,372 @@ class FastF1Service:
                     logger.warning(f"Could not get telemetry for driver {driver_code}: {e}")
                     continue
             
-            return RaceTelemetry(race=race, drivers_telemetry=drivers_telemetry)
+            return RaceTelemetry(race=race, session_type=session_type, drivers_telemetry=drivers_telemetry)
         
         except Exception as e:
             logger.error(f"Error fetching telemetry for {season}/{round_number}: {e}")
             return None
     
+    @staticmethod
+    @blocking
+    def get_lap_comparison(
+        season: int,
+        round_number: int,
+        drivers: List[str],
+        laps: Optional[List[int]] = None,
+        grid_step: float = 10.0,
+        mini_sectors: int = 25
+    ) -> Optional[LapComparison]:
+        """Compare drivers' laps by delta time on a common distance grid
+        
+        `laps` gives one lap number per driver (or one for all); fastest laps are used otherwise.
+        """
+        import pandas as pd
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
+            
+            race = Race(
+                season=season,
+                round=round_number,
+                race_name=session.event['EventName'],
+                circuit_name=session.event['Location'],
+                date=pd.to_datetime(session.event['EventDate']),
+                time=None,
+                url=None
+            )
+            
+            if laps and len(laps) == 1:
+                laps = laps * len(drivers)
+            
+            selected = []
+            with FASTF1_STAGE_SECONDS.labels("car_data").time():
+                for index, code in enumerate(drivers):
+                    driver_laps = session.laps.pick_drivers(code)
+                    if laps:
+                        lap = driver_laps.pick_laps(laps[index])
+                        lap = lap.iloc[0] if not lap.empty else None
+                    else:
+                        lap = driver_laps.pick_fastest()
+                    if lap is None or lap.empty:
+                        logger.warning(f"No lap to compare for driver {code} in {season}/{round_number}")
+                        return None
+                    
+                    telemetry = lap.get_car_data().add_distance()
+                    selected.append((lap, telemetry))
+            
+            with FASTF1_STAGE_SECONDS.labels("delta_analysis").time():
+                distance, driver_deltas, sectors = AnalysisService.compare(
+                    drivers,
+                    distances=[t['Distance'].to_numpy() for _, t in selected],
+                    times=[t['Time'].dt.total_seconds().to_numpy() for _, t in selected],
+                    speeds=[t['Speed'].to_numpy() for _, t in selected],
+                    grid_step=grid_step,
+                    n_sectors=mini_sectors
+                )
+            
+            for driver_delta, (lap, _) in zip(driver_deltas, selected):
+                driver_delta.lap_number = int(lap['LapNumber']) if pd.notna(lap['LapNumber']) else None
+                driver_delta.lap_time = str(lap['LapTime']) if pd.notna(lap['LapTime']) else None
+            
+            return LapComparison(
+                race=race,
+                reference=drivers[0],
+                distance=distance,
+                drivers=driver_deltas,
+                mini_sectors=sectors
+            )
+        
+        except Exception as e:
+            logger.error(f"Error comparing laps for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_lap_analysis(season: int, round_number: int, session_type: str = 'R') -> Optional[LapAnalysis]:
+        """Get lap times, positions, stints and pit stops for every driver in one pass"""
+        import pandas as pd
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, session_type)
+            load_session(session, season, round_number, **SESSION_PARTS['laps'])
+            
+            race = Race(
+                season=season,
+                round=round_number,
+                race_name=session.event['EventName'],
+                circuit_name=session.event['Location'],
+                date=pd.to_datetime(session.event['EventDate']),
+                time=None,
+                url=None
+            )
+            
+            if session.laps.empty:
+                return None
+            
+            with FASTF1_STAGE_SECONDS.labels("lap_analysis").time():
+                summary = AnalysisService.summarize_laps(session.laps)
+            
+            return LapAnalysis(race=race, session_type=session_type, **summary)
+        
+        except Exception as e:
+            logger.error(f"Error analysing laps for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_telemetry_summary(season: int, round_number: int) -> Optional[TelemetrySummary]:
+        """Get top speed, speed traps, throttle, braking and DRS statistics for every driver"""
+        import pandas as pd
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
+            
+            race = Race(
+                season=season,
+                round=round_number,
+                race_name=session.event['EventName'],
+                circuit_name=session.event['Location'],
+                date=pd.to_datetime(session.event['EventDate']),
+                time=None,
+                url=None
+            )
+            
+            # Drivers in finishing order, skipping any without car data
+            results = session.results.sort_values('Position', na_position='last')
+            entries = [
+                (row.DriverNumber, row.Abbreviation, row.TeamName if pd.notna(row.TeamName) else None)
+                for row in results.itertuples(index=False)
+                if row.DriverNumber in session.car_data and not session.car_data[row.DriverNumber].empty
+            ]
+            if not entries:
+                return None
+            
+            with FASTF1_STAGE_SECONDS.labels("telemetry_summary").time():
+                car_data = [session.car_data[number] for number, _, _ in entries]
+                stats = AnalysisService.summarize_car_data(
+                    times=[car['SessionTime'].dt.total_seconds().to_numpy() for car in car_data],
+                    speeds=[car['Speed'].to_numpy() for car in car_data],
+                    throttles=[car['Throttle'].to_numpy() for car in car_data],
+                    brakes=[car['Brake'].to_numpy() for car in car_data],
+                    drs=[car['DRS'].to_numpy() for car in car_data]
+                )
+                
+                # Speed traps and lap counts come from the lap table
+                laps = session.laps
+                traps = laps.groupby('Driver').agg(
+                    laps=('LapNumber', 'max'),
+                    speed_trap=('SpeedST', 'max'),
+                    speed_i1=('SpeedI1', 'max'),
+                    speed_i2=('SpeedI2', 'max'),
+                    speed_finish_line=('SpeedFL', 'max'),
+                ).reindex([code for _, code, _ in entries])
+            
+            def value(number, digits=1):
+                return round(float(number), digits) if pd.notna(number) else None
+            
+            drivers = []
+            for i, (_, code, team) in enumerate(entries):
+                trap = traps.iloc[i]
+                n_laps = int(trap['laps']) if pd.notna(trap['laps']) else 0
+                braking_zones = int(stats['braking_zones'][i])
+                drivers.append(DriverTelemetrySummary(
+                    driver=code,
+                    team=team,
+                    laps=n_laps,
+                    top_speed=value(stats['top_speed'][i]),
+                    average_speed=value(stats['average_speed'][i]),
+                    speed_trap=value(trap['speed_trap']),
+                    speed_i1=value(trap['speed_i1']),
+                    speed_i2=value(trap['speed_i2']),
+                    speed_finish_line=value(trap['speed_finish_line']),
+                    full_throttle_pct=value(stats['full_throttle_pct'][i]),
+                    braking_pct=value(stats['braking_pct'][i]),
+                    braking_zones=braking_zones,
+                    braking_zones_per_lap=round(braking_zones / n_laps, 1) if n_laps else None,
+                    drs_open_pct=value(stats['drs_open_pct'][i]),
+                    drs_activations=int(stats['drs_activations'][i])
+                ))
+            
+            return TelemetrySummary(race=race, drivers=drivers)
+        
+        except Exception as e:
+            logger.error(f"Error summarizing telemetry for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_track_map(
+        season: int,
+        round_number: int,
+        layout: str,
+        target_points: int = 200
+    ) -> Optional[TrackMap]:
+        """Get the circuit outline from the fastest lap's position data, simplified"""
+        import numpy as np
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
+            
+            fastest = session.laps.pick_fastest()
+            if fastest is None or fastest.empty:
+                return None
+            
+            with FASTF1_STAGE_SECONDS.labels("track_geometry").time():
+                pos = fastest.get_pos_data()[['X', 'Y']].dropna()
+                x = pos['X'].to_numpy(dtype=np.float64)
+                y = pos['Y'].to_numpy(dtype=np.float64)
+                if x.size < 3:
+                    return None
+                
+                indices, tolerance = TrackGeometry.simplify(x, y, target_points=target_points)
+                fraction = TrackGeometry.path_fraction(x, y)[indices]
+            
+            return TrackMap(
+                circuit_name=session.event['Location'],
+                layout=layout,
+                x=np.round(x[indices], 1).tolist(),
+                y=np.round(y[indices], 1).tolist(),
+                distance=np.round(fraction, 5).tolist(),
+                tolerance=round(tolerance, 2),
+                original_points=int(x.size),
+                source_season=season,
+                source_round=round_number,
+                source_driver=str(fastest['Driver']),
+                source_lap=int(fastest['LapNumber'])
+            )
+        
+        except Exception as e:
+            logger.error(f"Error building track map for {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_track_telemetry(
+        season: int,
+        round_number: int,
+        track: TrackMap,
+        driver: str,
+        lap: Optional[int] = None,
+        channels: Optional[List[str]] = None
+    ) -> Optional[TrackTelemetry]:
+        """Sample a driver's lap (fastest by default) at every point of a track map"""
+        import numpy as np
+        import pandas as pd
+        
+        channels = channels or ['speed', 'gear']
+        try:
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
+            
+            race = Race(
+                season=season,
+                round=round_number,
+                race_name=session.event['EventName'],
+                circuit_name=session.event['Location'],
+                date=pd.to_datetime(session.event['EventDate']),
+                time=None,
+                url=None
+            )
+            
+            driver_laps = session.laps.pick_drivers(driver)
+            if lap is None:
+                driver_lap = driver_laps.pick_fastest()
+            else:
+                picked = driver_laps.pick_laps(lap)
+                driver_lap = picked.iloc[0] if not picked.empty else None
+            if driver_lap is None or driver_lap.empty:
+                return None
+            
+            with FASTF1_STAGE_SECONDS.labels("car_data").time():
+                car = driver_lap.get_car_data().add_distance()
+            
+            with FASTF1_STAGE_SECONDS.labels("track_geometry").time():
+                distance = car['Distance'].to_numpy(dtype=np.float64)
+                fraction = distance / distance[-1] if distance[-1] > 0 else distance
+                sampled = {}
+                for channel in channels:
+                    column, discrete = TRACK_CHANNELS[channel]
+                    values = TrackGeometry.sample_channel(
+                        fraction, car[column].to_numpy(dtype=np.float64), track.distance, discrete
+                    )
+                    sampled[channel] = np.round(values, 1).tolist()
+            
+            return TrackTelemetry(
+                race=race,
+                layout=track.layout,
+                driver=driver,
+                lap_number=int(driver_lap['LapNumber']),
+                lap_time=str(driver_lap['LapTime']) if pd.notna(driver_lap['LapTime']) else None,
+                channels=sampled
+            )
+        
+        except Exception as e:
+            logger.error(f"Error mapping telemetry for {driver} in {season}/{round_number}: {e}")
+            return None
+    
+    @staticmethod
+    @blocking
+    def get_session_car_data(season: int, round_number: int) -> Optional[Tuple[Race, Dict]]:
+        """Get the whole race's car data per driver code, with X/Y positions interpolated in
+        
+        Returns the race and a dict of driver code -> DataFrame with a `time` column in
+        seconds of session time plus speed, rpm, gear, throttle, brake, drs, x and y.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        try:
+            session = get_fastf1().get_session(season, round_number, 'R')
+            load_session(session, season, round_number, **SESSION_PARTS['telemetry'])
+            
+            race = Race(
+                season=season,
+                round=round_number,
+                race_name=session.event['EventName'],
+                circuit_name=session.event['Location'],
+                date=pd.to_datetime(session.event['EventDate']),
+                time=None,
+                url=None
+            )
+            
+            drivers = {}
+            with FASTF1_STAGE_SECONDS.labels("car_data").time():
+                for number in session.drivers:
+                    car = session.car_data.get(number)
+                    if car is None or car.empty:
+                        continue
+                    code = session.get_driver(number)['Abbreviation']
+                    time = car['SessionTime'].dt.total_seconds().to_numpy()
+                    frame = pd.DataFrame({
+                        'time': time,
+                        'speed': car['Speed'].to_numpy(),
+                        'rpm': car['RPM'].to_numpy(),
+                        'gear': car['nGear'].to_numpy(),
+                        'throttle': car['Throttle'].to_numpy(),
+                        'brake': car['Brake'].to_numpy(),
+                        'drs': car['DRS'].to_numpy(),
+                    })
+                    
+                    # Position data is sampled on its own clock
+                    pos = session.pos_data.get(number)
+                    if pos is not None and not pos.empty:
+                        pos_time = pos['SessionTime'].dt.total_seconds().to_numpy()
+                        frame['x'] = np.interp(time, pos_time, pos['X'].to_numpy()).astype(np.float32)
+                        frame['y'] = np.interp(time, pos_time, pos['Y'].to_numpy()).astype(np.float32)
+                    drivers[code] = frame
+            
+            if not drivers:
+                return None
+            return race, drivers
+        
+        except Exception as e:
+            logger.error(f"Error fetching car data for {season}/{round_number}: {e}")
+            return None
+    
     @staticmethod
     async def get_standings(season: int, round_number: Optional[int] = None) -> Optional[Standings]:
         """Get championship standings"""
@@ -187,7 +833,7 @@ class FastF1Service:
                 DriverStanding(
                     position=1,
                     driver=Driver(
-                        driver_id="VER",
+                        driver_id="max_verstappen",
                         first_name="Max",
                         last_name="Verstappen",
                         code="VER",
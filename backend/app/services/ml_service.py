@@ -1,24 +1,35 @@
 """
 ML service for F1 predictions
+
+numpy, scikit-learn and joblib are imported when the model is first loaded so
+importing the app stays fast.
 """
 
-import pickle
-import numpy as np
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Optional
+import hashlib
+import io
+import json
 import logging
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-import joblib
 import os
+import threading
 
 from app.models.predict import PredictRequest, PredictResponse, DriverPrediction
 from app.models.race import Driver, Constructor
 from app.core.config import settings
+from app.core import profiling
+from app.services.simulation_service import RaceSimulator, SimulationResult
 
 logger = logging.getLogger(__name__)
 
+QUALIFYING_MODEL_VERSION = "1.0.0"
+RACE_MODEL_VERSION = "1.1.0"
+DEFAULT_TRACK_TEMPERATURE = 25.0
+DEFAULT_AIR_TEMPERATURE = 20.0
+# Races whose static feature columns are kept in memory
+STATIC_FEATURE_CACHE_SIZE = 64
+
 
 class MLService:
     """Service for machine learning predictions"""
@@ -28,20 +39,46 @@ class MLService:
         self.label_encoders = {}
         self.model_path = os.path.join(settings.model_path, "f1_prediction_model.joblib")
         self.encoders_path = os.path.join(settings.model_path, "label_encoders.joblib")
-        
-        # Create model directory if it doesn't exist
-        os.makedirs(settings.model_path, exist_ok=True)
-        
-        # Load or create model
-        self._load_or_create_model()
+        self.loaded = False
+        # Digest of the artifacts in use; part of every prediction's cache key
+        self.artifact_version: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._static_feature_cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._features_lock = threading.Lock()
+    
+    def load(self):
+        """Load or create the model once; called at startup or on first prediction"""
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                # Create model directory if it doesn't exist
+                os.makedirs(settings.model_path, exist_ok=True)
+                
+                # Load or create model
+                self._load_or_create_model()
+                self.loaded = True
+    
+    def reload(self):
+        """Reload the model artifacts from disk, e.g. after another worker retrained them"""
+        with self._load_lock:
+            self._load_or_create_model()
+            self.loaded = True
+        with self._features_lock:
+            self._static_feature_cache.clear()
     
     def _load_or_create_model(self):
         """Load existing model or create a dummy one"""
+        import joblib
+        
         try:
             if os.path.exists(self.model_path) and os.path.exists(self.encoders_path):
-                self.model = joblib.load(self.model_path)
-                self.label_encoders = joblib.load(self.encoders_path)
-                logger.info("Loaded existing ML model")
+                # Hash the exact bytes loaded, even if another worker replaces the files meanwhile
+                artifacts = [self._read(self.model_path), self._read(self.encoders_path)]
+                self.model = joblib.load(io.BytesIO(artifacts[0]))
+                self.label_encoders = joblib.load(io.BytesIO(artifacts[1]))
+                self.artifact_version = self._digest(artifacts)
+                logger.info(f"Loaded existing ML model {self.artifact_version}")
             else:
                 self._create_dummy_model()
                 logger.info("Created dummy ML model")
@@ -49,8 +86,26 @@ class MLService:
             logger.error(f"Error loading model: {e}")
             self._create_dummy_model()
     
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    
+    @staticmethod
+    def _digest(artifacts: List[bytes]) -> str:
+        """Short SHA-256 over the model and encoder files"""
+        digest = hashlib.sha256()
+        for artifact in artifacts:
+            digest.update(hashlib.sha256(artifact).digest())
+        return digest.hexdigest()[:16]
+    
     def _create_dummy_model(self):
         """Create a dummy model for demonstration purposes"""
+        import joblib
+        import numpy as np
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import LabelEncoder
+        
         try:
             # Create dummy training data
             np.random.seed(42)
@@ -85,15 +140,20 @@ class MLService:
             # Save model and encoders
             joblib.dump(self.model, self.model_path)
             joblib.dump(self.label_encoders, self.encoders_path)
+            self.artifact_version = self._digest([self._read(self.model_path), self._read(self.encoders_path)])
             
         except Exception as e:
             logger.error(f"Error creating dummy model: {e}")
             # Fallback: simple random model
             self.model = None
             self.label_encoders = {}
+            self.artifact_version = "none"
     
     async def predict_qualifying(self, request: PredictRequest) -> PredictResponse:
         """Predict qualifying results"""
+        import numpy as np
+        
+        self.load()
         try:
             # Mock drivers for demonstration
             mock_drivers = [
@@ -112,13 +172,11 @@ class MLService:
             predictions = []
             
             if self.model is not None:
-                # Use the actual model for predictions
-                for i, driver in enumerate(mock_drivers):
-                    # Create feature vector
-                    features = self._create_feature_vector(driver, request)
-                    
-                    # Predict position
-                    predicted_pos = self.model.predict([features])[0]
+                # Use the actual model for predictions, one batch for the whole field
+                features = self._feature_matrix(request, mock_drivers)
+                predicted_positions = self.model.predict(features)
+                
+                for driver, predicted_pos in zip(mock_drivers, predicted_positions):
                     confidence = np.random.uniform(0.6, 0.95)  # Random confidence for demo
                     
                     prediction = DriverPrediction(
@@ -152,7 +210,7 @@ class MLService:
                 predictions=predictions,
                 model_info={
                     "model_type": "Random Forest" if self.model else "Random",
-                    "version": "1.0.0",
+                    "version": QUALIFYING_MODEL_VERSION,
                     "features": ["driver", "constructor", "track_temp", "air_temp", "weather"]
                 },
                 generated_at=datetime.now().isoformat()
@@ -170,50 +228,235 @@ class MLService:
                 generated_at=datetime.now().isoformat()
             )
     
-    def _create_feature_vector(self, driver: Driver, request: PredictRequest) -> List[float]:
-        """Create feature vector for prediction"""
-        features = []
+    async def predict_race(self, request: PredictRequest) -> PredictResponse:
+        """Predict race finishing-position distributions by Monte Carlo simulation
+        
+        The qualifying prediction sets the grid and the underlying race pace;
+        the simulation adds lap-time noise, tyre degradation, pit-stop loss
+        and retirements on top. Seeded requests always run every requested
+        simulation, so the same seed gives the same answer (and cache entry).
+        """
+        qualifying = await self.predict_qualifying(request)
+        if not qualifying.predictions:
+            return qualifying
         
         try:
-            # Driver encoding
-            if 'driver' in self.label_encoders:
-                try:
-                    driver_encoded = self.label_encoders['driver'].transform([driver.code])[0]
-                except ValueError:
-                    driver_encoded = 0  # Unknown driver
-            else:
-                driver_encoded = 0
-            features.append(float(driver_encoded))
-            
-            # Constructor encoding
-            if 'constructor' in self.label_encoders:
-                try:
-                    constructor_encoded = self.label_encoders['constructor'].transform([driver.team or "Unknown"])[0]
-                except ValueError:
-                    constructor_encoded = 0  # Unknown constructor
-            else:
-                constructor_encoded = 0
-            features.append(float(constructor_encoded))
+            grid = [prediction.driver for prediction in qualifying.predictions]
+            simulator = self._build_race_simulator(request, grid)
+            runs = min(request.simulation_runs or settings.simulation_runs, settings.simulation_max_runs)
             
-            # Track temperature
-            features.append(float(request.track_temperature or 25.0))
+            # CPU-bound; keep it off the event loop
+            result: SimulationResult = await profiling.to_thread(
+                simulator.run,
+                runs,
+                seed=request.seed,
+                latency_budget_ms=None if request.seed is not None else settings.simulation_latency_budget_ms,
+                batch_size=settings.simulation_batch_runs
+            )
             
-            # Air temperature
-            features.append(float(request.air_temperature or 20.0))
+            probabilities = result.position_probabilities
+            order = result.expected_positions.argsort(kind="stable")
             
-            # Weather encoding
-            if 'weather' in self.label_encoders:
-                try:
-                    weather_encoded = self.label_encoders['weather'].transform([request.weather_condition or "Dry"])[0]
-                except ValueError:
-                    weather_encoded = 0  # Unknown weather
-            else:
-                weather_encoded = 0
-            features.append(float(weather_encoded))
+            predictions = []
+            for position, index in enumerate(order, start=1):
+                row = probabilities[index]
+                predictions.append(DriverPrediction(
+                    driver=grid[index],
+                    predicted_position=position,
+                    confidence=round(float(row[position - 1]), 4),
+                    reasoning=f"Simulated from P{index + 1} on the grid over {result.runs} races",
+                    position_probabilities=[round(float(p), 4) for p in row],
+                    expected_position=round(float(result.expected_positions[index]), 2),
+                    win_probability=round(float(row[0]), 4),
+                    podium_probability=round(float(row[:3].sum()), 4),
+                    dnf_probability=round(float(result.dnf_probabilities[index]), 4)
+                ))
+            
+            return PredictResponse(
+                session_type=request.session_type,
+                race_name=qualifying.race_name,
+                circuit_name=qualifying.circuit_name,
+                predictions=predictions,
+                model_info={
+                    "model_type": "Monte Carlo simulation",
+                    "version": RACE_MODEL_VERSION,
+                    "grid_model": qualifying.model_info.get("model_type"),
+                    "runs": result.runs,
+                    "requested_runs": runs,
+                    "seed": result.seed,
+                    "laps": simulator.n_laps,
+                    "elapsed_ms": round(result.elapsed_seconds * 1000, 1),
+                    "runs_per_second": round(result.runs_per_second)
+                },
+                generated_at=datetime.now().isoformat()
+            )
             
         except Exception as e:
-            logger.error(f"Error creating feature vector: {e}")
-            # Return default features
-            features = [0.0, 0.0, 25.0, 20.0, 0.0]
+            logger.error(f"Error simulating race: {e}")
+            return PredictResponse(
+                session_type=request.session_type,
+                race_name="Unknown",
+                circuit_name="Unknown",
+                predictions=[],
+                model_info={"error": str(e)},
+                generated_at=datetime.now().isoformat()
+            )
+    
+    def _build_race_simulator(self, request: PredictRequest, grid: List[Driver]) -> RaceSimulator:
+        """Per-driver race parameters from driver and constructor features, grid order and conditions
+        
+        The model's finishing-position distribution for each driver sets their
+        race pace (half their own, half their constructor's average) and how
+        much it varies from lap to lap: drivers the model is less sure about
+        get noisier laps.
+        """
+        import numpy as np
+        
+        n_drivers = len(grid)
+        grid_slot = np.arange(n_drivers)
+        weather = (request.weather_condition or "Dry").lower()
+        wet = weather in ("wet", "intermediate")
+        
+        expected, spread = self._position_distribution(request, grid)
+        teams = [driver.team or "Unknown" for driver in grid]
+        team_expected = np.array([
+            expected[[i for i, other in enumerate(teams) if other == team]].mean() for team in teams
+        ])
+        relative_spread = spread / spread.mean() if spread.mean() > 0 else np.ones(n_drivers)
+        
+        return RaceSimulator(
+            pace=90.0 + 0.06 * (0.5 * expected + 0.5 * team_expected),
+            pace_sd=(0.8 if wet else 0.35) * relative_spread,
+            degradation=np.full(n_drivers, 0.02 if wet else 0.035),
+            pit_loss=np.full(n_drivers, 22.0),
+            pit_loss_sd=np.full(n_drivers, 1.5),
+            dnf_probability=np.full(n_drivers, 0.08 if wet else 0.04),
+            grid_gap=0.3 * grid_slot  # starting further back costs time on lap one
+        )
+    
+    def _position_distribution(self, request: PredictRequest, drivers: List[Driver]):
+        """Mean and standard deviation of each driver's predicted finishing position
+        
+        Falls back to the drivers' order with equal spread when the model
+        can't give a distribution.
+        """
+        import numpy as np
+        
+        fallback = np.arange(1, len(drivers) + 1, dtype=np.float64), np.ones(len(drivers))
+        if self.model is None or not hasattr(self.model, "predict_proba"):
+            return fallback
+        try:
+            probabilities = self.model.predict_proba(self._feature_matrix(request, drivers))
+        except Exception as e:
+            logger.warning(f"Falling back to grid order for race pace: {e}")
+            return fallback
+        positions = np.asarray(self.model.classes_, dtype=np.float64)
+        expected = probabilities @ positions
+        spread = np.sqrt(np.maximum(probabilities @ positions ** 2 - expected ** 2, 0.0))
+        return expected, spread
+    
+    def model_version(self, session_type: str) -> str:
+        """Version string for the code and artifacts answering a session type
         
-        return features
+        Race predictions start from the qualifying model's grid, so they depend
+        on both. The artifact digest changes whenever any worker retrains or
+        imports the model, so stale predictions are never served under the new key.
+        """
+        self.load()
+        if session_type == "race":
+            return f"{RACE_MODEL_VERSION}+{QUALIFYING_MODEL_VERSION}+{self.artifact_version}"
+        return f"{QUALIFYING_MODEL_VERSION}+{self.artifact_version}"
+    
+    def canonicalize(self, request: PredictRequest) -> PredictRequest:
+        """Fill defaults, normalize names and quantize temperatures
+        
+        Requests that canonicalize to the same value get the same prediction,
+        so they can share a cache entry.
+        """
+        step = settings.prediction_temperature_step
+        
+        def quantize(value: Optional[float], default: float) -> float:
+            value = default if value is None else value
+            return round(round(value / step) * step, 3) if step > 0 else value
+        
+        session_type = request.session_type.lower()
+        is_race = session_type == "race"
+        weather = (request.weather_condition or "Dry").strip().capitalize()
+        return PredictRequest(
+            season=request.season,
+            round=request.round,
+            session_type=session_type,
+            weather_condition=weather,
+            track_temperature=quantize(request.track_temperature, DEFAULT_TRACK_TEMPERATURE),
+            air_temperature=quantize(request.air_temperature, DEFAULT_AIR_TEMPERATURE),
+            simulation_runs=(
+                min(request.simulation_runs or settings.simulation_runs, settings.simulation_max_runs)
+                if is_race else None
+            ),
+            seed=request.seed if is_race else None
+        )
+    
+    def cacheable(self, request: PredictRequest) -> bool:
+        """Whether a canonical request's prediction can be reused
+        
+        Unseeded race simulations draw a fresh seed each time, so they aren't.
+        """
+        return request.session_type != "race" or request.seed is not None
+    
+    def fingerprint(self, request: PredictRequest) -> str:
+        """Stable cache key covering every input of a canonical request and the model version"""
+        payload = request.dict()
+        payload["model_version"] = self.model_version(request.session_type)
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+        return f"predict_{request.season}_{request.round}_{request.session_type}_{digest}"
+    
+    def _static_features(self, request: PredictRequest, drivers: List[Driver]):
+        """Driver and constructor encodings for a race, memoized per race and field"""
+        import numpy as np
+        
+        key = (request.season, request.round, tuple(driver.code for driver in drivers))
+        with self._features_lock:
+            cached = self._static_feature_cache.get(key)
+            if cached is not None:
+                self._static_feature_cache.move_to_end(key)
+                return cached
+        
+        matrix = np.array(
+            [
+                [self._encode('driver', driver.code), self._encode('constructor', driver.team or "Unknown")]
+                for driver in drivers
+            ],
+            dtype=np.float64
+        )
+        matrix.setflags(write=False)
+        
+        with self._features_lock:
+            self._static_feature_cache[key] = matrix
+            while len(self._static_feature_cache) > STATIC_FEATURE_CACHE_SIZE:
+                self._static_feature_cache.popitem(last=False)
+        return matrix
+    
+    def _feature_matrix(self, request: PredictRequest, drivers: List[Driver]):
+        """Feature matrix for the field: memoized static columns plus the weather columns
+        
+        Columns: driver_encoded, constructor_encoded, track_temp, air_temp, weather_encoded
+        """
+        import numpy as np
+        
+        static = self._static_features(request, drivers)
+        conditions = np.array([
+            float(DEFAULT_TRACK_TEMPERATURE if request.track_temperature is None else request.track_temperature),
+            float(DEFAULT_AIR_TEMPERATURE if request.air_temperature is None else request.air_temperature),
+            self._encode('weather', request.weather_condition or "Dry"),
+        ])
+        return np.hstack((static, np.broadcast_to(conditions, (len(drivers), conditions.size))))
+    
+    def _encode(self, name: str, value: str) -> float:
+        """Label-encode a value; unknown values and missing encoders map to 0"""
+        encoder = self.label_encoders.get(name)
+        if encoder is None:
+            return 0.0
+        try:
+            return float(encoder.transform([value])[0])
+        except ValueError:
+            return 0.0
@@ -0,0 +1,279 @@
+"""
+Telemetry replay service
+
+A session's car data is merged once into a single time-ordered set of
+arrays (`ReplaySource`) and shared by every viewer of that session. Each
+viewer paces its own frames at its chosen playback speed into a small
+bounded buffer; when a client reads too slowly the oldest queued frames are
+dropped so it stays close to the live playback position.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.models.race import Race
+from app.core.config import settings
+from app.core.memory import memory_budget
+from app.core.metrics import FASTF1_STAGE_SECONDS, REPLAY_FRAMES
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("speed", "rpm", "gear", "throttle", "brake", "drs", "x", "y")
+# Decimal places sent per channel
+_PRECISION = {"speed": 1, "rpm": 0, "gear": 0, "throttle": 1, "brake": 0, "drs": 0, "x": 1, "y": 1}
+
+
+class ReplaySource:
+    """All drivers' car data merged into time-ordered arrays and cut into frames"""
+
+    def __init__(self, race: Race, drivers: Dict, frame_seconds: float):
+        import numpy as np
+
+        self.race = race
+        self.codes: List[str] = list(drivers)
+        self.frame_seconds = frame_seconds
+
+        times = [frame["time"].to_numpy(dtype=np.float64) for frame in drivers.values()]
+        origin = min(t[0] for t in times)
+        time = np.concatenate(times) - origin
+        driver = np.concatenate([np.full(t.size, i, dtype=np.int16) for i, t in enumerate(times)])
+        order = np.argsort(time, kind="stable")
+
+        self.time = time[order]
+        self.driver = driver[order]
+        self.channels = {}
+        for channel in CHANNELS:
+            if all(channel in frame.columns for frame in drivers.values()):
+                values = np.concatenate([frame[channel].to_numpy(dtype=np.float32) for frame in drivers.values()])
+                self.channels[channel] = values[order]
+
+        self.duration = float(self.time[-1]) if self.time.size else 0.0
+        n_frames = int(self.duration // frame_seconds) + 1
+        edges = np.arange(n_frames + 1) * frame_seconds
+        self.offsets = np.searchsorted(self.time, edges, side="left")
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.time, self.driver, self.offsets, *self.channels.values()]
+        return sum(array.nbytes for array in arrays)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.offsets) - 1
+
+    def frame_range(self, start: float, duration: Optional[float]) -> Tuple[int, int]:
+        """Frame indices covering [start, start + duration) seconds of replay time"""
+        first = min(int(start // self.frame_seconds), self.n_frames)
+        if duration is None:
+            return first, self.n_frames
+        last = int(-(-(start + duration) // self.frame_seconds))
+        return first, max(first, min(last, self.n_frames))
+
+    def driver_indices(self, codes: Sequence[str]) -> List[int]:
+        """Indices for driver codes; raises ValueError for unknown codes"""
+        unknown = [code for code in codes if code not in self.codes]
+        if unknown:
+            raise ValueError(f"No car data for drivers: {', '.join(unknown)}")
+        return [self.codes.index(code) for code in codes]
+
+    def frame(self, index: int, drivers: Sequence[int]) -> dict:
+        """Encode one frame column-wise per driver"""
+        import numpy as np
+
+        lo, hi = self.offsets[index], self.offsets[index + 1]
+        driver = self.driver[lo:hi]
+        time = self.time[lo:hi]
+
+        samples = {}
+        for i in drivers:
+            mask = driver == i
+            if not mask.any():
+                continue
+            columns = {"t": np.round(time[mask], 3).tolist()}
+            for channel, values in self.channels.items():
+                columns[channel] = np.round(values[lo:hi][mask], _PRECISION[channel]).tolist()
+            samples[self.codes[i]] = columns
+
+        return {"type": "frame", "index": index, "t": round(index * self.frame_seconds, 3), "drivers": samples}
+
+
+class FrameBuffer:
+    """Bounded per-client frame queue that drops the oldest frame when full"""
+
+    def __init__(self, maxsize: int):
+        self._frames = deque()
+        self._maxsize = max(1, maxsize)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item) -> bool:
+        """Queue an item; returns False if an older one had to be dropped"""
+        dropped = len(self._frames) >= self._maxsize
+        if dropped:
+            self._frames.popleft()
+            self.dropped += 1
+        self._frames.append(item)
+        self._ready.set()
+        return not dropped
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def get(self):
+        """Next item, or None once the buffer is closed and drained"""
+        while not self._frames:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+
+class ReplayHub:
+    """Builds each session's replay source once and shares it between viewers"""
+
+    def __init__(self, max_sessions: Optional[int] = None, frame_seconds: Optional[float] = None):
+        self.max_sessions = max_sessions or settings.replay_max_sessions
+        self.frame_seconds = frame_seconds or settings.replay_frame_seconds
+        self._sources: "OrderedDict[Tuple[int, int], ReplaySource]" = OrderedDict()
+        self._pending: Dict[Tuple[int, int], asyncio.Future] = {}
+        # Sources are also dropped from whichever thread needs memory back
+        self._lock = threading.Lock()
+
+    async def get_source(self, season: int, round_number: int) -> Optional[ReplaySource]:
+        """Return the session's source, loading it at most once for concurrent viewers"""
+        key = (season, round_number)
+        with self._lock:
+            source = self._sources.get(key)
+            if source is not None:
+                self._sources.move_to_end(key)
+                return source
+
+        pending = self._pending.get(key)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._build(season, round_number))
+            self._pending[key] = pending
+        try:
+            source = await asyncio.shield(pending)
+        finally:
+            if pending.done():
+                self._pending.pop(key, None)
+
+        if source is not None:
+            with self._lock:
+                self._sources[key] = source
+                while len(self._sources) > self.max_sessions:
+                    self._forget(self._sources.popitem(last=False)[0])
+            # Viewers already streaming an evicted source keep it until they finish
+            memory_budget.track("replay", self._memory_key(key), source.nbytes)
+        return source
+
+    @staticmethod
+    def _memory_key(key: Tuple[int, int]) -> str:
+        return f"{key[0]}/{key[1]}"
+
+    def _forget(self, key: Tuple[int, int]) -> None:
+        memory_budget.release("replay", self._memory_key(key))
+
+    def shed(self, nbytes: int) -> int:
+        """Drop least recently used sources until `nbytes` are freed; returns bytes freed"""
+        freed = 0
+        with self._lock:
+            while self._sources and freed < nbytes:
+                key, source = self._sources.popitem(last=False)
+                self._forget(key)
+                freed += source.nbytes
+        return freed
+
+    def is_loaded(self, season: int, round_number: int) -> bool:
+        return (season, round_number) in self._sources
+
+    async def _build(self, season: int, round_number: int) -> Optional[ReplaySource]:
+        """Load and merge a session, both on worker threads"""
+        from app.core.admission import admission
+        from app.services.fastf1_service import FastF1Service
+
+        with admission.reserve_memory(FastF1Service.get_session_car_data.__name__):
+            loaded = await FastF1Service.get_session_car_data(season, round_number)
+            if loaded is None:
+                return None
+            race, drivers = loaded
+            return await asyncio.to_thread(self._merge, race, drivers)
+
+    def _merge(self, race, drivers) -> ReplaySource:
+        with FASTF1_STAGE_SECONDS.labels("replay_merge").time():
+            return ReplaySource(race, drivers, self.frame_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            while self._sources:
+                self._forget(self._sources.popitem(last=False)[0])
+
+
+async def replay_frames(
+    source: ReplaySource,
+    drivers: Sequence[str],
+    speed: float = 1.0,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    buffer_frames: Optional[int] = None,
+    transport: str = "sse"
+) -> AsyncIterator[dict]:
+    """Yield a start message, the paced frames and an end message for one viewer
+
+    Frames are scheduled against replay time divided by `speed`. Only frame
+    indices are queued, so frames dropped for a slow client are never encoded.
+    """
+    indices = source.driver_indices(drivers)
+    first, last = source.frame_range(start, duration)
+    buffer = FrameBuffer(buffer_frames or settings.replay_buffer_frames)
+    interval = source.frame_seconds / speed
+
+    async def produce():
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        try:
+            for n, index in enumerate(range(first, last)):
+                delay = began + n * interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if not buffer.put(index):
+                    REPLAY_FRAMES.labels(transport, "dropped").inc()
+        finally:
+            buffer.close()
+
+    yield {
+        "type": "start",
+        "race": source.race.dict(),
+        "drivers": list(drivers),
+        "channels": list(source.channels),
+        "speed": speed,
+        "frame_seconds": source.frame_seconds,
+        "start": round(first * source.frame_seconds, 3),
+        "end": round(last * source.frame_seconds, 3),
+        "frames": last - first
+    }
+
+    producer = asyncio.create_task(produce())
+    sent = 0
+    try:
+        while (index := await buffer.get()) is not None:
+            frame = source.frame(index, indices)
+            frame["dropped"] = buffer.dropped
+            yield frame
+            sent += 1
+            REPLAY_FRAMES.labels(transport, "sent").inc()
+    finally:
+        producer.cancel()
+
+    yield {"type": "end", "sent": sent, "dropped": buffer.dropped}
+
+
+# Global replay hub instance
+replay_hub = ReplayHub()
+memory_budget.register_evictor("replay", replay_hub.shed, priority=1)
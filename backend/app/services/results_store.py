@@ -0,0 +1,457 @@
+"""
+Results store backed by the normalized tables at `settings.database_url`
+
+Race results loaded through FastF1Service are upserted here so history and
+head-to-head questions run as indexed SQL instead of loading every season.
+SQLAlchemy is imported on first use so importing the app stays fast.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from app.models.race import Driver, RaceResults
+from app.models.history import CareerSummary, DriverHistory, HeadToHead, HeadToHeadRace, HistoryEntry
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sync driver -> async driver for URLs written without one
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap a plain database URL onto its asyncio driver"""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class ResultsStore:
+    """Async, pooled access to the normalized results database
+
+    Pooled connections belong to the event loop that opened them, so the
+    store is only used from the app's loop; FastF1 loads hand their results
+    back to it rather than writing from worker threads.
+    """
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.database_url = database_url
+        self._engine = None
+        self._initialized = False
+        self._engine_lock = threading.Lock()
+        self._init_lock = asyncio.Lock()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+        return self._engine
+
+    def _create_engine(self):
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = async_database_url(self.database_url or settings.database_url)
+        options = {"pool_pre_ping": True}
+        if ":memory:" not in url:
+            options.update(pool_size=settings.database_pool_size, max_overflow=settings.database_max_overflow)
+
+        engine = create_async_engine(url, **options)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", _sqlite_pragmas)
+        return engine
+
+    async def initialize(self) -> None:
+        """Create the tables and indexes once; called at startup or on first use"""
+        if self._initialized:
+            return
+        from app.db.tables import metadata
+
+        # Startup and the first requests may all get here before the tables exist
+        async with self._init_lock:
+            if self._initialized:
+                return
+            async with self.engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+            self._initialized = True
+
+    async def dispose(self) -> None:
+        """Close pooled connections; the engine is recreated on next use"""
+        if self._engine is not None:
+            await self._engine.dispose()
+        self._engine = None
+        self._initialized = False
+        # A new engine may be used from another event loop
+        self._init_lock = asyncio.Lock()
+
+    def _insert(self, table):
+        if self.engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(table)
+
+    async def save_race_results(self, race_results: RaceResults) -> bool:
+        """Upsert a race with its drivers, constructors and results; returns success"""
+        from sqlalchemy import delete, func, select
+        from app.db.tables import constructors, drivers, events, results
+
+        race = race_results.race
+        try:
+            await self.initialize()
+            async with self.engine.begin() as conn:
+                stmt = self._insert(events).values(
+                    season=race.season,
+                    round=race.round,
+                    race_name=race.race_name,
+                    circuit_name=race.circuit_name,
+                    date=race.date.replace(tzinfo=None)
+                )
+                await conn.execute(stmt.on_conflict_do_update(
+                    index_elements=["season", "round"],
+                    set_={
+                        "race_name": stmt.excluded.race_name,
+                        "circuit_name": stmt.excluded.circuit_name,
+                        "date": stmt.excluded.date,
+                        "updated_at": func.current_timestamp(),
+                    }
+                ))
+                event_id = (await conn.execute(
+                    select(events.c.id).where(events.c.season == race.season, events.c.round == race.round)
+                )).scalar_one()
+
+                if race_results.results:
+                    driver_rows = {
+                        result.driver.driver_id: {
+                            "driver_id": result.driver.driver_id,
+                            "code": result.driver.code,
+                            "first_name": result.driver.first_name,
+                            "last_name": result.driver.last_name,
+                            "permanent_number": result.driver.permanent_number,
+                        }
+                        for result in race_results.results
+                    }
+                    stmt = self._insert(drivers).values(list(driver_rows.values()))
+                    await conn.execute(stmt.on_conflict_do_update(
+                        index_elements=["driver_id"],
+                        set_={
+                            "code": stmt.excluded.code,
+                            "first_name": stmt.excluded.first_name,
+                            "last_name": stmt.excluded.last_name,
+                            "permanent_number": stmt.excluded.permanent_number,
+                        }
+                    ))
+
+                    constructor_rows = {
+                        result.constructor.constructor_id: {
+                            "constructor_id": result.constructor.constructor_id,
+                            "name": result.constructor.name,
+                            "nationality": result.constructor.nationality or None,
+                        }
+                        for result in race_results.results
+                    }
+                    stmt = self._insert(constructors).values(list(constructor_rows.values()))
+                    await conn.execute(stmt.on_conflict_do_update(
+                        index_elements=["constructor_id"],
+                        set_={"name": stmt.excluded.name}
+                    ))
+
+                # Results are replaced wholesale so reclassifications don't leave stale rows
+                await conn.execute(delete(results).where(results.c.event_id == event_id))
+                if race_results.results:
+                    await conn.execute(results.insert(), [
+                        {
+                            "event_id": event_id,
+                            "driver_id": result.driver.driver_id,
+                            "constructor_id": result.constructor.constructor_id,
+                            "position": result.position or None,
+                            "points": result.points,
+                            "time": result.time,
+                            "status": result.status,
+                            "fastest_lap": result.fastest_lap,
+                            "fastest_lap_rank": result.fastest_lap_rank,
+                        }
+                        for result in race_results.results
+                    ])
+            return True
+
+        except Exception as e:
+            logger.error(f"Error storing results for {race.season}/{race.round}: {e}")
+            return False
+
+    async def stored_events(self) -> Set[Tuple[int, int]]:
+        """(season, round) of every race with stored results"""
+        from sqlalchemy import select
+        from app.db.tables import events, results
+
+        await self.initialize()
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                select(events.c.season, events.c.round)
+                .where(events.c.id.in_(select(results.c.event_id)))
+            )).all()
+        return {(row.season, row.round) for row in rows}
+
+    async def export_races(self) -> AsyncIterator[dict]:
+        """Yield each stored race with its drivers, constructors and results as plain rows"""
+        from sqlalchemy import select
+        from app.db.tables import constructors, drivers, events, results
+
+        await self.initialize()
+        async with self.engine.connect() as conn:
+            event_rows = (await conn.execute(
+                select(events).order_by(events.c.season, events.c.round)
+            )).mappings().all()
+            driver_rows = {row["driver_id"]: dict(row) for row in (await conn.execute(select(drivers))).mappings()}
+            constructor_rows = {
+                row["constructor_id"]: dict(row) for row in (await conn.execute(select(constructors))).mappings()
+            }
+            by_event = {}
+            for row in (await conn.execute(select(results))).mappings():
+                by_event.setdefault(row["event_id"], []).append(dict(row))
+
+        for event in event_rows:
+            rows = by_event.get(event["id"], [])
+            yield {
+                "event": {
+                    "season": event["season"],
+                    "round": event["round"],
+                    "race_name": event["race_name"],
+                    "circuit_name": event["circuit_name"],
+                    "date": event["date"].isoformat(),
+                },
+                "drivers": [driver_rows[row["driver_id"]] for row in rows],
+                "constructors": list({
+                    row["constructor_id"]: constructor_rows[row["constructor_id"]] for row in rows
+                }.values()),
+                "results": [{k: v for k, v in row.items() if k != "event_id"} for row in rows],
+            }
+
+    async def import_race(self, race: dict) -> bool:
+        """Insert an exported race unless it is already stored; returns whether it was inserted"""
+        from datetime import datetime
+        from sqlalchemy import select
+        from app.db.tables import constructors, drivers, events, results
+
+        season, round_number = race["event"]["season"], race["event"]["round"]
+        await self.initialize()
+        async with self.engine.begin() as conn:
+            existing = (await conn.execute(
+                select(events.c.id).where(events.c.season == season, events.c.round == round_number)
+            )).scalar_one_or_none()
+            if existing is not None and (await conn.execute(
+                select(results.c.event_id).where(results.c.event_id == existing).limit(1)
+            )).first():
+                return False
+
+            event = dict(race["event"], date=datetime.fromisoformat(race["event"]["date"]))
+            await conn.execute(self._insert(events).values(**event).on_conflict_do_nothing())
+            event_id = (await conn.execute(
+                select(events.c.id).where(events.c.season == season, events.c.round == round_number)
+            )).scalar_one()
+
+            if race["results"]:
+                await conn.execute(self._insert(drivers).values(race["drivers"]).on_conflict_do_nothing())
+                await conn.execute(self._insert(constructors).values(race["constructors"]).on_conflict_do_nothing())
+                await conn.execute(
+                    self._insert(results).on_conflict_do_nothing(),
+                    [dict(row, event_id=event_id) for row in race["results"]]
+                )
+        return True
+
+    @staticmethod
+    def _season_filters(since: Optional[int], until: Optional[int]) -> list:
+        from app.db.tables import events
+
+        filters = []
+        if since is not None:
+            filters.append(events.c.season >= since)
+        if until is not None:
+            filters.append(events.c.season <= until)
+        return filters
+
+    async def _find_driver(self, conn, identifier: str, since: Optional[int], until: Optional[int]):
+        """The driver row a driver id or three-letter code names
+
+        Codes are reused across eras (MSC is both Michael and Mick Schumacher),
+        so a code names whoever raced under it most recently within the
+        season range. An exact driver id always wins.
+        """
+        from sqlalchemy import case, func, or_, select
+        from app.db.tables import drivers, events, results
+
+        by_id = func.lower(drivers.c.driver_id) == identifier.lower()
+        named = or_(by_id, drivers.c.code == identifier.upper())
+        id_first = case((by_id, 0), else_=1)
+
+        driver = (await conn.execute(
+            select(drivers)
+            .select_from(drivers.join(results, results.c.driver_id == drivers.c.driver_id)
+                         .join(events, events.c.id == results.c.event_id))
+            .where(named, *self._season_filters(since, until))
+            .order_by(id_first, events.c.date.desc())
+            .limit(1)
+        )).mappings().first()
+        if driver is None:
+            # Known, but without results in the range
+            driver = (await conn.execute(
+                select(drivers).where(named).order_by(id_first).limit(1)
+            )).mappings().first()
+        return driver
+
+    async def get_driver_history(
+        self,
+        driver_id: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 100
+    ) -> Optional[DriverHistory]:
+        """A driver's stored results, newest first, with aggregates over the whole range
+
+        `driver_id` may be a driver id or a three-letter code.
+        """
+        from sqlalchemy import case, func, select
+        from app.db.tables import constructors, events, results
+
+        await self.initialize()
+        async with self.engine.connect() as conn:
+            driver = await self._find_driver(conn, driver_id, since, until)
+            if driver is None:
+                return None
+
+            filters = [results.c.driver_id == driver["driver_id"], *self._season_filters(since, until)]
+            joined = results.join(events, events.c.id == results.c.event_id)
+
+            summary = (await conn.execute(
+                select(
+                    func.count().label("starts"),
+                    func.coalesce(func.sum(case((results.c.position == 1, 1), else_=0)), 0).label("wins"),
+                    func.coalesce(func.sum(case((results.c.position <= 3, 1), else_=0)), 0).label("podiums"),
+                    func.coalesce(func.sum(results.c.points), 0.0).label("points"),
+                    func.min(results.c.position).label("best_position"),
+                ).select_from(joined).where(*filters)
+            )).mappings().one()
+
+            rows = (await conn.execute(
+                select(
+                    events.c.season, events.c.round, events.c.race_name, events.c.date,
+                    constructors.c.name.label("constructor"),
+                    results.c.position, results.c.points, results.c.status
+                )
+                .select_from(joined.join(constructors, constructors.c.constructor_id == results.c.constructor_id))
+                .where(*filters)
+                .order_by(events.c.date.desc())
+                .limit(limit)
+            )).mappings().all()
+
+        return DriverHistory(
+            driver=Driver(
+                driver_id=driver["driver_id"],
+                first_name=driver["first_name"],
+                last_name=driver["last_name"],
+                code=driver["code"],
+                permanent_number=driver["permanent_number"],
+                team=rows[0]["constructor"] if rows else None
+            ),
+            summary=CareerSummary(**summary),
+            results=[HistoryEntry(**row) for row in rows]
+        )
+
+    async def get_head_to_head(
+        self,
+        kind: str,
+        competitors: List[str],
+        since: Optional[int] = None,
+        until: Optional[int] = None
+    ) -> HeadToHead:
+        """Compare two drivers, or two constructors' best-placed cars, at every shared race
+
+        Drivers may be given by driver id or three-letter code.
+        """
+        from sqlalchemy import func, select
+        from app.db.tables import events, results
+
+        column = results.c.driver_id if kind == "drivers" else results.c.constructor_id
+
+        def side(competitor: str, name: str):
+            return (
+                select(
+                    results.c.event_id,
+                    func.min(results.c.position).label("position"),
+                    func.sum(results.c.points).label("points"),
+                )
+                .where(column == competitor)
+                .group_by(results.c.event_id)
+                .subquery(name)
+            )
+
+        await self.initialize()
+        async with self.engine.connect() as conn:
+            # Results are keyed by driver id, whatever the request named drivers by
+            keys = list(competitors)
+            if kind == "drivers":
+                for i, identifier in enumerate(competitors):
+                    driver = await self._find_driver(conn, identifier, since, until)
+                    if driver is not None:
+                        keys[i] = driver["driver_id"]
+
+            first, second = side(keys[0], "first"), side(keys[1], "second")
+            query = (
+                select(
+                    events.c.season, events.c.round, events.c.race_name,
+                    first.c.position.label("first_position"), second.c.position.label("second_position"),
+                    first.c.points.label("first_points"), second.c.points.label("second_points"),
+                )
+                .select_from(
+                    first.join(second, second.c.event_id == first.c.event_id)
+                    .join(events, events.c.id == first.c.event_id)
+                )
+                .where(*self._season_filters(since, until))
+                .order_by(events.c.date.desc())
+            )
+            rows = (await conn.execute(query)).mappings().all()
+
+        races = []
+        ahead = [0, 0]
+        points = [0.0, 0.0]
+        for row in rows:
+            positions = [row["first_position"], row["second_position"]]
+            winner = None
+            if positions[0] is not None or positions[1] is not None:
+                # An unclassified finish loses to any classified one
+                ranked = [p if p is not None else float("inf") for p in positions]
+                winner = 0 if ranked[0] < ranked[1] else 1
+                ahead[winner] += 1
+            race_points = [float(row["first_points"] or 0.0), float(row["second_points"] or 0.0)]
+            points = [points[0] + race_points[0], points[1] + race_points[1]]
+            races.append(HeadToHeadRace(
+                season=row["season"],
+                round=row["round"],
+                race_name=row["race_name"],
+                positions=positions,
+                points=race_points,
+                ahead=competitors[winner] if winner is not None else None
+            ))
+
+        return HeadToHead(
+            kind=kind,
+            competitors=competitors,
+            races=len(races),
+            ahead=ahead,
+            points=[round(p, 1) for p in points],
+            results=races
+        )
+
+
+# Global results store instance
+results_store = ResultsStore()
@@ -0,0 +1,340 @@
+"""
+Snapshot export and import for warming new nodes
+
+A snapshot is a single gzipped tar holding the processed data a node
+otherwise rebuilds from user traffic: live cache entries (results,
+telemetry, summaries, standings...), the results database and the model
+artifacts. Raw FastF1 downloads are not included.
+
+Members are written in a fixed order, manifest first, so import reads the
+archive as a stream in one pass. Every JSON Lines entry carries its own
+SHA-256 and is verified before it is applied; the manifest also records a
+checksum for every member. Cache entries and races that are already present
+are skipped, as are identical model files; a differing model file is
+replaced, predictions cached from the old model are invalidated and
+running workers are told to reload it.
+
+Run as a CLI:
+
+    python -m app.services.snapshot_service export snapshot.tar.gz
+    python -m app.services.snapshot_service import snapshot.tar.gz
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "f1-dashboard-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+CACHE_MEMBER = "cache.jsonl"
+RESULTS_MEMBER = "results.jsonl"
+MODELS_PREFIX = "models/"
+IMPORT_BATCH_SIZE = 500
+# Members larger than this are spooled to disk while exporting
+_SPOOL_BYTES = 64 * 1024 * 1024
+
+
+class SnapshotError(Exception):
+    """The archive is not a snapshot this version can read"""
+
+
+def _entry_digest(entry: dict) -> str:
+    return hashlib.sha256(json.dumps(entry, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _HashingReader(io.RawIOBase):
+    """Wraps a member's stream and hashes everything read through it"""
+
+    def __init__(self, stream: IO[bytes]):
+        self._stream = stream
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        self.digest.update(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _cache_entries(db_path: str) -> Iterator[dict]:
+    """Unexpired cache rows"""
+    if not os.path.exists(db_path):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            "SELECT key, value, expires_at FROM cache WHERE expires_at >= ? ORDER BY key",
+            (datetime.now().isoformat(),)
+        )
+        for key, value, expires_at in cursor:
+            yield {"key": key, "value": value, "expires_at": expires_at}
+    except sqlite3.OperationalError:
+        return
+    finally:
+        conn.close()
+
+
+def _model_files() -> List[str]:
+    if not os.path.isdir(settings.model_path):
+        return []
+    return sorted(name for name in os.listdir(settings.model_path) if name.endswith(".joblib"))
+
+
+async def export_snapshot(path: str) -> dict:
+    """Write a snapshot of the cache, results database and models to `path`"""
+    from app.services.cache_service import cache_service
+    from app.services.results_store import results_store
+
+    members: Dict[str, dict] = {}
+    spooled: Dict[str, IO[bytes]] = {}
+
+    def spool(name: str):
+        spooled[name] = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+        members[name] = {"sha256": hashlib.sha256(), "bytes": 0, "entries": 0}
+
+    def write(name: str, entry: dict) -> None:
+        record = {"sha256": _entry_digest(entry), "entry": entry}
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        spooled[name].write(line)
+        members[name]["sha256"].update(line)
+        members[name]["bytes"] += len(line)
+        members[name]["entries"] += 1
+
+    def write_cache():
+        for entry in _cache_entries(cache_service.db_path):
+            write(CACHE_MEMBER, entry)
+
+    spool(CACHE_MEMBER)
+    await asyncio.to_thread(write_cache)
+
+    spool(RESULTS_MEMBER)
+    async for race in results_store.export_races():
+        write(RESULTS_MEMBER, race)
+
+    model_files = _model_files()
+    for name in model_files:
+        file_path = os.path.join(settings.model_path, name)
+        members[MODELS_PREFIX + name] = {
+            "sha256": _file_digest(file_path),
+            "bytes": os.path.getsize(file_path),
+            "entries": 1,
+        }
+
+    for info in members.values():
+        if not isinstance(info["sha256"], str):
+            info["sha256"] = info["sha256"].hexdigest()
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "api_version": settings.api_version,
+        "created_at": datetime.now().isoformat(),
+        "members": members,
+    }
+
+    def write_archive():
+        with tarfile.open(path, "w|gz") as tar:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+
+            for name in (CACHE_MEMBER, RESULTS_MEMBER):
+                stream = spooled[name]
+                stream.seek(0)
+                info = tarfile.TarInfo(name)
+                info.size = members[name]["bytes"]
+                info.mtime = int(time.time())
+                tar.addfile(info, stream)
+                stream.close()
+
+            for name in model_files:
+                tar.add(os.path.join(settings.model_path, name), arcname=MODELS_PREFIX + name)
+
+    await asyncio.to_thread(write_archive)
+    summary = {name: info["entries"] for name, info in members.items()}
+    logger.info(f"Exported snapshot to {path}: {summary}")
+    return {"path": path, "bytes": os.path.getsize(path), "entries": summary}
+
+
+def _verified_lines(stream: IO[bytes], counts: dict) -> Iterator[dict]:
+    """Entries whose checksum matches; corrupt lines are counted and skipped"""
+    for line in io.BufferedReader(stream):
+        try:
+            record = json.loads(line)
+            if _entry_digest(record["entry"]) == record["sha256"]:
+                yield record["entry"]
+                continue
+        except (ValueError, KeyError, TypeError):
+            pass
+        counts["corrupt"] += 1
+
+
+def _import_cache(entries: Iterator[dict], counts: dict) -> None:
+    from app.services.cache_service import cache_service
+
+    cache_service.initialize()
+    now = datetime.now().isoformat()
+    conn = sqlite3.connect(cache_service.db_path)
+    try:
+        batch = []
+
+        def flush():
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", batch)
+            imported = conn.total_changes - before
+            counts["imported"] += imported
+            counts["skipped"] += len(batch) - imported
+            batch.clear()
+
+        for entry in entries:
+            if entry["expires_at"] < now:
+                counts["skipped"] += 1
+                continue
+            batch.append((entry["key"], entry["value"], entry["expires_at"]))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def import_snapshot(path: str) -> dict:
+    """Load a snapshot, skipping entries that are already present
+
+    Raises SnapshotError for archives of an unknown format or version. Per-entry
+    and per-member checksum failures are reported in the returned summary.
+    """
+    from app.services.results_store import results_store
+
+    report: Dict[str, dict] = {}
+    checksum_errors: List[str] = []
+    start = time.perf_counter()
+
+    with tarfile.open(path, "r|gz") as tar:
+        manifest = None
+        for member in tar:
+            if not member.isfile():
+                continue
+            stream = tar.extractfile(member)
+
+            if member.name == MANIFEST:
+                manifest = json.load(stream)
+                if manifest.get("format") != SNAPSHOT_FORMAT:
+                    raise SnapshotError(f"{path} is not a snapshot")
+                if manifest.get("version") != SNAPSHOT_VERSION:
+                    raise SnapshotError(f"Unsupported snapshot version {manifest.get('version')}")
+                continue
+            if manifest is None:
+                raise SnapshotError(f"{path} has no manifest before its data")
+
+            expected = manifest["members"].get(member.name, {}).get("sha256")
+            counts = report.setdefault(member.name, {"imported": 0, "skipped": 0, "corrupt": 0})
+            reader = _HashingReader(stream)
+
+            if member.name == CACHE_MEMBER:
+                await asyncio.to_thread(_import_cache, _verified_lines(reader, counts), counts)
+            elif member.name == RESULTS_MEMBER:
+                for race in _verified_lines(reader, counts):
+                    counts["imported" if await results_store.import_race(race) else "skipped"] += 1
+            elif member.name.startswith(MODELS_PREFIX):
+                name = os.path.basename(member.name)
+                target = os.path.join(settings.model_path, name)
+                if os.path.exists(target) and _file_digest(target) == expected:
+                    counts["skipped"] += 1
+                else:
+                    os.makedirs(settings.model_path, exist_ok=True)
+                    partial = target + ".partial"
+                    with open(partial, "wb") as f:
+                        for chunk in iter(lambda: reader.read(1024 * 1024), b""):
+                            f.write(chunk)
+                    if reader.digest.hexdigest() == expected:
+                        os.replace(partial, target)
+                        counts["imported"] += 1
+                    else:
+                        os.remove(partial)
+                        counts["corrupt"] += 1
+            else:
+                continue
+
+            # Drain anything left unread so the member checksum covers all of it
+            reader.read()
+            if reader.digest.hexdigest() != expected:
+                checksum_errors.append(member.name)
+
+    if manifest is None:
+        raise SnapshotError(f"{path} has no manifest")
+    if any(name.startswith(MODELS_PREFIX) and counts["imported"] for name, counts in report.items()):
+        from app.api.routes_predict import ml_service
+        from app.services.cache_service import cache_service
+        from app.services.coordination_service import coordinator
+
+        # This process and the running workers pick up the replaced model
+        # artifacts; predictions cached from the old model are dropped
+        if ml_service.loaded:
+            await asyncio.to_thread(ml_service.reload)
+        await cache_service.invalidate("predict_")
+        coordinator.publish("model_reload")
+    elapsed = time.perf_counter() - start
+    logger.info(f"Imported snapshot {path} in {elapsed:.2f}s: {report}")
+    return {
+        "path": path,
+        "created_at": manifest["created_at"],
+        "elapsed_seconds": round(elapsed, 3),
+        "members": report,
+        "checksum_errors": checksum_errors,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Export or import a snapshot of processed data")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="Snapshot archive (.tar.gz)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "export":
+        result = asyncio.run(export_snapshot(args.path))
+    else:
+        try:
+            result = asyncio.run(import_snapshot(args.path))
+        except SnapshotError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    print(json.dumps(result, indent=2))
+    return 1 if result.get("checksum_errors") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
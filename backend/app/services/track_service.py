@@ -0,0 +1,134 @@
+"""
+Track map geometry helpers
+
+Circuit outlines come from a lap's position data and are simplified with
+Douglas-Peucker. Each point's significance (the largest tolerance at which
+Douglas-Peucker would still keep it) is computed in one pass, so any
+target point count or tolerance is a threshold on that array.
+"""
+
+import re
+from typing import Optional, Sequence, Tuple
+
+# Seasons in which a circuit's layout changed, by FastF1 event location.
+# Geometry is shared by every season from a change up to the next one.
+LAYOUT_REVISIONS = {
+    "melbourne": (2022,),
+    "barcelona": (2023,),
+    "montmelo": (2023,),
+    "yas-island": (2021,),
+    "yas-marina": (2021,),
+    "marina-bay": (2023,),
+    "singapore": (2023,),
+}
+
+
+# Channels that can be mapped onto a track: name -> (car data column, discrete)
+TRACK_CHANNELS = {
+    "speed": ("Speed", False),
+    "throttle": ("Throttle", False),
+    "rpm": ("RPM", False),
+    "gear": ("nGear", True),
+    "brake": ("Brake", True),
+    "drs": ("DRS", True),
+}
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+def layout_id(circuit_name: str, season: int) -> str:
+    """Identify a circuit layout from the event location and season"""
+    slug = _slug(circuit_name)
+    revision = max((year for year in LAYOUT_REVISIONS.get(slug, ()) if year <= season), default=None)
+    return f"{slug}-{revision}" if revision else slug
+
+
+class TrackGeometry:
+    """Vectorized polyline simplification and channel mapping"""
+
+    @staticmethod
+    def significance(x: Sequence, y: Sequence):
+        """Douglas-Peucker significance of every point; endpoints are infinite
+
+        A point survives simplification at tolerance `t` exactly when its
+        significance is greater than `t`, because a point's value is capped
+        by the value of the split that exposed it.
+        """
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = x.size
+        result = np.zeros(n)
+        result[[0, -1]] = np.inf
+
+        stack = [(0, n - 1, np.inf)]
+        while stack:
+            first, last, cap = stack.pop()
+            if last - first < 2:
+                continue
+            px, py = x[first + 1:last], y[first + 1:last]
+            dx, dy = x[last] - x[first], y[last] - y[first]
+            norm = np.hypot(dx, dy)
+            if norm == 0:
+                # Closed loop: distance from the shared endpoint
+                distance = np.hypot(px - x[first], py - y[first])
+            else:
+                distance = np.abs(dy * (px - x[first]) - dx * (py - y[first])) / norm
+            i = int(np.argmax(distance))
+            split = first + 1 + i
+            value = min(float(distance[i]), cap)
+            result[split] = value
+            stack.append((first, split, value))
+            stack.append((split, last, value))
+
+        return result
+
+    @staticmethod
+    def simplify(
+        x: Sequence,
+        y: Sequence,
+        target_points: Optional[int] = None,
+        tolerance: Optional[float] = None
+    ) -> Tuple[object, float]:
+        """Indices of the points kept, plus the tolerance that produced them
+
+        With `target_points` the tolerance is chosen to keep at most that many
+        points; otherwise points at or below `tolerance` are dropped.
+        """
+        import numpy as np
+
+        significance = TrackGeometry.significance(x, y)
+        if target_points is not None and target_points < significance.size:
+            tolerance = float(np.sort(significance)[::-1][max(target_points, 2)])
+        elif tolerance is None:
+            tolerance = 0.0
+        return np.flatnonzero(significance > tolerance), tolerance
+
+    @staticmethod
+    def path_fraction(x: Sequence, y: Sequence):
+        """Cumulative path length along a polyline, scaled to 0..1"""
+        import numpy as np
+
+        steps = np.hypot(np.diff(x), np.diff(y))
+        cumulative = np.concatenate(([0.0], np.cumsum(steps)))
+        return cumulative / cumulative[-1] if cumulative[-1] > 0 else cumulative
+
+    @staticmethod
+    def sample_channel(fraction: Sequence, values: Sequence, at: Sequence, discrete: bool = False):
+        """Sample a channel recorded along a lap at the given lap fractions
+
+        Continuous channels are linearly interpolated; discrete ones (gear,
+        DRS, brake) take the last recorded value so they are never blended.
+        """
+        import numpy as np
+
+        fraction = np.asarray(fraction, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        at = np.asarray(at, dtype=np.float64)
+        if discrete:
+            index = np.searchsorted(fraction, at, side="right") - 1
+            return values[np.clip(index, 0, values.size - 1)]
+        return np.interp(at, fraction, values)
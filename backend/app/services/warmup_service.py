@@ -0,0 +1,222 @@
+"""
+Cache warmup service for prefetching race data ahead of user traffic
+
+Run as a CLI:
+
+    python -m app.services.warmup_service --season 2024
+    python -m app.services.warmup_service --season 2024 --backfill --offline
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from app.models.race import Race
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.readiness import readiness
+from app.services.fastf1_service import get_fastf1
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupJob(NamedTuple):
+    """A single prefetch unit"""
+    kind: str  # "results", "telemetry", "summary" or "standings"
+    season: int
+    round: Optional[int] = None
+
+
+def plan_jobs(
+    races: List[Race],
+    now: datetime,
+    lookback_days: int,
+    lookahead_days: int,
+    backfill: bool = False
+) -> List[WarmupJob]:
+    """Work out which sessions to prefetch from the event schedule"""
+    finished = [race for race in races if _naive(race.date) <= now]
+
+    if backfill:
+        targets = finished
+    else:
+        since = now - timedelta(days=lookback_days)
+        targets = [race for race in finished if _naive(race.date) >= since]
+
+        # Visitors always land on the latest completed race first
+        if not targets and finished:
+            targets = [max(finished, key=lambda race: race.date)]
+
+    jobs = []
+    for race in sorted(targets, key=lambda race: race.date, reverse=True):
+        jobs.append(WarmupJob("results", race.season, race.round))
+        jobs.append(WarmupJob("telemetry", race.season, race.round))
+        jobs.append(WarmupJob("summary", race.season, race.round))
+
+    # Standings are requested alongside recent results and ahead of the next race
+    until = now + timedelta(days=lookahead_days)
+    upcoming = any(now < _naive(race.date) <= until for race in races)
+    if races and (targets or upcoming):
+        jobs.append(WarmupJob("standings", races[0].season))
+
+    return jobs
+
+
+def _naive(value: datetime) -> datetime:
+    """Drop timezone info so schedule dates compare against local time"""
+    return value.replace(tzinfo=None)
+
+
+async def _execute(job: WarmupJob) -> None:
+    """Populate the cache for a job through the regular route handlers"""
+    from app.api import routes_races
+
+    if job.kind == "results":
+        await routes_races.get_race_results(job.season, job.round)
+    elif job.kind == "telemetry":
+        await routes_races.get_race_telemetry(job.season, job.round)
+    elif job.kind == "summary":
+        await routes_races.get_race_telemetry_summary(job.season, job.round)
+    elif job.kind == "standings":
+        await routes_races.get_standings(job.season)
+    else:
+        raise ValueError(f"Unknown warmup job kind: {job.kind}")
+
+
+class WarmupScheduler:
+    """Periodically prefetches recent sessions into the cache"""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        interval_minutes: Optional[int] = None,
+        job_delay_seconds: Optional[float] = None
+    ):
+        self.concurrency = concurrency or settings.warmup_concurrency
+        self.interval_minutes = interval_minutes or settings.warmup_interval_minutes
+        self.job_delay_seconds = (
+            settings.warmup_job_delay_seconds if job_delay_seconds is None else job_delay_seconds
+        )
+        self.last_run: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(
+        self,
+        season: Optional[int] = None,
+        backfill: bool = False,
+        offline: Optional[bool] = None
+    ) -> dict:
+        """Plan and run one warmup pass for a season"""
+        season = season or datetime.now().year
+
+        # Offline mode is process-wide: switch it for this pass only
+        offline = settings.fastf1_offline if offline is None else offline
+        switch = offline != settings.fastf1_offline
+        if switch:
+            get_fastf1().Cache.offline_mode(offline)
+        try:
+            # Prefetching yields the cold lane to user requests
+            with admission.background():
+                return await self._run_pass(season, backfill)
+        finally:
+            if switch:
+                get_fastf1().Cache.offline_mode(settings.fastf1_offline)
+
+    async def _run_pass(self, season: int, backfill: bool) -> dict:
+        from app.api import routes_races
+
+        try:
+            races = await routes_races.get_races(season)
+        except HTTPException:
+            races = []
+
+        jobs = plan_jobs(
+            races,
+            now=datetime.now(),
+            lookback_days=settings.warmup_lookback_days,
+            lookahead_days=settings.warmup_lookahead_days,
+            backfill=backfill
+        )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: WarmupJob) -> bool:
+            async with semaphore:
+                try:
+                    # FastF1 loads run on worker threads; the cache and results store stay on this loop
+                    await _execute(job)
+                    return True
+                except HTTPException as e:
+                    logger.warning(f"Warmup skipped {job}: {e.detail}")
+                    return False
+                except Exception as e:
+                    logger.error(f"Warmup failed for {job}: {e}")
+                    return False
+                finally:
+                    # Keep warmup at low priority relative to user traffic
+                    if self.job_delay_seconds:
+                        await asyncio.sleep(self.job_delay_seconds)
+
+        outcomes = await asyncio.gather(*(run(job) for job in jobs))
+
+        self.last_run = {
+            "season": season,
+            "backfill": backfill,
+            "planned": len(jobs),
+            "succeeded": sum(outcomes),
+            "failed": len(outcomes) - sum(outcomes),
+            "finished_at": datetime.now().isoformat()
+        }
+        logger.info(f"Cache warmup finished: {self.last_run}")
+        return self.last_run
+
+    async def _loop(self) -> None:
+        """Run warmup passes until cancelled"""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Error during cache warmup: {e}")
+            readiness.mark_ready("warmup")
+            await asyncio.sleep(self.interval_minutes * 60)
+
+    def start(self) -> None:
+        """Start the periodic warmup task on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the periodic warmup task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global warmup scheduler instance
+warmup_scheduler = WarmupScheduler()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Prefetch F1 data into the cache")
+    parser.add_argument("--season", type=int, default=None, help="Season to warm (default: current year)")
+    parser.add_argument("--backfill", action="store_true", help="Warm every completed round of the season")
+    parser.add_argument("--offline", action="store_true", help="Only use the local FastF1 cache")
+    parser.add_argument("--concurrency", type=int, default=None, help="Maximum concurrent session loads")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    scheduler = WarmupScheduler(concurrency=args.concurrency, job_delay_seconds=0)
+    asyncio.run(scheduler.run_once(season=args.season, backfill=args.backfill, offline=args.offline or None))
+
+
+if __name__ == "__main__":
+    main()
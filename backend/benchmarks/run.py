@@ -0,0 +1,326 @@
+"""
+Offline benchmark suite for the API and FastF1Service stages
+
+Runs every endpoint cold (empty cache) and warm, the time to warm a node
+with and without a snapshot, each FastF1Service loader and the race
+simulator against the synthetic FastF1 stand-in and writes a JSON report
+that can be compared across commits:
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json --threshold 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import SPRINT_ROUNDS, synthetic_fastf1
+
+SEASON = 2024
+ROUND = 8
+REPORT_SCHEMA = 1
+SIMULATION_RUNS = 10000
+
+
+def _summarize(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p95_ms": round(ordered[p95_index] * 1000, 3),
+    }
+
+
+def _measure(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summarize(samples)
+
+
+def _stage_totals() -> Dict[str, tuple]:
+    from app.core.metrics import FASTF1_STAGE_SECONDS
+
+    return {
+        values[0]: (child.sum, child.count)
+        for values, child in FASTF1_STAGE_SECONDS._children.items()
+    }
+
+
+def _simulation_benchmarks(repeat: int) -> Dict[str, dict]:
+    """Time full race simulations without a latency budget and report throughput"""
+    from app.models.predict import PredictRequest
+    from app.models.race import Driver
+    from app.services.ml_service import MLService
+    from benchmarks.synthetic import DRIVERS
+
+    request = PredictRequest(season=SEASON, round=ROUND, session_type="race", weather_condition="Dry")
+    grid = [
+        Driver(driver_id=last.lower(), first_name=first, last_name=last, code=code,
+               permanent_number=int(number), team=team)
+        for number, code, first, last, team in DRIVERS
+    ]
+    results = {}
+    for drivers in (10, 20):
+        simulator = MLService()._build_race_simulator(request, grid[:drivers])
+        result = _measure(lambda: simulator.run(SIMULATION_RUNS, seed=0), repeat)
+        result["runs_per_second"] = round(SIMULATION_RUNS / (result["median_ms"] / 1000))
+        results[f"simulation.race.{drivers}_drivers"] = result
+    return results
+
+
+def _time_to_warm(client, clear_cache: Callable[[], None], snapshot_path: str) -> Dict[str, dict]:
+    """Time to serve a race weekend's pages from an empty cache, with and without a snapshot"""
+    from app.services.snapshot_service import export_snapshot, import_snapshot
+
+    pages = [f"/api/races/{SEASON}", f"/api/standings/{SEASON}"]
+    for round_number in (ROUND, ROUND + 1):
+        pages += [
+            f"/api/race/{SEASON}/{round_number}/results",
+            f"/api/race/{SEASON}/{round_number}/telemetry",
+            f"/api/race/{SEASON}/{round_number}/telemetry/summary",
+        ]
+
+    def serve_pages():
+        for page in pages:
+            client.get(page).raise_for_status()
+
+    clear_cache()
+    start = time.perf_counter()
+    serve_pages()
+    without_snapshot = time.perf_counter() - start
+
+    asyncio.run(export_snapshot(snapshot_path))
+    clear_cache()
+    start = time.perf_counter()
+    asyncio.run(import_snapshot(snapshot_path))
+    serve_pages()
+    with_snapshot = time.perf_counter() - start
+
+    return {
+        "warm.without_snapshot": _summarize([without_snapshot]),
+        "warm.with_snapshot": _summarize([with_snapshot]),
+    }
+
+
+def _endpoints() -> Dict[str, tuple]:
+    """Every API endpoint, with the parameters it is timed with"""
+    race = f"/api/race/{SEASON}/{ROUND}"
+    endpoints = {
+        "health": ("GET", "/health", None),
+        "races": ("GET", f"/api/races/{SEASON}", None),
+        "results": ("GET", f"{race}/results", None),
+        "telemetry": ("GET", f"{race}/telemetry", None),
+        "telemetry_summary": ("GET", f"{race}/telemetry/summary", None),
+        "track": ("GET", f"{race}/track", None),
+        "track_telemetry": ("GET", f"{race}/track/telemetry?driver=VER", None),
+        "compare": ("GET", f"{race}/compare?drivers=VER,LEC", None),
+        "laps": ("GET", f"{race}/laps", None),
+        "laps_stints": ("GET", f"{race}/laps/stints", None),
+        "laps_pitstops": ("GET", f"{race}/laps/pitstops", None),
+        "standings": ("GET", f"/api/standings/{SEASON}", None),
+        "predict": ("POST", "/api/predict", {"season": SEASON, "round": ROUND, "session_type": "race"}),
+        # Reads the results database the results endpoint fills
+        "driver_history": ("GET", "/api/drivers/VER/results", None),
+        "head_to_head": ("GET", "/api/head-to-head/drivers?ids=VER,LEC", None),
+        "replay": ("GET", f"{race}/replay?speed=64&duration=30", None),
+    }
+    # A sprint weekend, so the sprint sessions exist too
+    sprint_round = min(SPRINT_ROUNDS)
+    for session in ("Q", "S"):
+        for part in ("results", "laps", "telemetry", "weather"):
+            endpoints[f"session_{part}.{session}"] = (
+                "GET", f"/api/race/{SEASON}/{sprint_round}/sessions/{session}/{part}", None
+            )
+    return endpoints
+
+
+def _endpoint_benchmarks(repeat: int, tmp: str, cache_service, replay_hub) -> Dict[str, dict]:
+    """Time every endpoint cold (empty cache) and warm, then the time to warm a node"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    def clear_cache():
+        import sqlite3
+        cache_service.initialize()
+        conn = sqlite3.connect(cache_service.db_path)
+        conn.execute("DELETE FROM cache")
+        conn.commit()
+        conn.close()
+        cache_service.drop_hot({"prefix": ""})
+        replay_hub.clear()
+
+    client = TestClient(app)
+    results = {}
+    for name, (method, path, body) in _endpoints().items():
+        def call(method=method, path=path, body=body):
+            response = client.request(method, path, json=body)
+            response.raise_for_status()
+
+        results[f"endpoint.{name}.cold"] = _measure(call, repeat, setup=clear_cache)
+        call()
+        results[f"endpoint.{name}.warm"] = _measure(call, repeat)
+
+    results.update(_time_to_warm(client, clear_cache, os.path.join(tmp, "snapshot.tar.gz")))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(repeat: int = 5) -> dict:
+    """Run the whole suite and return the report"""
+    from app.core.admission import admission
+    from app.core.config import settings
+    from app.services.cache_service import cache_service
+    from app.services.fastf1_service import FastF1Service
+    from app.services.replay_service import replay_hub
+    from app.services.results_store import results_store
+
+    results: Dict[str, dict] = {}
+    saved_settings = {
+        name: getattr(settings, name) for name in ("coordination_db_path", "database_url", "fastf1_cache_dir")
+    }
+    saved_cache = (cache_service.db_path, cache_service._initialized)
+    saved_rates = {name: lane.rate for name, lane in admission.lanes.items()}
+
+    with tempfile.TemporaryDirectory() as tmp, synthetic_fastf1():
+        # Keep every database the app writes inside the temporary directory
+        cache_service.db_path = os.path.join(tmp, "cache.db")
+        cache_service._initialized = False
+        settings.coordination_db_path = os.path.join(tmp, "coordination.db")
+        settings.database_url = f"sqlite:///{os.path.join(tmp, 'f1_dashboard.db')}"
+        settings.fastf1_cache_dir = os.path.join(tmp, "fastf1_cache")
+        asyncio.run(results_store.dispose())
+        # One client times every endpoint back to back; don't rate limit it
+        for lane in admission.lanes.values():
+            lane.rate = 0
+        try:
+            results.update(_endpoint_benchmarks(repeat, tmp, cache_service, replay_hub))
+
+            # Service loaders without the cache, with a per-stage breakdown
+            loaders = {
+                "get_races_for_season": lambda: FastF1Service.get_races_for_season(SEASON),
+                "get_race_results": lambda: FastF1Service.get_race_results(SEASON, ROUND),
+                "get_race_telemetry": lambda: FastF1Service.get_race_telemetry(SEASON, ROUND),
+                "get_telemetry_summary": lambda: FastF1Service.get_telemetry_summary(SEASON, ROUND),
+                "get_standings": lambda: FastF1Service.get_standings(SEASON),
+            }
+            before = _stage_totals()
+            for name, loader in loaders.items():
+                results[f"service.{name}"] = _measure(lambda: asyncio.run(loader()), repeat)
+            for stage, (total, count) in sorted(_stage_totals().items()):
+                previous_total, previous_count = before.get(stage, (0.0, 0))
+                if count > previous_count:
+                    mean = (total - previous_total) / (count - previous_count)
+                    results[f"stage.{stage}"] = {
+                        "runs": count - previous_count,
+                        "mean_ms": round(mean * 1000, 3),
+                        "median_ms": round(mean * 1000, 3),
+                    }
+        finally:
+            asyncio.run(results_store.dispose())
+            replay_hub.clear()
+            cache_service.drop_hot({"prefix": ""})
+            cache_service.db_path, cache_service._initialized = saved_cache
+            for name, value in saved_settings.items():
+                setattr(settings, name, value)
+            for name, rate in saved_rates.items():
+                admission.lanes[name].rate = rate
+
+    results.update(_simulation_benchmarks(repeat))
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "generated_at": datetime.now().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """Compare median timings; return one row per benchmark present in both"""
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / previous["median_ms"]
+        rows.append({
+            "name": name,
+            "baseline_ms": previous["median_ms"],
+            "current_ms": result["median_ms"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed median slowdown before flagging a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    report = run_benchmarks(repeat=args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    for name, result in report["results"].items():
+        throughput = f"  {result['runs_per_second']:,} runs/s" if "runs_per_second" in result else ""
+        print(f"{name:45s} {result['median_ms']:>10.2f} ms{throughput}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        print()
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:45s} {row['baseline_ms']:>10.2f} -> {row['current_ms']:>10.2f} ms "
+                  f"x{row['ratio']:<6} {flag}")
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
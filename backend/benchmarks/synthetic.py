@@ -0,0 +1,409 @@
+"""
+Deterministic synthetic stand-in for FastF1 data
+
+Generates event schedules and sessions with realistic sizes (24 rounds,
+20 drivers, ~60 laps, 4 Hz car and position data) using the real FastF1
+`Laps`, `SessionResults` and `Telemetry` containers, so service code runs
+against the same types it sees in production without any network access.
+
+    with synthetic_fastf1():
+        races = await FastF1Service.get_races_for_season(2024)
+"""
+
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Optional
+from unittest import mock
+
+import fastf1
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, SessionResults, Telemetry
+from fastf1.exceptions import DataNotLoadedError
+
+N_ROUNDS = 24
+SAMPLE_HZ = 4
+RACE_START = 3600.0  # session time of the start, in seconds
+SPRINT_ROUNDS = {5, 6, 11, 19, 21, 23}
+
+DRIVERS = [
+    # number, code, first name, last name, team
+    ("1", "VER", "Max", "Verstappen", "Red Bull Racing"),
+    ("11", "PER", "Sergio", "Perez", "Red Bull Racing"),
+    ("16", "LEC", "Charles", "Leclerc", "Ferrari"),
+    ("55", "SAI", "Carlos", "Sainz", "Ferrari"),
+    ("44", "HAM", "Lewis", "Hamilton", "Mercedes"),
+    ("63", "RUS", "George", "Russell", "Mercedes"),
+    ("4", "NOR", "Lando", "Norris", "McLaren"),
+    ("81", "PIA", "Oscar", "Piastri", "McLaren"),
+    ("14", "ALO", "Fernando", "Alonso", "Aston Martin"),
+    ("18", "STR", "Lance", "Stroll", "Aston Martin"),
+    ("10", "GAS", "Pierre", "Gasly", "Alpine"),
+    ("31", "OCO", "Esteban", "Ocon", "Alpine"),
+    ("23", "ALB", "Alexander", "Albon", "Williams"),
+    ("2", "SAR", "Logan", "Sargeant", "Williams"),
+    ("22", "TSU", "Yuki", "Tsunoda", "RB"),
+    ("3", "RIC", "Daniel", "Ricciardo", "RB"),
+    ("77", "BOT", "Valtteri", "Bottas", "Kick Sauber"),
+    ("24", "ZHO", "Guanyu", "Zhou", "Kick Sauber"),
+    ("20", "MAG", "Kevin", "Magnussen", "Haas F1 Team"),
+    ("27", "HUL", "Nico", "Hulkenberg", "Haas F1 Team"),
+]
+
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1] + [0] * 10
+
+LOCATIONS = [
+    "Sakhir", "Jeddah", "Melbourne", "Suzuka", "Shanghai", "Miami", "Imola",
+    "Monaco", "Montréal", "Barcelona", "Spielberg", "Silverstone", "Budapest",
+    "Spa-Francorchamps", "Zandvoort", "Monza", "Baku", "Marina Bay", "Austin",
+    "Mexico City", "São Paulo", "Las Vegas", "Lusail", "Yas Island",
+]
+
+SESSION_NAMES = {
+    "conventional": ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"],
+    "sprint_qualifying": ["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race"],
+}
+
+SESSION_IDENTIFIERS = {
+    "FP1": "Practice 1", "FP2": "Practice 2", "FP3": "Practice 3",
+    "Q": "Qualifying", "SQ": "Sprint Qualifying", "S": "Sprint", "R": "Race",
+}
+
+COMPOUNDS = np.array(["SOFT", "MEDIUM", "HARD"])
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32("/".join(str(part) for part in parts).encode())
+
+
+def make_schedule(season: int) -> pd.DataFrame:
+    """Build an event schedule frame shaped like `fastf1.get_event_schedule`"""
+    rows = []
+    first_race = pd.Timestamp(f"{season}-03-03 15:00")
+    for round_number in range(1, N_ROUNDS + 1):
+        event_format = "sprint_qualifying" if round_number in SPRINT_ROUNDS else "conventional"
+        event_date = first_race + pd.Timedelta(days=14 * (round_number - 1) - 7 * (round_number > 12))
+        location = LOCATIONS[round_number - 1]
+        row = {
+            "RoundNumber": round_number,
+            "Country": location,
+            "Location": location,
+            "OfficialEventName": f"FORMULA 1 {location.upper()} GRAND PRIX {season}",
+            "EventDate": event_date,
+            "EventName": f"{location} Grand Prix",
+            "EventFormat": event_format,
+            "F1ApiSupport": True,
+        }
+        for index, name in enumerate(SESSION_NAMES[event_format], start=1):
+            session_date = event_date - pd.Timedelta(days=5 - index) + pd.Timedelta(hours=index % 2)
+            row[f"Session{index}"] = name
+            row[f"Session{index}Date"] = session_date
+            row[f"Session{index}DateUtc"] = session_date
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+class _Circuit:
+    """Per-circuit layout: speed profile and track outline over lap fraction"""
+
+    def __init__(self, season: int, round_number: int):
+        rng = np.random.default_rng(_seed("circuit", round_number))
+        self.length = float(rng.uniform(4300, 6500))
+        self.n_laps = int(round(305000 / self.length))
+
+        # Speed profile: straights near 320 km/h broken up by corners
+        grid = np.linspace(0, 1, 400, endpoint=False)
+        corners = rng.uniform(0, 1, rng.integers(12, 21))
+        depth = rng.uniform(90, 230, corners.size)
+        width = rng.uniform(0.015, 0.045, corners.size)
+        dist = np.abs(grid[:, None] - corners[None, :])
+        dist = np.minimum(dist, 1 - dist)
+        self.speed_profile = 325 - (depth * np.exp(-(dist / width) ** 2)).max(axis=1)
+        self.profile_grid = grid
+        self.base_lap = self.length / (self.speed_profile / 3.6).mean()
+
+        # Outline: closed Fourier curve in track coordinates (decimetres)
+        theta = 2 * np.pi * grid
+        harmonics = np.arange(2, 6)
+        amp = rng.uniform(0.05, 0.25, (2, harmonics.size))
+        phase = rng.uniform(0, 2 * np.pi, (2, harmonics.size))
+        radius = self.length * 10 / (2 * np.pi)
+        self.x = radius * (np.cos(theta) + (amp[0] * np.cos(harmonics * theta[:, None] + phase[0])).sum(axis=1))
+        self.y = radius * (np.sin(theta) + (amp[1] * np.sin(harmonics * theta[:, None] + phase[1])).sum(axis=1))
+
+    def speed_at(self, fraction: np.ndarray) -> np.ndarray:
+        return np.interp(fraction, self.profile_grid, self.speed_profile, period=1)
+
+    def position_at(self, fraction: np.ndarray):
+        x = np.interp(fraction, self.profile_grid, self.x, period=1)
+        y = np.interp(fraction, self.profile_grid, self.y, period=1)
+        return x, y
+
+
+class SyntheticSession:
+    """Duck-typed stand-in for `fastf1.core.Session`"""
+
+    def __init__(self, season: int, round_number: int, identifier: str, event: pd.Series):
+        self.event = event
+        self.name = SESSION_IDENTIFIERS.get(identifier, identifier)
+        self.session_type = identifier
+        self.date = event["EventDate"]
+        self.t0_date = pd.Timestamp(self.date) - pd.Timedelta(hours=1)
+        self.season = season
+        self.round_number = round_number
+        self._circuit = _Circuit(season, round_number)
+        self._results: Optional[SessionResults] = None
+        self._laps: Optional[Laps] = None
+        self._car_data: Optional[Dict[str, Telemetry]] = None
+        self._pos_data: Optional[Dict[str, Telemetry]] = None
+        self._weather_data: Optional[pd.DataFrame] = None
+
+    # FastF1 exposes loaded data through properties that raise before load()
+    @property
+    def results(self) -> SessionResults:
+        return self._require(self._results, "results")
+
+    @property
+    def laps(self) -> Laps:
+        return self._require(self._laps, "laps")
+
+    @property
+    def car_data(self) -> Dict[str, Telemetry]:
+        return self._require(self._car_data, "car_data")
+
+    @property
+    def pos_data(self) -> Dict[str, Telemetry]:
+        return self._require(self._pos_data, "pos_data")
+
+    @property
+    def weather_data(self) -> pd.DataFrame:
+        return self._require(self._weather_data, "weather_data")
+
+    @property
+    def drivers(self):
+        return list(self.results["DriverNumber"].unique())
+
+    def _require(self, value, name):
+        if value is None:
+            raise DataNotLoadedError(f"The data you are trying to access has not been loaded yet: {name}")
+        return value
+
+    def get_driver(self, identifier: str) -> pd.Series:
+        results = self.results
+        mask = (results["Abbreviation"] == identifier) | (results["DriverNumber"] == identifier)
+        if not mask.any():
+            raise ValueError(f"Invalid driver identifier '{identifier}'")
+        return results[mask].iloc[0]
+
+    def load(self, *, laps: bool = True, telemetry: bool = True, weather: bool = True,
+             messages: bool = True, livedata=None) -> None:
+        rng = np.random.default_rng(_seed(self.season, self.round_number, self.session_type))
+        lap_table = self._make_laps(rng)
+        self._results = self._make_results(rng, lap_table)
+        if laps:
+            self._laps = lap_table
+        if telemetry:
+            self._car_data, self._pos_data = self._make_telemetry(rng, lap_table)
+        if weather:
+            self._weather_data = self._make_weather(rng, lap_table)
+
+    def _n_laps(self) -> int:
+        if self.session_type in ("R",):
+            return self._circuit.n_laps
+        if self.session_type == "S":
+            return self._circuit.n_laps // 3
+        return 18
+
+    def _make_laps(self, rng) -> Laps:
+        n_drivers, n_laps = len(DRIVERS), self._n_laps()
+        lap_numbers = np.arange(1, n_laps + 1)
+
+        pace = self._circuit.base_lap + np.linspace(0, 1.6, n_drivers) + rng.normal(0, 0.25, n_drivers)
+        pit_laps = np.sort(rng.integers(n_laps // 4, 3 * n_laps // 4, (n_drivers, 2)), axis=1)
+        one_stop = rng.random(n_drivers) < 0.6
+        pit_laps[one_stop, 1] = n_laps + 1
+
+        stint = 1 + (lap_numbers[None, :] > pit_laps[:, :1]) + (lap_numbers[None, :] > pit_laps[:, 1:])
+        stint_start = np.where(stint == 1, 1, np.where(stint == 2, pit_laps[:, :1] + 1, pit_laps[:, 1:] + 1))
+        tyre_life = lap_numbers[None, :] - stint_start + 1
+        degradation = rng.uniform(0.03, 0.09, (n_drivers, 1))
+        fuel = -0.055 * lap_numbers[None, :]
+        is_pit_in = lap_numbers[None, :] == pit_laps[:, :1]
+        is_pit_in |= lap_numbers[None, :] == pit_laps[:, 1:]
+        is_pit_out = np.roll(is_pit_in, 1, axis=1)
+        is_pit_out[:, 0] = False
+
+        lap_time = (pace[:, None] + fuel + degradation * tyre_life
+                    + rng.normal(0, 0.3, (n_drivers, n_laps))
+                    + 21.0 * is_pit_in + 3.0 * is_pit_out)
+        lap_time[:, 0] += 6.0
+        # Pit lane time after crossing the line on the in-lap, lost on the out-lap
+        pit_lane = rng.uniform(18.0, 24.0, (n_drivers, n_laps))
+        lap_end = lap_time.cumsum(axis=1) + RACE_START
+        lap_start = lap_end - lap_time
+        position = lap_end.argsort(axis=0).argsort(axis=0) + 1
+
+        compound_order = rng.integers(0, 3, (n_drivers, 3))
+        compound = COMPOUNDS[np.take_along_axis(compound_order, stint - 1, axis=1)]
+        personal_best = lap_time == lap_time.min(axis=1, keepdims=True)
+
+        numbers = np.array([d[0] for d in DRIVERS])
+        codes = np.array([d[1] for d in DRIVERS])
+        teams = np.array([d[4] for d in DRIVERS])
+        sectors = lap_time[..., None] * np.array([0.31, 0.37, 0.32])
+
+        def td(values):
+            return pd.to_timedelta(values.ravel(), unit="s")
+
+        frame = pd.DataFrame({
+            "Time": td(lap_end),
+            "Driver": np.repeat(codes, n_laps),
+            "DriverNumber": np.repeat(numbers, n_laps),
+            "LapTime": td(lap_time),
+            "LapNumber": np.tile(lap_numbers, n_drivers).astype(float),
+            "Stint": stint.ravel().astype(float),
+            "PitOutTime": td(np.where(is_pit_out, lap_start + pit_lane, np.nan)),
+            "PitInTime": td(np.where(is_pit_in, lap_end, np.nan)),
+            "Sector1Time": td(sectors[..., 0]),
+            "Sector2Time": td(sectors[..., 1]),
+            "Sector3Time": td(sectors[..., 2]),
+            "SpeedI1": rng.normal(290, 6, n_drivers * n_laps),
+            "SpeedI2": rng.normal(275, 6, n_drivers * n_laps),
+            "SpeedFL": rng.normal(300, 5, n_drivers * n_laps),
+            "SpeedST": rng.normal(318, 6, n_drivers * n_laps),
+            "IsPersonalBest": personal_best.ravel(),
+            "Compound": compound.ravel(),
+            "TyreLife": tyre_life.ravel().astype(float),
+            "FreshTyre": True,
+            "Team": np.repeat(teams, n_laps),
+            "LapStartTime": td(lap_start),
+            "LapStartDate": self.t0_date + td(lap_start),
+            "TrackStatus": "1",
+            "Position": position.ravel().astype(float),
+            "Deleted": False,
+            "IsAccurate": ~(is_pit_in | is_pit_out).ravel(),
+        })
+        return Laps(frame, session=self)
+
+    def _make_results(self, rng, laps: Laps) -> SessionResults:
+        finish = laps.groupby("DriverNumber", sort=False)["Time"].max()
+        retired = pd.Series(rng.random(len(DRIVERS)) < 0.08, index=[d[0] for d in DRIVERS])
+        # Retirements are classified behind every finisher
+        order = pd.DataFrame({"retired": retired, "finish": finish}).sort_values(["retired", "finish"]).index
+        position_of = {number: index + 1 for index, number in enumerate(order)}
+        winner_time = finish[order[0]]
+        race_start = pd.Timedelta(seconds=RACE_START)
+        scoring = self.session_type in ("R", "S")
+        # Knockout qualifying: everyone sets a Q1 time, the top 15 a Q2 time, the top 10 a Q3 time
+        knockout = self.session_type in ("Q", "SQ")
+        best_lap = laps.groupby("DriverNumber", sort=False)["LapTime"].min()
+
+        rows = []
+        for number, code, first, last_name, team in DRIVERS:
+            position = position_of[number]
+            dnf = bool(retired[number])
+            rows.append({
+                "DriverNumber": number,
+                "BroadcastName": f"{first[0]} {last_name.upper()}",
+                "Abbreviation": code,
+                "DriverId": last_name.lower(),
+                "TeamName": team,
+                "TeamId": team.lower().replace(" ", "_"),
+                "FirstName": first,
+                "LastName": last_name,
+                "FullName": f"{first} {last_name}",
+                "Position": float(position),
+                "ClassifiedPosition": "R" if dnf else str(position),
+                "GridPosition": float(rng.integers(1, len(DRIVERS) + 1)),
+                "Time": pd.NaT if dnf else finish[number] - (winner_time if position > 1 else race_start),
+                "Status": "Retired" if dnf else "Finished",
+                "Points": float(POINTS[position - 1]) if scoring and not dnf else 0.0,
+                "Q1": best_lap[number] + pd.Timedelta(seconds=0.8) if knockout else pd.NaT,
+                "Q2": best_lap[number] + pd.Timedelta(seconds=0.4) if knockout and position <= 15 else pd.NaT,
+                "Q3": best_lap[number] if knockout and position <= 10 else pd.NaT,
+            })
+        frame = pd.DataFrame(rows).sort_values("Position").reset_index(drop=True)
+        return SessionResults(frame)
+
+    def _make_telemetry(self, rng, laps: Laps):
+        circuit = self._circuit
+        car_data, pos_data = {}, {}
+        for number, driver_laps in laps.groupby("DriverNumber", sort=False):
+            start = driver_laps["LapStartTime"].dt.total_seconds().to_numpy()
+            end = driver_laps["Time"].dt.total_seconds().to_numpy()
+            t = np.arange(start[0], end[-1], 1 / SAMPLE_HZ)
+            lap_index = np.searchsorted(end, t, side="right").clip(max=len(end) - 1)
+            fraction = (t - start[lap_index]) / (end[lap_index] - start[lap_index])
+
+            speed = circuit.speed_at(fraction) * rng.normal(1.0, 0.01, t.size)
+            accel = np.gradient(speed)
+            throttle = np.clip(50 + accel * 25 + (speed - 200) / 2.5, 0, 100)
+            brake = accel < -4
+            gear = np.clip((speed / 42).astype(np.int64) + 1, 1, 8)
+            rpm = np.clip(speed / gear * 170 + 6000, 4000, 12500)
+            drs = np.where((speed > 290) & (lap_index > 1), 12, 1)
+            session_time = pd.to_timedelta(t, unit="s")
+
+            car_data[number] = Telemetry({
+                "Date": self.t0_date + session_time,
+                "SessionTime": session_time,
+                "Time": session_time - session_time[0],
+                "RPM": rpm,
+                "Speed": speed,
+                "nGear": gear,
+                "Throttle": throttle,
+                "Brake": brake,
+                "DRS": drs,
+                "Source": "car",
+            }, session=self, driver=number)
+
+            x, y = circuit.position_at(fraction)
+            pos_data[number] = Telemetry({
+                "Date": self.t0_date + session_time,
+                "SessionTime": session_time,
+                "Time": session_time - session_time[0],
+                "X": x,
+                "Y": y,
+                "Z": np.zeros(t.size),
+                "Status": "OnTrack",
+                "Source": "pos",
+            }, session=self, driver=number)
+        return car_data, pos_data
+
+    def _make_weather(self, rng, laps: Laps) -> pd.DataFrame:
+        end = laps["Time"].max().total_seconds()
+        minutes = np.arange(0, end, 60.0)
+        return pd.DataFrame({
+            "Time": pd.to_timedelta(minutes, unit="s"),
+            "AirTemp": 24 + rng.normal(0, 0.3, minutes.size).cumsum() * 0.1,
+            "Humidity": rng.uniform(40, 60, minutes.size),
+            "Pressure": rng.normal(1010, 1, minutes.size),
+            "Rainfall": False,
+            "TrackTemp": 38 + rng.normal(0, 0.4, minutes.size).cumsum() * 0.1,
+            "WindDirection": rng.integers(0, 360, minutes.size),
+            "WindSpeed": rng.uniform(0, 4, minutes.size),
+        })
+
+
+def get_event_schedule(year: int, **kwargs) -> pd.DataFrame:
+    """Synthetic replacement for `fastf1.get_event_schedule`"""
+    return make_schedule(year)
+
+
+def get_session(year: int, gp, identifier="R", **kwargs) -> SyntheticSession:
+    """Synthetic replacement for `fastf1.get_session`"""
+    schedule = make_schedule(year)
+    event = schedule.loc[schedule["RoundNumber"] == int(gp)]
+    if event.empty:
+        raise ValueError(f"Invalid round: {gp}")
+    if SESSION_IDENTIFIERS.get(identifier, identifier) not in SESSION_NAMES[event.iloc[0]["EventFormat"]]:
+        raise ValueError(f"Session type '{identifier}' does not exist for this event")
+    return SyntheticSession(year, int(gp), identifier, event.iloc[0])
+
+
+@contextmanager
+def synthetic_fastf1():
+    """Route `fastf1.get_event_schedule`/`get_session` to the synthetic generator"""
+    with mock.patch.object(fastf1, "get_event_schedule", get_event_schedule), \
+            mock.patch.object(fastf1, "get_session", get_session):
+        yield
@@ -0,0 +1,33 @@
+"""
+Shared test fixtures
+"""
+
+import asyncio
+
+import pytest
+from app.core.admission import admission
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.results_store import results_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    """Every test client shares one address, so start each test with full token buckets"""
+    for lane in admission.lanes.values():
+        lane.reset_clients()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_databases(tmp_path, monkeypatch):
+    """Keep the cache, results and coordination databases in each test's temporary directory"""
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'f1_dashboard.db'}")
+    monkeypatch.setattr(settings, "coordination_db_path", str(tmp_path / "coordination.db"))
+    monkeypatch.setattr(cache_service, "db_path", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache_service, "_initialized", False)
+    cache_service.drop_hot({"prefix": ""})
+    asyncio.run(results_store.dispose())
+    yield
+    cache_service.drop_hot({"prefix": ""})
+    asyncio.run(results_store.dispose())
@@ -0,0 +1,207 @@
+"""
+Test admission control lanes, token buckets and load shedding
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.admission import AdmissionRejected, Lane, TokenBucket, admission
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.fastf1_service import FastF1Service
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    now = bucket.updated
+    assert bucket.take(now) == (True, 0.0)
+    assert bucket.take(now) == (True, 0.0)
+
+    allowed, retry_after = bucket.take(now)
+    assert not allowed and retry_after == pytest.approx(0.5)
+    assert bucket.take(now + 0.5)[0]
+
+
+def test_lane_sheds_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        lane = Lane("test", concurrency=1, max_queue=1, timeout=0.1)
+        await lane.acquire()
+
+        waiter = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert lane.queued == 1
+
+        with pytest.raises(AdmissionRejected) as full:
+            await lane.acquire()
+        assert full.value.status_code == 503 and full.value.reason == "queue_full"
+
+        with pytest.raises(AdmissionRejected) as late:
+            await waiter
+        assert late.value.reason == "timeout" and "Retry-After" in late.value.headers
+
+        lane.release()
+        assert lane.active == 0 and lane.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_user_requests_get_ahead_of_background_work():
+    """Background waiters queue behind users and never take the last slot"""
+    async def scenario():
+        lane = Lane("test", concurrency=2, max_queue=4, timeout=5)
+        granted = []
+
+        async def enter(name, background):
+            await lane.acquire(background)
+            granted.append(name)
+
+        await enter("warmup-1", True)
+        backlog = [asyncio.create_task(enter(f"warmup-{i}", True)) for i in (2, 3)]
+        await asyncio.sleep(0)
+        # The second slot stays free for users
+        assert lane.stats()["background_queued"] == 2 and lane.active == 1
+
+        await enter("user-1", False)
+        user = asyncio.create_task(enter("user-2", False))
+        await asyncio.sleep(0)
+        assert lane.queued == 1
+
+        lane.release(background=True)
+        await asyncio.sleep(0.01)
+        assert granted == ["warmup-1", "user-1", "user-2"]
+
+        lane.release()
+        lane.release()
+        await asyncio.sleep(0.01)
+        assert granted[3:] == ["warmup-2"]
+        assert lane.stats()["background_active"] == 1
+        lane.release(background=True)
+        await asyncio.gather(user, *backlog)
+        assert granted[4:] == ["warmup-3"]
+        lane.release(background=True)
+        assert lane.active == 0 and lane.stats()["background_active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_lane_hands_slots_across_event_loops():
+    """A slot released on one thread's loop wakes a waiter parked on another"""
+    lane = Lane("test", concurrency=1, max_queue=4, timeout=5)
+    order = []
+
+    async def hold():
+        await lane.acquire()
+        order.append("held")
+        await asyncio.sleep(0.1)
+        lane.release()
+
+    async def wait():
+        await asyncio.sleep(0.02)
+        await lane.acquire()
+        order.append("granted")
+        lane.release()
+
+    threads = [threading.Thread(target=asyncio.run, args=(coro(),)) for coro in (hold, wait)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["held", "granted"]
+    assert lane.active == 0
+
+
+def test_memory_limit_caps_cold_concurrency():
+    lane = Lane("cold", concurrency=4, max_queue=4, timeout=1, limit=lambda: 0)
+    assert lane.limit == 1
+    lane = Lane("cold", concurrency=4, max_queue=4, timeout=1, limit=lambda: 2)
+    assert lane.limit == 2
+
+
+def test_cached_reads_are_served_while_a_cold_load_runs(monkeypatch):
+    """Cold loads run off the event loop, so cache hits don't queue behind them"""
+    monkeypatch.setattr(settings, "enable_cache", True)
+    race = {
+        "season": 2031, "round": 1, "race_name": "Test Grand Prix",
+        "circuit_name": "Test", "date": "2031-03-01T15:00:00"
+    }
+    asyncio.run(cache_service.set("races_v2_2031", [race], ttl_hours=1))
+    asyncio.run(cache_service.delete("race_results_2031_1"))
+    started, finish = threading.Event(), threading.Event()
+
+    async def slow_results(season, round_number):
+        started.set()
+        finish.wait(timeout=10)
+        return None
+
+    monkeypatch.setattr(FastF1Service, "get_race_results", slow_results)
+
+    cold = {}
+    thread = threading.Thread(target=lambda: cold.update(response=client.get("/api/race/2031/1/results")))
+    thread.start()
+    try:
+        assert started.wait(timeout=5)
+        begin = time.perf_counter()
+        response = client.get("/api/races/2031")
+        elapsed = time.perf_counter() - begin
+        assert response.status_code == 200
+        assert elapsed < 1.0
+        assert admission.lanes["cold"].active == 1
+    finally:
+        finish.set()
+        thread.join(timeout=10)
+
+    assert cold["response"].status_code == 404
+    assert admission.lanes["cold"].active == 0
+
+
+def test_expensive_lanes_rate_limit_each_client(monkeypatch):
+    lane = admission.lanes["cold"]
+    monkeypatch.setattr(lane, "rate", 1 / 60)
+    monkeypatch.setattr(lane, "burst", 1)
+    lane.reset_clients()
+
+    async def no_results(season, round_number):
+        return None
+
+    monkeypatch.setattr(FastF1Service, "get_race_results", no_results)
+    monkeypatch.setattr(settings, "enable_cache", False)
+
+    assert client.get("/api/race/2031/2/results").status_code == 404
+    response = client.get("/api/race/2031/2/results")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Probes are never admission controlled
+    assert client.get("/health").status_code == 200
+
+
+def test_clients_pay_once_per_admitted_request(monkeypatch):
+    """Shed requests get their token back, and a request running several loads pays once"""
+    lane = admission.lanes["cold"]
+    monkeypatch.setattr(lane, "rate", 1 / 60)
+    monkeypatch.setattr(lane, "burst", 1)
+    monkeypatch.setattr(lane, "concurrency", 8)
+    monkeypatch.setattr(lane, "_limit", None)
+    monkeypatch.setattr(settings, "enable_cache", False)
+    lane.reset_clients()
+
+    # Refused for memory after admission: not charged
+    monkeypatch.setattr(settings, "memory_budget_mb", 1)
+    with synthetic_fastf1():
+        for _ in range(2):
+            assert client.get("/api/race/2024/1/results").status_code == 503
+    monkeypatch.setattr(settings, "memory_budget_mb", 0)
+
+    # The track map and the lap telemetry are two cold loads on one token
+    with synthetic_fastf1():
+        response = client.get("/api/race/2024/1/track/telemetry", params={"driver": "VER"})
+        assert response.status_code == 200
+        assert client.get("/api/race/2024/1/results").status_code == 429
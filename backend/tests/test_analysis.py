@@ -0,0 +1,88 @@
+"""
+Test lap comparison analysis
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.analysis_service import AnalysisService
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+def test_delta_time_for_constant_speeds():
+    """A driver 10 m/s slower loses time linearly and in every mini-sector"""
+    distance = np.arange(1.0, 1001.0, 5.0)
+    grid, drivers, sectors = AnalysisService.compare(
+        ["A", "B"],
+        distances=[distance, distance],
+        times=[distance / 50, distance / 40],
+        speeds=[np.full(distance.size, 180.0), np.full(distance.size, 144.0)],
+        grid_step=10,
+        n_sectors=4
+    )
+
+    assert grid[0] == 0.0 and grid[-1] == 990.0
+    assert drivers[0].delta == [0.0] * len(grid)
+    assert drivers[1].final_delta == pytest.approx(990 / 40 - 990 / 50, abs=1e-3)
+    assert all(sector.fastest == "A" for sector in sectors)
+    assert sum(sector.gains[1] for sector in sectors) == pytest.approx(-drivers[1].final_delta, abs=1e-2)
+
+
+def test_compare_endpoint(monkeypatch):
+    """The endpoint aligns the requested drivers' laps on one grid"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    with synthetic_fastf1():
+        response = client.get("/api/race/2024/1/compare", params={"drivers": "VER,HAM,LEC", "laps": "10"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["reference"] == "VER"
+    assert [driver["lap_number"] for driver in data["drivers"]] == [10, 10, 10]
+    assert all(len(driver["delta"]) == len(data["distance"]) for driver in data["drivers"])
+    assert len(data["mini_sectors"]) == 25
+
+
+def test_compare_endpoint_validates_drivers():
+    assert client.get("/api/race/2024/1/compare", params={"drivers": "VER"}).status_code == 400
+    response = client.get("/api/race/2024/1/compare", params={"drivers": "VER,HAM", "laps": "1,2,3"})
+    assert response.status_code == 400
+
+
+def test_car_data_summary_reductions():
+    """Per-driver statistics match hand-computed values for simple traces"""
+    time = np.arange(0.0, 10.0, 1.0)
+    stats = AnalysisService.summarize_car_data(
+        times=[time, time[:5]],
+        speeds=[np.linspace(100, 300, 10), np.full(5, 200.0)],
+        throttles=[np.where(time < 5, 100.0, 50.0), np.full(5, 100.0)],
+        brakes=[np.array([0, 1, 1, 0, 0, 1, 0, 1, 1, 0], dtype=bool), np.zeros(5, dtype=bool)],
+        drs=[np.array([1, 12, 12, 1, 1, 1, 1, 1, 14, 14]), np.full(5, 1)]
+    )
+
+    assert stats["top_speed"].tolist() == [300.0, 200.0]
+    # Nine one-second intervals for driver 0, five of them at full throttle
+    assert stats["full_throttle_pct"][0] == pytest.approx(500 / 9)
+    assert stats["full_throttle_pct"][1] == pytest.approx(100.0)
+    assert stats["braking_zones"].tolist() == [3, 0]
+    assert stats["drs_activations"].tolist() == [2, 0]
+
+
+def test_telemetry_summary_endpoint(monkeypatch):
+    """The whole field is summarized in finishing order without shipping raw traces"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    with synthetic_fastf1():
+        response = client.get("/api/race/2024/1/telemetry/summary")
+        results = client.get("/api/race/2024/1/results").json()
+
+    assert response.status_code == 200
+    drivers = response.json()["drivers"]
+    assert [d["driver"] for d in drivers] == [r["driver"]["code"] for r in results["results"]]
+    for summary in drivers:
+        assert summary["top_speed"] >= summary["average_speed"] > 0
+        assert 0 < summary["full_throttle_pct"] < 100
+        assert summary["braking_zones"] >= summary["laps"] > 0
+        assert summary["speed_trap"] is not None
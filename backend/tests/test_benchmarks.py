@@ -0,0 +1,68 @@
+"""
+Test the synthetic FastF1 stand-in and benchmark report comparison
+"""
+
+import asyncio
+import os
+
+import pytest
+from benchmarks.run import _endpoints, compare_reports, run_benchmarks
+from benchmarks.synthetic import get_session, make_schedule, synthetic_fastf1
+from app.core.config import settings
+from app.services.fastf1_service import FastF1Service
+
+
+def test_synthetic_data_is_deterministic_and_realistically_sized():
+    """The same season/round always yields the same full-size session"""
+    assert len(make_schedule(2024)) == 24
+
+    first, second = get_session(2024, 3, "R"), get_session(2024, 3, "R")
+    first.load()
+    second.load()
+
+    assert len(first.drivers) == 20
+    assert 50 <= first.laps["LapNumber"].max() <= 72
+    assert first.laps["LapTime"].equals(second.laps["LapTime"])
+
+    # ~4 Hz car data across the whole race
+    car_data = first.car_data["1"]
+    duration = car_data["SessionTime"].iloc[-1] - car_data["SessionTime"].iloc[0]
+    assert abs(len(car_data) / duration.total_seconds() - 4) < 0.1
+
+
+def test_service_runs_against_synthetic_session():
+    """FastF1Service loaders work end to end without network access"""
+    with synthetic_fastf1():
+        results = asyncio.run(FastF1Service.get_race_results(2024, 1))
+        telemetry = asyncio.run(FastF1Service.get_race_telemetry(2024, 1))
+
+    assert len(results.results) == 20
+    assert results.results[0].position == 1
+    assert len(telemetry.drivers_telemetry) == 20
+    distances = [point.distance for point in telemetry.drivers_telemetry[0].telemetry]
+    assert distances == sorted(distances) and distances[-1] > 1000
+
+
+def test_compare_reports_flags_regressions():
+    baseline = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    current = {"results": {"a": {"median_ms": 11.0}, "b": {"median_ms": 20.0}, "c": {"median_ms": 1.0}}}
+
+    rows = {row["name"]: row for row in compare_reports(baseline, current, threshold=0.25)}
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"]
+
+
+def test_benchmark_suite_runs(tmp_path, monkeypatch):
+    """The whole suite runs, times every endpoint and leaves the settings as they were"""
+    monkeypatch.chdir(tmp_path)
+    database_url = settings.database_url
+
+    report = run_benchmarks(repeat=1)
+
+    names = set(report["results"])
+    for endpoint in _endpoints():
+        assert {f"endpoint.{endpoint}.cold", f"endpoint.{endpoint}.warm"} <= names
+    assert {"simulation.race.10_drivers", "simulation.race.20_drivers"} <= names
+    assert settings.database_url == database_url
+    assert not [name for name in os.listdir(tmp_path) if name.endswith((".db", ".db-wal", ".db-shm"))]
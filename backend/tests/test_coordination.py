@@ -0,0 +1,126 @@
+"""
+Test cross-worker coordination and the cache hot set
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.coordination_service import Coordinator
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def coordination_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "coordination.db")
+    monkeypatch.setattr(settings, "coordination_db_path", path)
+    monkeypatch.setattr(settings, "enable_cache", True)
+    return path
+
+
+def test_events_reach_other_workers_only(coordination_db):
+    first, second = Coordinator(), Coordinator()
+    received = {"first": [], "second": []}
+    first.subscribe("cache_invalidate", received["first"].append)
+    second.subscribe("cache_invalidate", received["second"].append)
+    first.poll()
+    second.poll()
+
+    assert first.publish("cache_invalidate", {"keys": ["races_2024"]})
+    assert first.poll() == 0
+    assert second.poll() == 1
+    assert second.poll() == 0
+
+    assert received == {"first": [], "second": [{"keys": ["races_2024"]}]}
+    first.stop()
+    second.stop()
+
+
+def test_hot_entries_are_dropped_by_invalidation(coordination_db):
+    asyncio.run(cache_service.set("standings_2031", {"round": 1}))
+    assert asyncio.run(cache_service.get("standings_2031")) == {"round": 1}
+
+    cache_service.drop_hot({"prefix": "standings_"})
+    assert "standings_2031" not in cache_service._hot
+
+    # The next read refills the hot set from the shared database
+    assert asyncio.run(cache_service.get("standings_2031")) == {"round": 1}
+    assert "standings_2031" in cache_service._hot
+    asyncio.run(cache_service.invalidate("standings_2031"))
+    assert asyncio.run(cache_service.get("standings_2031")) is None
+
+
+def test_invalidation_from_another_process(coordination_db):
+    """A write in one worker process replaces the hot copy held by another"""
+    coordinator = Coordinator(poll_ms=20)
+    coordinator.subscribe("cache_invalidate", cache_service.drop_hot)
+    coordinator.start()
+    try:
+        asyncio.run(cache_service.set("races_2031", [{"round": 1}]))
+        assert asyncio.run(cache_service.get("races_2031")) == [{"round": 1}]
+
+        script = (
+            "import asyncio\n"
+            "from app.services.cache_service import cache_service\n"
+            f"cache_service.db_path = {cache_service.db_path!r}\n"
+            "asyncio.run(cache_service.set('races_2031', [{'round': 2}]))\n"
+        )
+        env = dict(os.environ, COORDINATION_DB_PATH=coordination_db)
+        subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, check=True, timeout=60)
+
+        deadline = time.monotonic() + 5
+        while asyncio.run(cache_service.get("races_2031")) != [{"round": 2}]:
+            assert time.monotonic() < deadline, "invalidation was not applied"
+            time.sleep(0.02)
+    finally:
+        coordinator.stop()
+        asyncio.run(cache_service.delete("races_2031"))
+
+
+def test_model_reload_drops_predictions_after_reloading(coordination_db, monkeypatch):
+    """Predictions cached before a worker picks up new artifacts are dropped once it has"""
+    from app import main
+
+    publisher, worker = Coordinator(), Coordinator()
+    worker.subscribe("model_reload", main.reload_model)
+    worker.poll()
+
+    reloaded = []
+    monkeypatch.setattr(main.ml_service, "reload", lambda: reloaded.append(True))
+    assert publisher.publish("model_reload")
+
+    # Cached by this worker from its old model after the publisher invalidated
+    asyncio.run(cache_service.set("predict_2031_1_race_stale", {"model": "old"}))
+    assert worker.poll() == 1
+    assert reloaded == [True]
+    assert asyncio.run(cache_service.get("predict_2031_1_race_stale")) is None
+    publisher.stop()
+    worker.stop()
+
+
+def test_reads_racing_an_invalidation_are_not_kept_hot(coordination_db, monkeypatch):
+    import json
+    from app.services import cache_service as cache_module
+
+    asyncio.run(cache_service.set("standings_2032", {"round": 1}))
+    cache_service.drop_hot({"prefix": "standings_"})
+
+    class InvalidatedWhileDecoding:
+        @staticmethod
+        def loads(value):
+            cache_service.drop_hot({"keys": ["standings_2032"]})
+            return json.loads(value)
+
+    monkeypatch.setattr(cache_module, "json", InvalidatedWhileDecoding)
+    assert asyncio.run(cache_service.get("standings_2032")) == {"round": 1}
+    assert "standings_2032" not in cache_service._hot
+
+    monkeypatch.setattr(cache_module, "json", json)
+    assert asyncio.run(cache_service.get("standings_2032")) == {"round": 1}
+    assert "standings_2032" in cache_service._hot
@@ -0,0 +1,132 @@
+"""
+Test the bounded FastF1 disk cache manager
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services import fastf1_service
+from app.services.disk_cache_service import FastF1CacheManager, fastf1_cache
+from app.services.results_store import results_store
+
+client = TestClient(app)
+
+MB = 1024 * 1024
+SESSIONS = {
+    # relative path: (round, session name, size in MB, hours since last load)
+    "2024/2024-03-02_Bahrain_Grand_Prix/2024-03-02_Race": (1, "Race", 4, 10),
+    "2024/2024-03-02_Bahrain_Grand_Prix/2024-03-01_Qualifying": (1, "Qualifying", 2, 30),
+    "2024/2024-03-09_Saudi_Arabian_Grand_Prix/2024-03-09_Race": (2, "Race", 4, 20),
+    "2024/2024-03-24_Australian_Grand_Prix/2024-03-24_Race": (3, "Race", 4, 1),
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """A FastF1-shaped cache directory with an index entry per session"""
+    monkeypatch.setattr(settings, "fastf1_cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "fastf1_cache_min_idle_minutes", 0)
+    manager = FastF1CacheManager()
+    now = time.time()
+    for relative, (round_number, name, size, _) in SESSIONS.items():
+        os.makedirs(tmp_path / relative)
+        with open(tmp_path / relative / "timing_app_data.ff1pkl", "wb") as f:
+            f.write(b"\0" * size * MB)
+        session = SimpleNamespace(api_path=f"/static/{relative}/", name=name)
+        manager.record_access(session, 2024, round_number)
+
+    # Backdate the recorded loads
+    conn = manager._index()
+    for relative, (_, _, _, hours) in SESSIONS.items():
+        conn.execute("UPDATE sessions SET last_access = ? WHERE path = ?", (now - hours * 3600, relative))
+    conn.commit()
+    conn.close()
+    return tmp_path, manager
+
+
+def test_scan_reports_each_session(cache_dir):
+    _, manager = cache_dir
+    sessions = {s.path: s for s in manager.scan({(2024, 2)})}
+
+    assert set(sessions) == set(SESSIONS)
+    race = sessions["2024/2024-03-09_Saudi_Arabian_Grand_Prix/2024-03-09_Race"]
+    assert (race.season, race.round, race.bytes, race.files, race.processed) == (2024, 2, 4 * MB, 1, True)
+    assert not sessions["2024/2024-03-02_Bahrain_Grand_Prix/2024-03-02_Race"].processed
+
+
+def test_eviction_keeps_processed_sessions_and_evicts_least_recently_used(cache_dir):
+    path, manager = cache_dir
+    sessions = manager.scan({(2024, 2)})
+
+    # 14 MB cached, capped at 10 MB: evict down to 9 MB
+    evicted = manager.evict(sessions, 10 * MB)
+
+    assert [s.path for s in evicted] == [
+        "2024/2024-03-02_Bahrain_Grand_Prix/2024-03-01_Qualifying",  # coldest
+        "2024/2024-03-02_Bahrain_Grand_Prix/2024-03-02_Race",
+    ]
+    assert not (path / "2024/2024-03-02_Bahrain_Grand_Prix").exists()
+    assert {s.path for s in manager.scan()} == {
+        "2024/2024-03-09_Saudi_Arabian_Grand_Prix/2024-03-09_Race",  # stored elsewhere, though colder
+        "2024/2024-03-24_Australian_Grand_Prix/2024-03-24_Race",
+    }
+    assert manager.evict(manager.scan(), 10 * MB) == []
+
+
+def test_recently_loaded_sessions_are_kept(cache_dir, monkeypatch):
+    _, manager = cache_dir
+    monkeypatch.setattr(settings, "fastf1_cache_min_idle_minutes", 5 * 60)
+
+    evicted = manager.evict(manager.scan(), 1 * MB)
+    assert [s.round for s in evicted] == [1, 2, 1]
+    assert [s.path for s in manager.scan()] == ["2024/2024-03-24_Australian_Grand_Prix/2024-03-24_Race"]
+
+
+def test_sessions_being_loaded_are_not_evicted(cache_dir, monkeypatch):
+    path, manager = cache_dir
+    monkeypatch.setattr(settings, "fastf1_cache_min_idle_minutes", 5)
+    relative = "2024/2024-03-09_Saudi_Arabian_Grand_Prix/2024-03-09_Race"
+    evicted = []
+
+    def load(**parts):
+        # A compaction pass runs while the (long idle) session is loading
+        evicted.extend(manager.evict(manager.scan({(2024, 2)}), 1 * MB))
+        assert (path / relative).exists()
+
+    session = SimpleNamespace(api_path=f"/static/{relative}/", name="Race", load=load)
+    monkeypatch.setattr(fastf1_service, "fastf1_cache", manager)
+    fastf1_service.load_session(session, 2024, 2, laps=False, telemetry=False, weather=False, messages=False)
+
+    assert relative not in {s.path for s in evicted}
+    assert (path / relative).exists()
+
+
+def test_admin_usage_endpoint(cache_dir, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "fastf1_cache_max_mb", 10)
+
+    async def stored_events():
+        return {(2024, 1)}
+
+    monkeypatch.setattr(results_store, "stored_events", stored_events)
+
+    response = client.get("/admin/fastf1-cache", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_bytes"] == 14 * MB and data["max_bytes"] == 10 * MB
+    season = data["seasons"]["2024"]
+    assert season["bytes"] == 14 * MB and len(season["sessions"]) == 4
+    assert [s["processed"] for s in season["sessions"] if s["round"] == 1] == [False, True]
+
+    response = client.post("/admin/fastf1-cache/compact", headers={"X-Admin-Token": "secret"})
+    assert response.json()["evicted"] == [
+        "2024/2024-03-02_Bahrain_Grand_Prix/2024-03-01_Qualifying",
+        "2024/2024-03-09_Saudi_Arabian_Grand_Prix/2024-03-09_Race",
+    ]
+    assert asyncio.run(fastf1_cache.usage())["total_bytes"] == 8 * MB
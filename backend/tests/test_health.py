@@ -2,6 +2,10 @@
 Test health endpoint
 """
 
+import subprocess
+import sys
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -24,3 +28,27 @@ def test_root_endpoint():
     assert "message" in data
     assert "version" in data
     assert data["message"] == "F1 Dashboard API"
+
+
+def test_ready_endpoint_after_startup():
+    """Readiness flips to ready once deferred initialization finishes"""
+    with TestClient(app) as started:
+        for _ in range(200):
+            response = started.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert set(data["components"]) >= {"cache", "fastf1", "ml_model"}
+
+
+def test_app_import_defers_heavy_modules():
+    """Importing the app must not pull in FastF1, pandas or scikit-learn"""
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('fastf1', 'pandas', 'sklearn', 'joblib') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,160 @@
+"""
+Test the normalized results store and history endpoints
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.admission import admission
+from app.core.config import settings
+from app.models.race import Constructor, Driver, Race, RaceResult, RaceResults
+from app.services.fastf1_service import FastF1Service
+from app.services.results_store import async_database_url, results_store
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point the results store at an empty database and load a few synthetic races"""
+    path = tmp_path / "f1.db"
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{path}")
+    monkeypatch.setattr(settings, "enable_cache", False)
+    asyncio.run(results_store.dispose())
+
+    loaded = {}
+    with synthetic_fastf1():
+        for season in (2023, 2024):
+            for round_number in (1, 2, 3):
+                response = client.get(f"/api/race/{season}/{round_number}/results")
+                loaded[season, round_number] = response.json()["results"]
+
+    yield path, loaded
+    asyncio.run(results_store.dispose())
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./f1.db") == "sqlite+aiosqlite:///./f1.db"
+    assert async_database_url("postgresql://u@h/db") == "postgresql+asyncpg://u@h/db"
+    assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_driver_history_since_season(database):
+    """Results loaded through FastF1Service are queryable per driver"""
+    _, loaded = database
+    response = client.get("/api/drivers/ver/results", params={"since": 2024})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [(r["season"], r["round"]) for r in data["results"]] == [(2024, 3), (2024, 2), (2024, 1)]
+
+    expected = [
+        next(r for r in loaded[2024, round_number] if r["driver"]["code"] == "VER")
+        for round_number in (1, 2, 3)
+    ]
+    assert data["summary"]["starts"] == 3
+    assert data["summary"]["points"] == pytest.approx(sum(r["points"] for r in expected))
+    assert data["summary"]["wins"] == sum(r["position"] == 1 for r in expected)
+
+    assert client.get("/api/drivers/XXX/results").status_code == 404
+
+
+def test_head_to_head(database):
+    """Drivers and constructors are compared race by race"""
+    _, loaded = database
+    drivers = client.get("/api/head-to-head/drivers", params={"ids": "VER,HAM"}).json()
+    assert drivers["races"] == 6
+    assert sum(drivers["ahead"]) == 6
+
+    for race in drivers["results"]:
+        rows = {r["driver"]["code"]: r for r in loaded[race["season"], race["round"]]}
+        assert race["positions"] == [rows["VER"]["position"] or None, rows["HAM"]["position"] or None]
+
+    first = loaded[2024, 1][0]["constructor"]["name"]
+    second = next(r["constructor"]["name"] for r in loaded[2024, 1] if r["constructor"]["name"] != first)
+    teams = client.get("/api/head-to-head/constructors", params={"ids": f"{first},{second}", "since": 2024}).json()
+    assert teams["races"] == 3
+    assert teams["results"][-1]["ahead"] == first
+
+    assert client.get("/api/head-to-head/drivers", params={"ids": "VER"}).status_code == 400
+    assert client.get("/api/head-to-head/circuits", params={"ids": "A,B"}).status_code == 404
+
+
+def test_reused_codes_keep_drivers_apart(database):
+    """MSC names Michael until 2012 and Mick from 2021, without merging their results"""
+    def race(season, driver_id, first_name, points):
+        return RaceResults(
+            race=Race(season=season, round=1, race_name="Bahrain Grand Prix",
+                      circuit_name="Sakhir", date=f"{season}-03-01T15:00:00"),
+            results=[RaceResult(
+                position=1,
+                driver=Driver(driver_id=driver_id, first_name=first_name, last_name="Schumacher", code="MSC"),
+                constructor=Constructor(constructor_id="haas", name="Haas F1 Team", nationality=""),
+                points=points,
+                status="Finished"
+            )]
+        )
+
+    async def store():
+        assert await results_store.save_race_results(race(2004, "michael_schumacher", "Michael", 10.0))
+        assert await results_store.save_race_results(race(2021, "mick_schumacher", "Mick", 0.0))
+
+    asyncio.run(store())
+
+    latest = client.get("/api/drivers/msc/results").json()
+    assert (latest["driver"]["driver_id"], latest["driver"]["first_name"]) == ("mick_schumacher", "Mick")
+    assert latest["summary"]["starts"] == 1
+
+    earlier = client.get("/api/drivers/MSC/results", params={"until": 2012}).json()
+    assert (earlier["driver"]["first_name"], earlier["summary"]["points"]) == ("Michael", 10.0)
+    by_id = client.get("/api/drivers/michael_schumacher/results").json()
+    assert by_id["results"][0]["season"] == 2004
+
+    # Results from FastF1 are keyed on the Ergast id too
+    assert client.get("/api/drivers/verstappen/results").json()["summary"]["starts"] == 6
+
+
+def test_reloading_a_race_replaces_its_results(database):
+    """Upserts keep one row per driver per race, and lookups use the indexes"""
+    path, _ = database
+    with synthetic_fastf1():
+        asyncio.run(FastF1Service.get_race_results(2024, 1))
+    asyncio.run(results_store.dispose())
+
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 6
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 6 * 20
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM results WHERE driver_id = 'VER'"
+        ).fetchall()
+        assert "ix_results_driver_event" in " ".join(row[-1] for row in plan)
+    finally:
+        conn.close()
+
+
+def test_cold_loads_and_history_reads_share_the_request_loop(tmp_path, monkeypatch, caplog):
+    """Results stored by concurrent cold loads are read back on the same loop without errors"""
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'f1.db'}")
+    monkeypatch.setattr(settings, "enable_cache", False)
+    asyncio.run(results_store.dispose())
+
+    async def scenario():
+        loads = [admission.run_cold(FastF1Service.get_race_results, 2024, r) for r in (1, 2, 3, 4)]
+        reads = [results_store.get_driver_history("VER") for _ in range(4)] + [results_store.stored_events()]
+        await asyncio.gather(*loads, *reads)
+        stored = await results_store.stored_events()
+        history = await results_store.get_driver_history("VER")
+        await results_store.dispose()
+        return stored, history
+
+    with synthetic_fastf1():
+        stored, history = asyncio.run(scenario())
+
+    assert stored == {(2024, r) for r in (1, 2, 3, 4)}
+    assert history.summary.starts == 4
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
@@ -0,0 +1,63 @@
+"""
+Test lap-by-lap race analysis endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.fastf1_service import FastF1Service
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def synthetic_race(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", False)
+    with synthetic_fastf1():
+        yield
+
+
+def test_laps_are_paginated_by_lap_range(synthetic_race):
+    """Pages cover consecutive lap ranges for every driver"""
+    first = client.get("/api/race/2024/1/laps", params={"lap_count": 20}).json()
+    assert first["lap_numbers"] == list(range(1, 21))
+    assert len(first["drivers"]) == 20
+    assert all(len(row) == 20 for row in first["lap_times"])
+    assert first["next_start_lap"] == 21
+
+    last = client.get("/api/race/2024/1/laps", params={"start_lap": 41, "lap_count": 50}).json()
+    assert last["lap_numbers"][-1] == last["total_laps"]
+    assert last["next_start_lap"] is None
+
+    # Lap 1 positions are a permutation of the field
+    assert sorted(row[0] for row in first["positions"]) == list(range(1, 21))
+
+
+def test_stints_and_pit_stops_are_consistent(synthetic_race):
+    """Every pit stop ends a stint and stints tile each driver's race"""
+    stints = client.get("/api/race/2024/1/laps/stints").json()["stints"]
+    stops = client.get("/api/race/2024/1/laps/pitstops").json()["pit_stops"]
+
+    for driver in {stint["driver"] for stint in stints}:
+        driver_stints = [s for s in stints if s["driver"] == driver]
+        assert driver_stints[0]["start_lap"] == 1
+        for previous, current in zip(driver_stints, driver_stints[1:]):
+            assert current["start_lap"] == previous["end_lap"] + 1
+
+        stop_laps = [stop["lap"] for stop in stops if stop["driver"] == driver]
+        assert stop_laps == [s["end_lap"] for s in driver_stints[:-1]]
+
+    assert all(15 < stop["duration"] < 30 for stop in stops)
+    assert any(stint["degradation"] is not None for stint in stints)
+
+
+def test_missing_lap_data_returns_404(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", False)
+
+    async def no_laps(season, round_number):
+        return None
+
+    monkeypatch.setattr(FastF1Service, "get_lap_analysis", staticmethod(no_laps))
+    assert client.get("/api/race/2024/1/laps").status_code == 404
@@ -0,0 +1,118 @@
+"""
+Test memory accounting, the memory budget and telemetry downcasting
+"""
+
+import asyncio
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.admission import AdmissionRejected, admission
+from app.core.config import settings
+from app.core.memory import MB, memory_budget
+from app.services.cache_service import cache_service
+from app.services.fastf1_service import SESSION_PARTS, FastF1Service, get_fastf1, load_session
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    """A small memory budget with a wide cold lane, so memory is the only limit"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    monkeypatch.setattr(settings, "memory_budget_mb", 12)
+    monkeypatch.setattr(settings, "memory_load_estimate_mb", 5)
+    cold = admission.lanes["cold"]
+    monkeypatch.setattr(cold, "concurrency", 8)
+    monkeypatch.setattr(cold, "_limit", None)
+    cache_service.drop_hot({"prefix": ""})
+    memory_budget.reset()
+    yield
+    cache_service.drop_hot({"prefix": ""})
+    memory_budget.reset()
+
+
+def test_telemetry_channels_are_downcast_at_load():
+    with synthetic_fastf1():
+        session = get_fastf1().get_session(2024, 1, 'R')
+        load_session(session, 2024, 1, **SESSION_PARTS['telemetry'])
+
+    car = next(iter(session.car_data.values()))
+    pos = next(iter(session.pos_data.values()))
+    assert {column: str(car[column].dtype) for column in ("Speed", "RPM", "Throttle", "nGear", "DRS", "Brake")} == {
+        "Speed": "float32", "RPM": "float32", "Throttle": "float32",
+        "nGear": "uint8", "DRS": "uint8", "Brake": "bool",
+    }
+    assert str(pos["X"].dtype) == "float32"
+    # Distance integration still works on the compact channels
+    assert session.laps.pick_fastest().get_car_data().add_distance()["Distance"].iloc[-1] > 4000
+
+
+def test_cached_objects_are_evicted_before_loads_are_rejected(budget, monkeypatch):
+    expires_at = datetime.now() + timedelta(hours=1)
+    cache_service._remember("standings_2024_latest", [f"{i:04d}" + "x" * 1000 for i in range(3000)], expires_at)
+    assert memory_budget.stats()["components"]["cache"]["bytes"] > 3 * MB
+
+    # The cached copy makes way for a reservation that only fits without it
+    assert memory_budget.make_room(10 * MB)
+    assert memory_budget.stats()["components"]["cache"] == {"bytes": 0, "objects": 0}
+
+    async def get_everything():
+        return "loaded"
+
+    monkeypatch.setattr(settings, "memory_load_estimate_mb", 20)
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(admission.run_cold(get_everything))
+    assert (rejected.value.status_code, rejected.value.reason) == (503, "memory")
+
+    with synthetic_fastf1():
+        response = client.get("/api/race/2024/1/sessions/R/telemetry")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def test_admin_memory_endpoint(budget, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    with synthetic_fastf1():
+        assert client.get("/api/race/2024/1/sessions/Q/results").status_code == 200
+
+    data = client.get("/admin/memory", headers={"X-Admin-Token": "secret"}).json()
+    assert data["budget_bytes"] == 12 * MB
+    assert data["components"]["loads"] == {"bytes": 0, "objects": 0}
+    # Results-only loads are measured far below the default reservation
+    assert 0 < data["load_estimates"]["get_session_results"] < 5 * MB
+    assert data["peak_bytes"] <= data["budget_bytes"]
+
+
+def test_peak_memory_stays_within_budget_under_synthetic_load(budget):
+    async def burst(rounds):
+        return await asyncio.gather(
+            *(admission.run_cold(FastF1Service.get_lap_analysis, 2024, r) for r in rounds),
+            return_exceptions=True
+        )
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        with synthetic_fastf1():
+            first = asyncio.run(burst(range(1, 9)))
+            # Measured loads reserve their learned size instead of the default
+            second = asyncio.run(burst(range(9, 17)))
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    for results in (first, second):
+        loaded = [r for r in results if not isinstance(r, Exception)]
+        rejected = [r for r in results if isinstance(r, AdmissionRejected)]
+        assert len(loaded) >= 2 and len(loaded) + len(rejected) == 8
+        assert all(r.reason == "memory" for r in rejected)
+
+    budget_bytes = memory_budget.budget_bytes
+    assert memory_budget.peak_bytes <= budget_bytes
+    assert peak <= budget_bytes
+    assert memory_budget.load_estimate("get_lap_analysis") < 5 * MB
+    assert memory_budget.stats()["components"]["loads"]["bytes"] == 0
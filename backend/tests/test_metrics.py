@@ -0,0 +1,70 @@
+"""
+Test metrics collection and the /metrics endpoint
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.metrics import Counter, Histogram, MetricsRegistry, cache_key_family
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_reports_route_latency():
+    """Requests are recorded per route template in Prometheus text format"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert "# TYPE f1_http_request_duration_seconds histogram" in body
+    assert 'f1_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "f1_http_requests_in_flight" in body
+
+
+def test_prediction_records_inference_and_cache_metrics():
+    """ML inference time and prediction cache lookups are exported"""
+    client.post("/api/predict", json={"season": 2024, "round": 3, "session_type": "qualifying"})
+    body = client.get("/metrics").text
+    assert "# TYPE f1_ml_inference_duration_seconds histogram" in body
+    assert "f1_ml_inference_in_flight 0" in body
+    assert 'f1_cache_requests_total{family="predict"' in body
+
+
+def test_histogram_buckets_are_cumulative():
+    """Bucket counts accumulate up to +Inf and match the sample count"""
+    histogram = Histogram("test_latency_seconds", "Test", buckets=(0.1, 1.0), registry=MetricsRegistry())
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_latency_seconds_count 3" in lines
+
+
+def test_labelled_children_are_reused():
+    """Recording the same labels twice updates a single child"""
+    counter = Counter("test_total", "Test", ("family",), registry=MetricsRegistry())
+    assert counter.labels("races") is counter.labels("races")
+    counter.labels("races").inc()
+    counter.labels("races").inc()
+    assert 'test_total{family="races"} 2' in counter.render()
+
+
+@pytest.mark.parametrize("key,family", [
+    ("races_2024", "races"),
+    ("races_v2_2024", "races"),
+    ("race_results_2024_1", "race_results"),
+    ("race_telemetry_2024_1_1", "race_telemetry"),
+    ("standings_2024_latest", "standings"),
+    ("predict_2024_1_race_Dry", "predict"),
+    ("race_summary_2024_1", "race_summary"),
+    ("session_results_2024_5_SQ", "session_results"),
+    ("something_else", "other"),
+])
+def test_cache_key_family(key, family):
+    assert cache_key_family(key) == family
@@ -5,6 +5,12 @@ Test prediction endpoints
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api.routes_predict import ml_service
+from app.core.config import settings
+from app.models.predict import PredictRequest
+from app.models.race import Driver
+from app.services.cache_service import cache_service
+from app.services.ml_service import MLService
 
 client = TestClient(app)
 
@@ -55,3 +61,88 @@ def test_predict_race():
     data = response.json()
     assert data["session_type"] == "race"
     assert "predictions" in data
+
+
+def make_request(**overrides):
+    values = {"season": 2024, "round": 5, "session_type": "qualifying"}
+    values.update(overrides)
+    return PredictRequest(**values)
+
+
+def test_fingerprint_covers_quantized_inputs(monkeypatch):
+    """Temperatures within one quantization step share a key; every other input changes it"""
+    monkeypatch.setattr(settings, "prediction_temperature_step", 1.0)
+
+    def key(**overrides):
+        return ml_service.fingerprint(ml_service.canonicalize(make_request(**overrides)))
+
+    base = key(track_temperature=24.6, air_temperature=20.2)
+    assert key(track_temperature=25.4, air_temperature=19.8) == base
+    assert key(track_temperature=25.0, weather_condition="dry") == base
+    assert key() == base  # defaults are the same as explicit 25/20 Dry
+    assert key(track_temperature=45.0) != base
+    assert key(air_temperature=30.0) != base
+    assert key(weather_condition="Wet") != base
+    assert key(session_type="Race") != key(session_type="race", seed=1)
+
+    monkeypatch.setattr(settings, "prediction_temperature_step", 0)
+    assert key(track_temperature=24.6) != key(track_temperature=24.7)
+
+
+def test_fingerprint_includes_model_version(monkeypatch):
+    request = ml_service.canonicalize(make_request())
+    before = ml_service.fingerprint(request)
+    monkeypatch.setattr(ml_service, "model_version", lambda session_type: "9.9.9")
+    assert ml_service.fingerprint(request) != before
+
+
+def test_static_features_are_memoized():
+    """Only the condition columns change between requests for the same race"""
+    service = MLService()
+    service.load()
+    drivers = [
+        Driver(driver_id="VER", first_name="Max", last_name="Verstappen", code="VER", team="Red Bull"),
+        Driver(driver_id="HAM", first_name="Lewis", last_name="Hamilton", code="HAM", team="Mercedes"),
+    ]
+
+    hot = service._feature_matrix(make_request(track_temperature=45.0, weather_condition="Wet"), drivers)
+    cold = service._feature_matrix(make_request(track_temperature=15.0), drivers)
+
+    assert service._static_features(make_request(), drivers) is service._static_features(make_request(), drivers)
+    assert (hot[:, :2] == cold[:, :2]).all()
+    assert hot[:, 2].tolist() == [45.0, 45.0] and cold[:, 2].tolist() == [15.0, 15.0]
+    assert hot[0, 4] == service._encode("weather", "Wet")
+
+    # Freezing conditions are real readings, not missing ones
+    freezing = service._feature_matrix(make_request(track_temperature=0.0, air_temperature=0.0), drivers)
+    assert freezing[:, 2:4].tolist() == [[0.0, 0.0], [0.0, 0.0]]
+
+
+def test_fingerprint_follows_the_model_artifacts(tmp_path, monkeypatch):
+    """Retrained or imported artifacts change every prediction's cache key"""
+    import joblib
+
+    monkeypatch.setattr(settings, "model_path", str(tmp_path))
+    service = MLService()
+    request = service.canonicalize(make_request(session_type="race", seed=1))
+    before = service.fingerprint(request)
+    assert service.fingerprint(request) == before
+
+    encoders = joblib.load(service.encoders_path)
+    encoders["driver"].fit(["VER", "HAM", "NEW"])
+    joblib.dump(encoders, service.encoders_path)
+    service.reload()
+    assert service.fingerprint(request) != before
+
+
+def test_near_identical_requests_share_cache_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_service, "db_path", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache_service, "_initialized", False)
+    monkeypatch.setattr(settings, "enable_cache", True)
+
+    first = client.post("/api/predict", json={"season": 2024, "round": 9, "track_temperature": 30.2})
+    second = client.post("/api/predict", json={"season": 2024, "round": 9, "track_temperature": 29.9})
+    hotter = client.post("/api/predict", json={"season": 2024, "round": 9, "track_temperature": 45.0})
+
+    assert first.json() == second.json()
+    assert hotter.json()["generated_at"] != first.json()["generated_at"]
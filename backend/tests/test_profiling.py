@@ -0,0 +1,107 @@
+"""
+Test request profiling and the admin profile endpoints
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.core import profiling
+from app.core.profiling import ProfilingMiddleware, RequestProfiler, to_collapsed
+
+client = TestClient(app)
+
+
+def busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_slow_request_is_captured():
+    """Requests past the threshold are sampled and stored as collapsed stacks"""
+    profiler = RequestProfiler(interval_ms=1, slow_threshold_ms=10, buffer_size=2)
+    token = profiler.start_request(forced=False)
+    busy_wait(0.1)
+    profile = profiler.finish_request(token, "GET", "/slow", 200)
+
+    assert profile is not None
+    assert profile["trigger"] == "slow"
+    assert profile["samples"] > 0
+    assert "busy_wait" in to_collapsed(profile)
+
+
+def test_worker_threads_are_sampled_with_their_request():
+    """Work handed to a worker thread shows up in the request's profile"""
+    profiler = RequestProfiler(interval_ms=1, slow_threshold_ms=10, buffer_size=2)
+    token = profiler.start_request(forced=True)
+
+    def worker():
+        with profiler.attach_thread(token):
+            busy_wait(0.1)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    profile = profiler.finish_request(token, "GET", "/cold", 200)
+
+    assert "test_profiling:worker;test_profiling:busy_wait" in to_collapsed(profile)
+
+
+def test_to_thread_carries_the_request_to_the_worker(monkeypatch):
+    """The middleware's request token reaches threads started with profiling.to_thread"""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    profiler = RequestProfiler(interval_ms=1, slow_threshold_ms=10, buffer_size=2)
+    monkeypatch.setattr(profiling, "request_profiler", profiler)
+
+    async def endpoint(scope, receive, send):
+        await profiling.to_thread(busy_wait, 0.1)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/cold", "headers": [], "query_string": b""}
+    asyncio.run(ProfilingMiddleware(endpoint, profiler)(scope, None, send))
+
+    profile = profiler.get_profile(profiler.summaries()[0]["id"])
+    assert "busy_wait" in to_collapsed(profile)
+
+
+def test_fast_request_is_discarded_and_buffer_is_bounded():
+    """Fast unflagged requests leave no profile and the ring buffer keeps only the newest"""
+    profiler = RequestProfiler(interval_ms=1, slow_threshold_ms=1000, buffer_size=2)
+    assert profiler.finish_request(profiler.start_request(False), "GET", "/fast", 200) is None
+
+    for _ in range(3):
+        profiler.finish_request(profiler.start_request(True), "GET", "/forced", 200)
+    assert len(profiler.summaries()) == 2
+
+
+def test_profile_flag_requires_admin_token(monkeypatch):
+    """Only admins can request a profile, which is then retrievable from the admin API"""
+    monkeypatch.setattr(settings, "admin_token", "secret")
+
+    response = client.get("/health", params={"profile": "1"})
+    assert "x-profile-id" not in response.headers
+
+    response = client.get("/health", params={"profile": "1"}, headers={"X-Admin-Token": "secret"})
+    profile_id = response.headers["x-profile-id"]
+
+    listing = client.get("/admin/profiles", headers={"X-Admin-Token": "secret"})
+    assert listing.status_code == 200
+    assert any(str(profile["id"]) == profile_id for profile in listing.json())
+
+    detail = client.get(f"/admin/profiles/{profile_id}", headers={"X-Admin-Token": "secret"})
+    assert detail.status_code == 200
+    assert detail.headers["content-type"].startswith("text/plain")
+
+
+def test_admin_endpoints_reject_missing_token(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    assert client.get("/admin/profiles").status_code == 403
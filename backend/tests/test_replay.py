@@ -0,0 +1,119 @@
+"""
+Test the telemetry replay stream
+"""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.fastf1_service import FastF1Service
+from app.services.replay_service import FrameBuffer, ReplayHub, replay_frames, replay_hub
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_sse_replay_is_time_ordered():
+    """Frames arrive in replay order and only carry the selected drivers"""
+    replay_hub.clear()
+    with synthetic_fastf1():
+        response = client.get(
+            "/api/race/2024/1/replay",
+            params={"drivers": "VER,HAM", "start": 600, "duration": 5, "speed": 50}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "start" and kinds[-1] == "end"
+
+    frames = [data for kind, data in events if kind == "frame"]
+    assert len(frames) == events[0][1]["frames"] == 10
+    assert [frame["t"] for frame in frames] == sorted(frame["t"] for frame in frames)
+    times = [t for frame in frames for t in frame["drivers"]["VER"]["t"]]
+    assert times == sorted(times) and 600 <= times[0] and times[-1] < 605
+    assert all(set(frame["drivers"]) <= {"VER", "HAM"} for frame in frames)
+    assert {"speed", "gear", "x", "y"} <= set(frames[0]["drivers"]["HAM"])
+
+
+def test_websocket_replay_and_errors():
+    """The WebSocket transport sends the same messages and reports bad drivers"""
+    replay_hub.clear()
+    with synthetic_fastf1():
+        with client.websocket_connect("/api/race/2024/1/replay/ws?drivers=LEC&start=60&duration=2&speed=40") as ws:
+            messages = [ws.receive_json()]
+            while messages[-1]["type"] != "end":
+                messages.append(ws.receive_json())
+
+        with client.websocket_connect("/api/race/2024/1/replay/ws?drivers=XXX") as ws:
+            error = ws.receive_json()
+
+    assert messages[0]["drivers"] == ["LEC"]
+    assert messages[-1]["sent"] == len(messages) - 2 == 4
+    assert error["type"] == "error" and error["status"] == 400
+
+
+def test_frame_buffer_drops_oldest_when_full():
+    async def scenario():
+        buffer = FrameBuffer(2)
+        assert buffer.put(1) and buffer.put(2)
+        assert not buffer.put(3)
+        buffer.close()
+        return [await buffer.get(), await buffer.get(), await buffer.get()], buffer.dropped
+
+    items, dropped = asyncio.run(scenario())
+    assert items == [2, 3, None]
+    assert dropped == 1
+
+
+def test_slow_consumer_drops_frames():
+    """A client that reads slower than playback loses frames instead of lagging"""
+    async def scenario():
+        hub = ReplayHub(frame_seconds=0.5)
+        source = await hub.get_source(2024, 1)
+        messages = []
+        async for message in replay_frames(source, ["VER"], speed=100, start=0, duration=10, buffer_frames=2):
+            messages.append(message)
+            await asyncio.sleep(0.02)
+        return messages
+
+    with synthetic_fastf1():
+        messages = asyncio.run(scenario())
+
+    end = messages[-1]
+    assert end["dropped"] > 0
+    assert end["sent"] + end["dropped"] == messages[0]["frames"] == 20
+    frames = [m["index"] for m in messages if m["type"] == "frame"]
+    assert frames == sorted(frames) and frames[-1] == 19
+
+
+def test_concurrent_viewers_share_one_source(monkeypatch):
+    """The session is loaded and merged once however many viewers join"""
+    calls = []
+    original = FastF1Service.get_session_car_data
+
+    async def counting(season, round_number):
+        calls.append((season, round_number))
+        return await original(season, round_number)
+
+    monkeypatch.setattr(FastF1Service, "get_session_car_data", counting)
+
+    async def scenario():
+        hub = ReplayHub()
+        return await asyncio.gather(*(hub.get_source(2024, 2) for _ in range(5)))
+
+    with synthetic_fastf1():
+        sources = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(source is sources[0] for source in sources)
@@ -0,0 +1,91 @@
+"""
+Test session endpoints for every session of a race weekend
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from benchmarks.synthetic import SPRINT_ROUNDS, SyntheticSession, synthetic_fastf1
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record the parts every synthetic session load asks for"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    calls = []
+    original = SyntheticSession.load
+
+    def load(self, **parts):
+        calls.append((self.session_type, parts))
+        return original(self, **parts)
+
+    monkeypatch.setattr(SyntheticSession, "load", load)
+    with synthetic_fastf1():
+        yield calls
+
+
+def test_sprint_weekends_are_listed(loads):
+    races = client.get("/api/races/2024").json()
+    assert [race["round"] for race in races] == list(range(1, 25))
+
+    sprint = next(race for race in races if race["round"] in SPRINT_ROUNDS)
+    assert sprint["event_format"] == "sprint_qualifying"
+    assert sprint["sessions"] == ["FP1", "SQ", "S", "Q", "R"]
+    assert races[0]["sessions"] == ["FP1", "FP2", "FP3", "Q", "R"]
+
+
+def test_season_lists_cached_before_sessions_are_not_served(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", True)
+    legacy = [{
+        "season": 2024, "round": 1, "race_name": "Bahrain Grand Prix",
+        "circuit_name": "Sakhir", "date": "2024-03-02T15:00:00"
+    }]
+    asyncio.run(cache_service.set("races_2024", legacy, ttl_hours=1))
+
+    with synthetic_fastf1():
+        races = client.get("/api/races/2024").json()
+
+    assert len(races) == 24
+    assert races[0]["sessions"] == ["FP1", "FP2", "FP3", "Q", "R"]
+
+
+def test_qualifying_results_load_results_only(loads):
+    response = client.get("/api/race/2024/5/sessions/q/results")
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["session_type"], data["session_name"]) == ("Q", "Qualifying")
+    assert data["race"]["event_format"] == "sprint_qualifying"
+    assert [r["position"] for r in data["results"]] == list(range(1, 21))
+    assert all(r["q3"] for r in data["results"][:10])
+    assert not any(r["q3"] for r in data["results"][10:])
+
+    assert loads == [("Q", {"laps": False, "telemetry": False, "weather": False, "messages": False})]
+
+    # The race results page is results-only as well
+    assert client.get("/api/race/2024/5/results").status_code == 200
+    assert loads[-1] == ("R", {"laps": False, "telemetry": False, "weather": False, "messages": False})
+
+
+@pytest.mark.parametrize("endpoint,laps,telemetry,weather", [
+    ("laps", True, False, False),
+    ("telemetry", True, True, False),
+    ("weather", False, False, True),
+])
+def test_each_endpoint_loads_only_its_parts(loads, endpoint, laps, telemetry, weather):
+    response = client.get(f"/api/race/2024/5/sessions/S/{endpoint}")
+    assert response.status_code == 200
+    assert response.json()["session_type"] == "S"
+    assert loads == [("S", {"laps": laps, "telemetry": telemetry, "weather": weather, "messages": False})]
+
+
+def test_sessions_outside_the_weekend_format(loads):
+    # Sprint sessions don't exist on conventional weekends, FP2 doesn't on sprint ones
+    assert client.get("/api/race/2024/1/sessions/SQ/results").status_code == 404
+    assert client.get("/api/race/2024/5/sessions/FP2/results").status_code == 404
+    assert client.get("/api/race/2024/1/sessions/XX/results").status_code == 400
@@ -0,0 +1,145 @@
+"""
+Test the Monte Carlo race simulation
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.api.routes_predict import ml_service
+from app.models.predict import PredictRequest
+from app.models.race import Driver
+from app.services.cache_service import cache_service
+from app.services.simulation_service import RaceSimulator
+
+client = TestClient(app)
+
+
+def make_simulator(n_drivers=10, dnf_probability=0.05):
+    grid = np.arange(n_drivers)
+    return RaceSimulator(
+        pace=90.0 + 0.1 * grid,
+        pace_sd=np.full(n_drivers, 0.3),
+        degradation=np.full(n_drivers, 0.03),
+        pit_loss=np.full(n_drivers, 22.0),
+        pit_loss_sd=np.full(n_drivers, 1.5),
+        dnf_probability=np.full(n_drivers, dnf_probability),
+        grid_gap=0.3 * grid
+    )
+
+
+def test_seeded_simulation_is_reproducible():
+    """The same seed gives identical distributions, across batch sizes too"""
+    simulator = make_simulator()
+    first = simulator.run(2000, seed=7, batch_size=500)
+    second = simulator.run(2000, seed=7, batch_size=500)
+
+    assert first.runs == 2000
+    assert first.seed == 7
+    np.testing.assert_array_equal(first.position_probabilities, second.position_probabilities)
+
+
+def test_position_distributions_are_normalized():
+    """Every driver finishes somewhere and every position is filled once per race"""
+    result = make_simulator().run(3000, seed=1)
+    probabilities = result.position_probabilities
+
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    np.testing.assert_allclose(probabilities.sum(axis=0), 1.0)
+    assert result.expected_positions[0] < result.expected_positions[-1]
+    assert result.dnf_probabilities.mean() == pytest.approx(0.05, abs=0.01)
+
+
+def test_retirements_finish_behind_classified_drivers():
+    """A driver who always retires can only take the last position"""
+    simulator = make_simulator(n_drivers=5, dnf_probability=0.0)
+    simulator.dnf_probability[0] = 1.0
+    result = simulator.run(500, seed=3)
+    assert result.position_probabilities[0, -1] == 1.0
+
+
+def test_latency_budget_stops_early():
+    """Batches stop once the latency budget is spent"""
+    result = make_simulator().run(1_000_000, seed=2, latency_budget_ms=1, batch_size=100)
+    assert 100 <= result.runs < 1_000_000
+    np.testing.assert_allclose(result.position_probabilities.sum(axis=1), 1.0)
+
+
+def test_race_prediction_endpoint_returns_distributions(monkeypatch):
+    """Race predictions carry finishing-position probabilities and are reproducible with a seed"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    request_data = {"season": 2024, "round": 2, "session_type": "race", "simulation_runs": 2000, "seed": 11}
+
+    first = client.post("/api/predict", json=request_data).json()
+    second = client.post("/api/predict", json=request_data).json()
+
+    assert first["model_info"]["seed"] == 11
+    assert first["model_info"]["runs"] == 2000
+    predictions = first["predictions"]
+    assert [p["predicted_position"] for p in predictions] == list(range(1, len(predictions) + 1))
+    for prediction in predictions:
+        assert len(prediction["position_probabilities"]) == len(predictions)
+        assert sum(prediction["position_probabilities"]) == pytest.approx(1.0, abs=1e-3)
+        assert prediction["win_probability"] <= prediction["podium_probability"]
+    assert [p["position_probabilities"] for p in predictions] == \
+        [p["position_probabilities"] for p in second["predictions"]]
+
+
+class SpreadByDriverModel:
+    """Position distributions that sharpen as the driver encoding grows"""
+    classes_ = np.arange(1, 5)
+
+    def predict_proba(self, features):
+        peak = np.eye(4)[features[:, 0].astype(int) % 4]
+        rows = peak * features[:, :1] + 1.0
+        return rows / rows.sum(axis=1, keepdims=True)
+
+
+def test_seeded_race_predictions_ignore_the_latency_budget(monkeypatch):
+    """A latency budget would cut seeded runs short at different points"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    monkeypatch.setattr(settings, "simulation_latency_budget_ms", 0)
+    monkeypatch.setattr(settings, "simulation_batch_runs", 100)
+    request_data = {"season": 2024, "round": 2, "session_type": "race", "simulation_runs": 1000, "seed": 5}
+
+    first = client.post("/api/predict", json=request_data).json()
+    second = client.post("/api/predict", json=request_data).json()
+
+    assert first["model_info"]["runs"] == 1000
+    assert first["predictions"] == second["predictions"]
+
+
+def test_race_parameters_come_from_driver_and_constructor_features(monkeypatch):
+    """Pace and lap-time variance differ per driver; teammates share their constructor's half"""
+    ml_service.load()
+    monkeypatch.setattr(ml_service, "model", SpreadByDriverModel())
+    grid = [
+        Driver(driver_id=code, first_name=code, last_name=code, code=code, team=team)
+        for code, team in [("VER", "Red Bull"), ("PER", "Red Bull"), ("HAM", "Mercedes"), ("RUS", "Mercedes")]
+    ]
+    request = ml_service.canonicalize(PredictRequest(season=2024, round=2, session_type="race"))
+    simulator = ml_service._build_race_simulator(request, grid)
+
+    expected, spread = ml_service._position_distribution(request, grid)
+    assert len(set(np.round(simulator.pace_sd, 6))) > 1
+    np.testing.assert_allclose(simulator.pace_sd.mean(), 0.35)
+    # Within a team only the driver's own half of the pace differs
+    np.testing.assert_allclose(
+        simulator.pace[0] - simulator.pace[1], 0.06 * 0.5 * (expected[0] - expected[1])
+    )
+
+
+def test_unseeded_race_predictions_are_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", True)
+    request = PredictRequest(season=2024, round=3, session_type="race", simulation_runs=200)
+    unseeded = ml_service.fingerprint(ml_service.canonicalize(request))
+    seeded = ml_service.fingerprint(ml_service.canonicalize(request.copy(update={"seed": 5})))
+
+    assert client.post("/api/predict", json=request.dict()).status_code == 200
+    assert client.post("/api/predict", json={**request.dict(), "seed": 5}).status_code == 200
+
+    assert asyncio.run(cache_service.get(unseeded)) is None
+    assert asyncio.run(cache_service.get(seeded)) is not None
@@ -0,0 +1,123 @@
+"""
+Test snapshot export and import
+"""
+
+import asyncio
+import io
+import json
+import tarfile
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes_predict import ml_service
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.results_store import results_store
+from app.services.snapshot_service import SnapshotError, export_snapshot, import_snapshot
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+def use_node(root, monkeypatch):
+    """Point the cache, results database and models at a node directory"""
+    root.mkdir(exist_ok=True)
+    monkeypatch.setattr(cache_service, "db_path", str(root / "cache.db"))
+    monkeypatch.setattr(cache_service, "_initialized", False)
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{root / 'f1.db'}")
+    monkeypatch.setattr(settings, "model_path", str(root / "models"))
+    asyncio.run(results_store.dispose())
+    cache_service.drop_hot({"prefix": ""})
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    """Warm a source node through the API and export it"""
+    monkeypatch.setattr(settings, "enable_cache", True)
+    monkeypatch.setattr(settings, "coordination_db_path", str(tmp_path / "coordination.db"))
+    use_node(tmp_path / "source", monkeypatch)
+    (tmp_path / "source" / "models").mkdir()
+    (tmp_path / "source" / "models" / "model.joblib").write_bytes(b"model-bytes" * 100)
+
+    with synthetic_fastf1():
+        for round_number in (1, 2):
+            assert client.get(f"/api/race/2024/{round_number}/results").status_code == 200
+        assert client.get("/api/standings/2024").status_code == 200
+
+    path = str(tmp_path / "snapshot.tar.gz")
+    exported = asyncio.run(export_snapshot(path))
+    assert exported["entries"]["results.jsonl"] == 2
+
+    use_node(tmp_path / "target", monkeypatch)
+    yield path, tmp_path
+    asyncio.run(results_store.dispose())
+
+
+def test_import_warms_an_empty_node(snapshot):
+    path, tmp_path = snapshot
+    with tarfile.open(path, "r|gz") as tar:
+        assert next(iter(tar)).name == "manifest.json"
+
+    report = asyncio.run(import_snapshot(path))
+    assert report["checksum_errors"] == []
+    assert report["members"]["cache.jsonl"]["imported"] == 3
+    assert report["members"]["results.jsonl"]["imported"] == 2
+    assert report["members"]["models/model.joblib"]["imported"] == 1
+    assert (tmp_path / "target" / "models" / "model.joblib").read_bytes() == b"model-bytes" * 100
+
+    # Served from the imported cache and results database without FastF1
+    assert client.get("/api/race/2024/1/results").status_code == 200
+    history = client.get("/api/drivers/ver/results").json()
+    assert history["summary"]["starts"] == 2
+
+    again = asyncio.run(import_snapshot(path))
+    assert all(counts["imported"] == 0 for counts in again["members"].values())
+    assert again["members"]["cache.jsonl"]["skipped"] == 3
+
+
+def test_imported_model_replaces_cached_predictions(snapshot, monkeypatch):
+    path, _ = snapshot
+    reloads = []
+    monkeypatch.setattr(ml_service, "loaded", True)
+    monkeypatch.setattr(ml_service, "reload", lambda: reloads.append(True))
+    asyncio.run(cache_service.set("predict_2024_1_abc", {"predictions": []}, ttl_hours=24))
+    assert asyncio.run(cache_service.get("predict_2024_1_abc")) is not None
+
+    report = asyncio.run(import_snapshot(path))
+
+    assert report["members"]["models/model.joblib"]["imported"] == 1
+    assert reloads == [True]
+    assert asyncio.run(cache_service.get("predict_2024_1_abc")) is None
+
+
+def test_corrupt_entries_are_skipped(snapshot):
+    path, tmp_path = snapshot
+    tampered = str(tmp_path / "tampered.tar.gz")
+    with tarfile.open(path, "r|gz") as source, tarfile.open(tampered, "w|gz") as target:
+        for member in source:
+            data = source.extractfile(member).read()
+            if member.name == "cache.jsonl":
+                lines = data.splitlines(keepends=True)
+                record = json.loads(lines[0])
+                record["entry"]["value"] = "[]"
+                lines[0] = json.dumps(record).encode() + b"\n"
+                data = b"".join(lines)
+            member.size = len(data)
+            target.addfile(member, io.BytesIO(data))
+
+    report = asyncio.run(import_snapshot(tampered))
+    assert report["members"]["cache.jsonl"] == {"imported": 2, "skipped": 0, "corrupt": 1}
+    assert report["checksum_errors"] == ["cache.jsonl"]
+
+
+def test_unknown_snapshot_version_is_rejected(tmp_path):
+    path = str(tmp_path / "future.tar.gz")
+    data = json.dumps({"format": "f1-dashboard-snapshot", "version": 99, "members": {}}).encode()
+    with tarfile.open(path, "w|gz") as tar:
+        info = tarfile.TarInfo("manifest.json")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    with pytest.raises(SnapshotError):
+        asyncio.run(import_snapshot(path))
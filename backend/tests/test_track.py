@@ -0,0 +1,108 @@
+"""
+Test track map geometry and telemetry mapping
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.fastf1_service import FastF1Service
+from app.services.track_service import TrackGeometry, layout_id
+from benchmarks.synthetic import synthetic_fastf1
+
+client = TestClient(app)
+
+
+def reference_douglas_peucker(points, tolerance):
+    """Textbook recursive Douglas-Peucker"""
+    if len(points) < 3:
+        return list(points)
+    start, end = points[0], points[-1]
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    norm = np.hypot(dx, dy)
+    distances = [
+        abs(dy * (p[0] - start[0]) - dx * (p[1] - start[1])) / norm if norm else np.hypot(p[0] - start[0], p[1] - start[1])
+        for p in points[1:-1]
+    ]
+    i = int(np.argmax(distances)) + 1
+    if distances[i - 1] <= tolerance:
+        return [start, end]
+    return reference_douglas_peucker(points[:i + 1], tolerance)[:-1] + reference_douglas_peucker(points[i:], tolerance)
+
+
+@pytest.mark.parametrize("tolerance", [0.5, 2.0, 10.0, 50.0])
+def test_simplify_matches_douglas_peucker(tolerance):
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 2 * np.pi, 400)
+    x = 300 * np.cos(t) + rng.normal(0, 1, t.size)
+    y = 120 * np.sin(2 * t) + 200 * np.sin(t)
+
+    indices, _ = TrackGeometry.simplify(x, y, tolerance=tolerance)
+    expected = reference_douglas_peucker(list(zip(x, y)), tolerance)
+    assert list(zip(x[indices], y[indices])) == expected
+
+
+def test_simplify_to_target_points_keeps_corners():
+    """An L-shaped path collapses to its endpoints and the corner"""
+    x = np.concatenate((np.linspace(0, 100, 50), np.full(50, 100.0)))
+    y = np.concatenate((np.zeros(50), np.linspace(0, 100, 50)))
+    indices, tolerance = TrackGeometry.simplify(x, y, target_points=3)
+    assert indices.tolist() == [0, 49, 99]
+    assert tolerance == 0.0
+
+
+def test_layout_id_tracks_revisions():
+    assert layout_id("Melbourne", 2019) == "melbourne"
+    assert layout_id("Melbourne", 2024) == layout_id("Melbourne", 2022) == "melbourne-2022"
+    assert layout_id("Monte Carlo", 2024) == "monte-carlo"
+
+
+def test_track_map_is_cached_per_layout(tmp_path, monkeypatch):
+    """A second season at the same circuit reuses the stored geometry"""
+    monkeypatch.setattr(cache_service, "db_path", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache_service, "_initialized", False)
+    monkeypatch.setattr(settings, "enable_cache", True)
+
+    builds = []
+    original = FastF1Service.get_track_map
+
+    async def counting(*args, **kwargs):
+        builds.append(args[:2])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(FastF1Service, "get_track_map", counting)
+
+    with synthetic_fastf1():
+        first = client.get("/api/race/2023/2/track", params={"points": 120})
+        second = client.get("/api/race/2024/2/track", params={"points": 120})
+
+    assert first.status_code == second.status_code == 200
+    assert builds == [(2023, 2)]
+    track = second.json()
+    assert track["layout"] == "jeddah" and track["source_season"] == 2023
+    assert len(track["x"]) == len(track["distance"]) <= 120 < track["original_points"]
+    assert track["distance"][0] == 0.0 and track["distance"][-1] == 1.0
+    assert track["distance"] == sorted(track["distance"])
+
+
+def test_track_telemetry_endpoint(monkeypatch):
+    """Channels are sampled once per track map point, with gears kept whole"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    with synthetic_fastf1():
+        track = client.get("/api/race/2024/1/track", params={"points": 80}).json()
+        response = client.get(
+            "/api/race/2024/1/track/telemetry",
+            params={"driver": "ham", "channels": "speed,gear,brake", "points": 80}
+        )
+        bad = client.get("/api/race/2024/1/track/telemetry", params={"driver": "HAM", "channels": "tyres"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["driver"] == "HAM" and data["layout"] == track["layout"]
+    assert set(data["channels"]) == {"speed", "gear", "brake"}
+    assert all(len(values) == len(track["x"]) for values in data["channels"].values())
+    assert all(float(gear).is_integer() and 1 <= gear <= 8 for gear in data["channels"]["gear"])
+    assert set(data["channels"]["brake"]) <= {0.0, 1.0}
+    assert bad.status_code == 400
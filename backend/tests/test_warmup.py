@@ -0,0 +1,162 @@
+"""
+Test cache warmup planning and execution
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from app.core.admission import admission
+from app.core.config import settings
+from app.models.race import Race
+from app.services.fastf1_service import FastF1Service
+from app.services import warmup_service
+from app.services.warmup_service import WarmupJob, WarmupScheduler, plan_jobs
+
+NOW = datetime(2024, 6, 10, 12, 0)
+
+
+def make_race(round_number: int, days_ago: int, now: datetime = NOW) -> Race:
+    return Race(
+        season=2024,
+        round=round_number,
+        race_name=f"Race {round_number}",
+        circuit_name="Test Circuit",
+        date=now - timedelta(days=days_ago)
+    )
+
+
+SCHEDULE = [make_race(1, 60), make_race(2, 30), make_race(3, 2), make_race(4, -2)]
+
+
+def test_plan_recent_sessions():
+    """Only races finished within the lookback window are prefetched"""
+    jobs = plan_jobs(SCHEDULE, NOW, lookback_days=7, lookahead_days=3)
+    assert jobs == [
+        WarmupJob("results", 2024, 3),
+        WarmupJob("telemetry", 2024, 3),
+        WarmupJob("summary", 2024, 3),
+        WarmupJob("standings", 2024),
+    ]
+
+
+def test_plan_falls_back_to_latest_finished_race():
+    """Without a recent race the latest completed round is still warmed"""
+    jobs = plan_jobs(SCHEDULE[:2], NOW, lookback_days=7, lookahead_days=3)
+    assert WarmupJob("results", 2024, 2) in jobs
+    assert WarmupJob("results", 2024, 1) not in jobs
+
+
+def test_plan_backfill_covers_every_finished_round():
+    """Backfill mode prefetches the whole season so far"""
+    jobs = plan_jobs(SCHEDULE, NOW, lookback_days=7, lookahead_days=3, backfill=True)
+    rounds = {job.round for job in jobs if job.kind == "results"}
+    assert rounds == {1, 2, 3}
+
+
+def test_run_once_prefetches_with_bounded_concurrency(monkeypatch):
+    """A warmup pass loads each planned session without exceeding the concurrency limit"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    now = datetime.now()
+    schedule = [make_race(1, 2, now), make_race(2, 1, now)]
+    active = {"now": 0, "peak": 0}
+    loaded = []
+
+    async def fake_races(season):
+        return schedule
+
+    async def fake_load(season, round_number, *args):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        loaded.append(round_number)
+        time.sleep(0.01)
+        active["now"] -= 1
+        return None
+
+    monkeypatch.setattr(FastF1Service, "get_races_for_season", staticmethod(fake_races))
+    monkeypatch.setattr(FastF1Service, "get_race_results", staticmethod(fake_load))
+    monkeypatch.setattr(FastF1Service, "get_race_telemetry", staticmethod(fake_load))
+    monkeypatch.setattr(FastF1Service, "get_telemetry_summary", staticmethod(fake_load))
+
+    scheduler = WarmupScheduler(concurrency=1, job_delay_seconds=0)
+    report = asyncio.run(scheduler.run_once(season=2024, offline=False))
+
+    assert report["planned"] == 7
+    assert sorted(loaded) == [1, 1, 1, 2, 2, 2]
+    assert active["peak"] == 1
+
+
+def test_user_loads_get_ahead_of_a_warmup_backlog(monkeypatch):
+    """Warmup jobs wait behind user cold loads and leave them a slot"""
+    monkeypatch.setattr(settings, "enable_cache", False)
+    cold = admission.lanes["cold"]
+    monkeypatch.setattr(cold, "concurrency", 2)
+    monkeypatch.setattr(cold, "_limit", None)
+    now = datetime.now()
+    schedule = [make_race(1, 2, now), make_race(2, 1, now)]
+    started = []
+    peak = {"background": 0}
+
+    async def fake_races(season):
+        return schedule
+
+    async def fake_load(season, round_number, *args):
+        started.append(f"warmup-{round_number}")
+        peak["background"] = max(peak["background"], cold.stats()["background_active"])
+        await asyncio.sleep(0.05)
+        return None
+
+    async def user_load(name):
+        started.append(name)
+        await asyncio.sleep(0.05)
+        return name
+
+    monkeypatch.setattr(FastF1Service, "get_races_for_season", staticmethod(fake_races))
+    monkeypatch.setattr(FastF1Service, "get_race_results", staticmethod(fake_load))
+    monkeypatch.setattr(FastF1Service, "get_race_telemetry", staticmethod(fake_load))
+    monkeypatch.setattr(FastF1Service, "get_telemetry_summary", staticmethod(fake_load))
+
+    async def scenario():
+        warmup = asyncio.create_task(
+            WarmupScheduler(concurrency=2, job_delay_seconds=0).run_once(season=2024, offline=False)
+        )
+        while not started:
+            await asyncio.sleep(0.005)
+        users = await asyncio.gather(*(admission.run_cold(user_load, f"user-{i}") for i in (1, 2, 3)))
+        report = await warmup
+        return users, report
+
+    users, report = asyncio.run(scenario())
+
+    assert users == ["user-1", "user-2", "user-3"]
+    assert report["planned"] == 7
+    assert sorted(name for name in started if name.startswith("warmup")) == ["warmup-1"] * 3 + ["warmup-2"] * 3
+    # Every user load started before the second warmup job
+    assert [name for name in started if name.startswith("user")] == started[1:4]
+    assert peak["background"] == 1
+    assert cold.active == 0
+
+
+def test_offline_pass_restores_the_previous_mode(monkeypatch):
+    switched = []
+
+    class FakeCache:
+        @staticmethod
+        def offline_mode(enabled):
+            switched.append(enabled)
+
+    async def fake_pass(self, season, backfill):
+        return {"offline_during_pass": list(switched)}
+
+    monkeypatch.setattr(settings, "fastf1_offline", False)
+    monkeypatch.setattr(warmup_service, "get_fastf1", lambda: type("FakeFastF1", (), {"Cache": FakeCache}))
+    monkeypatch.setattr(WarmupScheduler, "_run_pass", fake_pass)
+
+    report = asyncio.run(WarmupScheduler(job_delay_seconds=0).run_once(season=2024, offline=True))
+    assert report["offline_during_pass"] == [True]
+    assert switched == [True, False]
+
+    # Without an override the configured mode is left alone
+    asyncio.run(WarmupScheduler(job_delay_seconds=0).run_once(season=2024))
+    assert switched == [True, False]
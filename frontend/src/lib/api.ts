@@ -3,6 +3,16 @@ import type {
   Race, 
   RaceResults, 
   RaceTelemetry, 
+  TelemetrySummary,
+  TrackMap,
+  TrackTelemetry,
+  TrackChannel,
+  LapComparison,
+  LapTimesPage,
+  RaceStints,
+  RacePitStops,
+  DriverHistory,
+  HeadToHead,
   Standings, 
   PredictRequest, 
   PredictResponse 
@@ -69,6 +79,89 @@ export const f1Api = {
     return response.data
   },
 
+  // Get lap times and positions for a lap range
+  async getRaceLaps(season: number, round: number, startLap: number = 1, lapCount: number = 20): Promise<LapTimesPage> {
+    const response = await api.get(`/race/${season}/${round}/laps`, {
+      params: { start_lap: startLap, lap_count: lapCount },
+    })
+    return response.data
+  },
+
+  // Get tyre stints and degradation
+  async getRaceStints(season: number, round: number): Promise<RaceStints> {
+    const response = await api.get(`/race/${season}/${round}/laps/stints`)
+    return response.data
+  },
+
+  // Get pit stops
+  async getRacePitStops(season: number, round: number): Promise<RacePitStops> {
+    const response = await api.get(`/race/${season}/${round}/laps/pitstops`)
+    return response.data
+  },
+
+  // Get per-driver telemetry statistics for the whole field
+  async getTelemetrySummary(season: number, round: number): Promise<TelemetrySummary> {
+    const response = await api.get(`/race/${season}/${round}/telemetry/summary`)
+    return response.data
+  },
+
+  // Get the simplified circuit outline for a race
+  async getTrackMap(season: number, round: number, points: number = 200): Promise<TrackMap> {
+    const response = await api.get(`/race/${season}/${round}/track`, { params: { points } })
+    return response.data
+  },
+
+  // Sample a driver's lap channels at each track map point (fastest lap by default)
+  async getTrackTelemetry(
+    season: number,
+    round: number,
+    driver: string,
+    channels: TrackChannel[] = ['speed', 'gear'],
+    lap?: number,
+    points: number = 200
+  ): Promise<TrackTelemetry> {
+    const params: Record<string, string | number> = { driver, channels: channels.join(','), points }
+    if (lap) params.lap = lap
+    const response = await api.get(`/race/${season}/${round}/track/telemetry`, { params })
+    return response.data
+  },
+
+  // Compare drivers' laps by delta time (first driver is the reference)
+  async compareDrivers(season: number, round: number, drivers: string[], laps?: number[]): Promise<LapComparison> {
+    const params: Record<string, string> = { drivers: drivers.join(',') }
+    if (laps?.length) params.laps = laps.join(',')
+    const response = await api.get(`/race/${season}/${round}/compare`, { params })
+    return response.data
+  },
+
+  // Stream a telemetry replay as Server-Sent Events ("start", "frame" and "end" events)
+  openReplay(
+    season: number,
+    round: number,
+    options: { drivers?: string[]; speed?: number; start?: number; duration?: number } = {}
+  ): EventSource {
+    const params = new URLSearchParams()
+    if (options.drivers?.length) params.set('drivers', options.drivers.join(','))
+    if (options.speed) params.set('speed', String(options.speed))
+    if (options.start) params.set('start', String(options.start))
+    if (options.duration) params.set('duration', String(options.duration))
+    return new EventSource(`${API_BASE_URL}/race/${season}/${round}/replay?${params}`)
+  },
+
+  // Get a driver's stored results, newest first
+  async getDriverHistory(code: string, since?: number): Promise<DriverHistory> {
+    const response = await api.get(`/drivers/${code}/results`, { params: since ? { since } : {} })
+    return response.data
+  },
+
+  // Compare two drivers or two constructors race by race
+  async getHeadToHead(kind: 'drivers' | 'constructors', ids: [string, string], since?: number): Promise<HeadToHead> {
+    const params: Record<string, string | number> = { ids: ids.join(',') }
+    if (since) params.since = since
+    const response = await api.get(`/head-to-head/${kind}`, { params })
+    return response.data
+  },
+
   // Get standings
   async getStandings(season: number, round?: number): Promise<Standings> {
     const url = round ? `/standings/${season}?round=${round}` : `/standings/${season}`
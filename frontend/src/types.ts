@@ -34,6 +34,8 @@ export interface Race {
   date: string
   time?: string
   url?: string
+  event_format?: string
+  sessions: string[]
 }
 
 export interface RaceResults {
@@ -41,6 +43,44 @@ export interface RaceResults {
   results: RaceResult[]
 }
 
+export interface SessionResult {
+  position?: number
+  driver: Driver
+  constructor: Constructor
+  grid_position?: number
+  points?: number
+  time?: string
+  status?: string
+  q1?: string
+  q2?: string
+  q3?: string
+}
+
+export interface SessionResults {
+  race: Race
+  session_type: string
+  session_name: string
+  results: SessionResult[]
+}
+
+export interface WeatherSample {
+  time: number
+  air_temp?: number
+  track_temp?: number
+  humidity?: number
+  pressure?: number
+  rainfall?: boolean
+  wind_speed?: number
+  wind_direction?: number
+}
+
+export interface SessionWeather {
+  race: Race
+  session_type: string
+  session_name: string
+  samples: WeatherSample[]
+}
+
 export interface TelemetryPoint {
   distance: number
   speed?: number
@@ -60,9 +100,72 @@ export interface DriverTelemetry {
 
 export interface RaceTelemetry {
   race: Race
+  session_type: string
   drivers_telemetry: DriverTelemetry[]
 }
 
+export interface DriverDelta {
+  code: string
+  lap_number?: number
+  lap_time?: string
+  speed: number[]
+  delta: number[]
+  final_delta: number
+}
+
+export interface MiniSector {
+  start: number
+  end: number
+  fastest: string
+  gains: number[]
+}
+
+export interface LapComparison {
+  race: Race
+  reference: string
+  distance: number[]
+  drivers: DriverDelta[]
+  mini_sectors: MiniSector[]
+}
+
+export interface StintSummary {
+  driver: string
+  stint: number
+  compound?: string
+  start_lap: number
+  end_lap: number
+  laps: number
+  mean_lap_time?: number
+  degradation?: number
+}
+
+export interface PitStop {
+  driver: string
+  lap: number
+  duration?: number
+}
+
+// Rows follow `drivers`, columns follow `lap_numbers`
+export interface LapTimesPage {
+  race: Race
+  drivers: string[]
+  lap_numbers: number[]
+  lap_times: (number | null)[][]
+  positions: (number | null)[][]
+  total_laps: number
+  next_start_lap?: number
+}
+
+export interface RaceStints {
+  race: Race
+  stints: StintSummary[]
+}
+
+export interface RacePitStops {
+  race: Race
+  pit_stops: PitStop[]
+}
+
 export interface DriverStanding {
   position: number
   driver: Driver
@@ -92,6 +195,8 @@ export interface PredictRequest {
   weather_condition?: string
   track_temperature?: number
   air_temperature?: number
+  simulation_runs?: number
+  seed?: number
 }
 
 export interface DriverPrediction {
@@ -99,6 +204,11 @@ export interface DriverPrediction {
   predicted_position: number
   confidence: number
   reasoning?: string
+  position_probabilities?: number[]
+  expected_position?: number
+  win_probability?: number
+  podium_probability?: number
+  dnf_probability?: number
 }
 
 export interface PredictResponse {
@@ -109,3 +219,121 @@ export interface PredictResponse {
   model_info: Record<string, any>
   generated_at: string
 }
+
+// Telemetry replay stream messages; samples are column-wise per driver
+export type ReplayChannels = Record<'t' | 'speed' | 'rpm' | 'gear' | 'throttle' | 'brake' | 'drs' | 'x' | 'y', number[]>
+
+export interface ReplayStart {
+  type: 'start'
+  race: Race
+  drivers: string[]
+  channels: string[]
+  speed: number
+  frame_seconds: number
+  start: number
+  end: number
+  frames: number
+}
+
+export interface ReplayFrame {
+  type: 'frame'
+  index: number
+  t: number
+  drivers: Record<string, ReplayChannels>
+  dropped: number
+}
+
+export interface ReplayEnd {
+  type: 'end'
+  sent: number
+  dropped: number
+}
+
+export interface HistoryEntry {
+  season: number
+  round: number
+  race_name: string
+  date: string
+  constructor: string
+  position?: number
+  points: number
+  status?: string
+}
+
+export interface DriverHistory {
+  driver: Driver
+  summary: {
+    starts: number
+    wins: number
+    podiums: number
+    points: number
+    best_position?: number
+  }
+  results: HistoryEntry[]
+}
+
+export interface HeadToHeadRace {
+  season: number
+  round: number
+  race_name: string
+  positions: (number | null)[]
+  points: number[]
+  ahead?: string
+}
+
+export interface HeadToHead {
+  kind: 'drivers' | 'constructors'
+  competitors: string[]
+  races: number
+  ahead: number[]
+  points: number[]
+  results: HeadToHeadRace[]
+}
+
+export interface DriverTelemetrySummary {
+  driver: string
+  team?: string
+  laps: number
+  top_speed?: number
+  average_speed?: number
+  speed_trap?: number
+  speed_i1?: number
+  speed_i2?: number
+  speed_finish_line?: number
+  full_throttle_pct?: number
+  braking_pct?: number
+  braking_zones: number
+  braking_zones_per_lap?: number
+  drs_open_pct?: number
+  drs_activations: number
+}
+
+export interface TelemetrySummary {
+  race: Race
+  drivers: DriverTelemetrySummary[]
+}
+
+export interface TrackMap {
+  circuit_name: string
+  layout: string
+  x: number[]
+  y: number[]
+  distance: number[] // lap fraction, 0..1
+  tolerance: number
+  original_points: number
+  source_season: number
+  source_round: number
+  source_driver: string
+  source_lap: number
+}
+
+export type TrackChannel = 'speed' | 'throttle' | 'rpm' | 'gear' | 'brake' | 'drs'
+
+export interface TrackTelemetry {
+  race: Race
+  layout: string
+  driver: string
+  lap_number: number
+  lap_time?: string
+  channels: Partial<Record<TrackChannel, number[]>>
+}